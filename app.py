@@ -1,135 +1,32 @@
 import os
 
 USE_SELENIUM = os.getenv("USE_SELENIUM", "false").lower() == "true"
+# Worker processes for scoring large batches (1 = serial, 0 = every core)
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "1")) or None
 
-def scrape_with_selenium_pagination(url, max_pages=50):
-    """Selenium-based scraping with pagination and dynamic loading - Takes ALL reviews"""
-    try:
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        from selenium.common.exceptions import TimeoutException, NoSuchElementException
-        
-        print(f"Starting Selenium scraping with pagination (max {max_pages} pages)...")
-        
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-        
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.get(url)
-        
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
-        
-        all_reviews = []
-        
-        # Strategy 1: Infinite scroll loading
-        print("Attempting infinite scroll strategy...")
-        last_height = driver.execute_script("return document.body.scrollHeight")
-        scroll_attempts = 0
-        max_scrolls = 20
-        
-        while scroll_attempts < max_scrolls:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(3)
-            
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            
-            if new_height == last_height:
-                print(f"No more content loaded after scroll {scroll_attempts + 1}")
-                break
-            
-            last_height = new_height
-            scroll_attempts += 1
-            print(f"Scroll {scroll_attempts}: New content loaded")
-        
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        reviews = extract_reviews_from_soup(soup, url)
-        all_reviews.extend(reviews)
-        
-        # Strategy 2: Pagination buttons
-        print("Attempting pagination strategy...")
-        
-        pagination_selectors = [
-            'li.a-last a',
-            '.a-pagination .a-normal',
-            '[aria-label="Go to next page"]',
-            '._1LKTO3',
-            '.ge-49M',
-            '[class*="next"]',
-            '.pagination a',
-            '[class*="page"][class*="next"]',
-            'a[aria-label*="next"]'
-        ]
-        
-        pages_scraped = 1
-        consecutive_failures = 0
-        
-        while pages_scraped < max_pages and consecutive_failures < 3:
-            next_button = None
-            for selector in pagination_selectors:
-                try:
-                    next_button = driver.find_element(By.CSS_SELECTOR, selector)
-                    if next_button and next_button.is_enabled():
-                        break
-                except NoSuchElementException:
-                    continue
-            
-            if not next_button or not next_button.is_enabled():
-                print("No more pages available")
-                break
-            
-            try:
-                driver.execute_script("arguments[0].click();", next_button)
-                time.sleep(4)
-                
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-                page_reviews = extract_reviews_from_soup(soup, url)
-                
-                if page_reviews:
-                    all_reviews.extend(page_reviews)
-                    print(f"Page {pages_scraped + 1}: Added {len(page_reviews)} reviews (Total: {len(all_reviews)})")
-                    pages_scraped += 1
-                    consecutive_failures = 0
-                else:
-                    print("No reviews on this page")
-                    consecutive_failures += 1
-                    
-            except Exception as e:
-                print(f"Pagination error: {e}")
-                consecutive_failures += 1
-        
-        # Strategy 3: "Load More" buttons
-        print("Looking for 'Load More' buttons...")
-        
-        load_more_selectors = [
-            '[class*="load"][class*="more"]',
-            '[id*="load"][id*="more"]',
-            'button[class*="more"]',
-            '.load-more-reviews',
-            '[data-hook*="load"]'
-        ]
-    except Exception as e:
-        print(f"Amazon scraping error: {e}")
 # -*- coding: utf-8 -*-
-from flask import Flask, render_template, request, url_for, send_file, jsonify
+from flask import Flask, Response, render_template, request, url_for, send_file, jsonify, stream_with_context
+import asyncio
 import pandas as pd
 import uuid
-import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import hashlib
 import re
+import sqlite3
+import threading
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from urllib.parse import urljoin, urlparse, parse_qs
-from model import check_reviews
+from contextlib import aclosing
+from model import ReviewStatistics, check_review_chunk, check_reviews, print_statistics
+from ingest import UPLOAD_CHUNK_SIZE, iter_upload_reviews, sniff_upload, upload_format
+from browser import BROWSER_SCROLL_TIMEOUT, get_browser_pool, page_state, wait_for_document_ready, wait_for_page_change
+from fetcher import (
+    CACHE_DIR, AsyncHttpClient, CONNECTION_STATS, RESPONSE_CACHE, cached_get, get_shared_session, iter_pages,
+    normalize_url, run_sync
+)
 
 app = Flask(__name__)
 
@@ -140,29 +37,578 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(RESULT_FOLDER, exist_ok=True)
 
 
+# Enhanced browser-like headers sent with every scraping request
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9,hi;q=0.8',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Cache-Control': 'max-age=0',
+    'DNT': '1'
+}
+
+
 def get_session_with_headers():
-    """Create a session with enhanced headers"""
-    session = requests.Session()
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.9,hi;q=0.8',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-        'Sec-Fetch-Dest': 'document',
-        'Sec-Fetch-Mode': 'navigate',
-        'Sec-Fetch-Site': 'none',
-        'Cache-Control': 'max-age=0',
-        'DNT': '1'
-    }
-    session.headers.update(headers)
-    return session
+    """Session with enhanced headers and its own cookies over the process's keep-alive connection pool"""
+    return get_shared_session(BROWSER_HEADERS)
 
 
-def scrape_amazon_reviews(url, session, max_pages=50):
-    """Enhanced Amazon review scraping with pagination - Takes ALL reviews including duplicates"""
+try:
+    import lxml  # Much faster tree builder than html.parser
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Only build a tree for the review region of platform review pages (FAST_PARSE=false parses everything)
+FAST_PARSE = os.getenv("FAST_PARSE", "true").lower() == "true"
+
+# Class names and [attr="value"] / [attr*="value"] terms inside a CSS selector
+SELECTOR_TERM_RE = re.compile(r'\.([\w-]+)|\[([\w-]+)[*^$~|]?="([^"]*)"\]')
+
+
+class ReviewRegionStrainer(SoupStrainer):
+    """
+    parse_only filter that keeps just the tags a selector list could match
+    
+    A tag is kept (with everything inside it) when one of its attributes
+    contains a class name or attribute value named in the selectors; all
+    other markup and text is dropped while parsing. Every selector element
+    therefore survives with the same text, so soup.select gives the same
+    results on a much smaller tree. On Beautiful Soup < 4.13 this is a plain
+    SoupStrainer and the whole document is parsed as before.
+    """
+
+    def __init__(self, selectors):
+        super().__init__()
+        self.terms = {}
+        for selector in selectors:
+            for class_name, attribute, value in SELECTOR_TERM_RE.findall(selector):
+                name, needle = ("class", class_name) if class_name else (attribute, value)
+                self.terms.setdefault(name, set()).add(needle)
+
+    @property
+    def includes_everything(self):
+        return False
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        if not attrs:
+            return False
+        for attribute, needles in self.terms.items():
+            value = attrs.get(attribute)
+            if value is None:
+                continue
+            if not isinstance(value, str):
+                value = " ".join(value)
+            if any(needle in value for needle in needles):
+                return True
+        return False
+
+    def allow_string_creation(self, string):
+        return False
+
+
+def parse_review_page(content, selectors):
+    """Soup for a review page - with FAST_PARSE, only the parts the selectors can match"""
+    if FAST_PARSE:
+        return BeautifulSoup(content, HTML_PARSER, parse_only=ReviewRegionStrainer(selectors))
+    return BeautifulSoup(content, HTML_PARSER)
+
+
+# Amazon review pages live on this host (override to point scrapes at a local stand-in server)
+AMAZON_BASE_URL = os.getenv("AMAZON_BASE_URL", "https://www.amazon.in").rstrip("/")
+
+# Updated Amazon selectors for 2024/2025
+AMAZON_REVIEW_SELECTORS = [
+    '[data-hook="review-body"] > span',
+    '[data-hook="review-body"] span:not([class*="cr-lightbox"])',
+    'span[data-hook="review-body"] span',
+    '.cr-original-review-text',
+    '.review-text-content span',
+    '[data-hook="review-body"]'
+]
+AMAZON_NEXT_PAGE_SELECTOR = 'li.a-last a, [aria-label="Next page"]'
+# Elements holding the advertised count, e.g. "1,234 total ratings, 567 with reviews"
+AMAZON_REVIEW_COUNT_SELECTORS = [
+    '[data-hook="cr-filter-info-review-rating-count"]',
+    '[data-hook="total-review-count"]'
+]
+AMAZON_PAGE_SELECTORS = AMAZON_REVIEW_SELECTORS + [AMAZON_NEXT_PAGE_SELECTOR] + AMAZON_REVIEW_COUNT_SELECTORS
+AMAZON_SKIP_TEXT = [
+    'verified purchase', 'helpful', 'report abuse',
+    'comment', 'was this review helpful', 'see all photos',
+    'by ', 'on '
+]
+
+# Updated Flipkart selectors
+FLIPKART_REVIEW_SELECTORS = [
+    '._2cLu-l',
+    '.t-ZTKy',
+    '._11pzQk',
+    '.qwjRop',
+    '.ZmyHeo',
+    'div[class*="_2cLu"]',
+    'div[class*="ZmyHeo"]',
+    '.RcXBOT'
+]
+# "1,234 Ratings & 567 Reviews" above the review list
+FLIPKART_REVIEW_COUNT_SELECTORS = ['._2_R_DZ', '._2afbiS']
+FLIPKART_PAGE_SELECTORS = FLIPKART_REVIEW_SELECTORS + FLIPKART_REVIEW_COUNT_SELECTORS
+
+MEESHO_REVIEW_SELECTORS = [
+    '[data-testid*="review"]',
+    '.ReviewCard__reviewText',
+    '[class*="Review"][class*="Text"]',
+    '.review-content',
+    '[class*="review"][class*="text"]',
+    'div[class*="review"] p',
+    '[class*="ReviewCard"] div',
+    '[class*="UserReview"]'
+]
+
+
+# Selector learning: per-domain hit table shared by all workers (SELECTOR_STATS_PATH= disables it)
+SELECTOR_STATS_PATH = os.getenv("SELECTOR_STATS_PATH", os.path.join(CACHE_DIR, "selector_stats.sqlite3"))
+# A selector that missed this many times in a row without a hit for SELECTOR_DEAD_DAYS is skipped...
+SELECTOR_DEAD_AFTER = int(os.getenv("SELECTOR_DEAD_AFTER", "20"))
+SELECTOR_DEAD_DAYS = float(os.getenv("SELECTOR_DEAD_DAYS", "7"))
+# ...except for one probe per SELECTOR_RETRY_HOURS, in case the site switches back
+SELECTOR_RETRY_HOURS = float(os.getenv("SELECTOR_RETRY_HOURS", "24"))
+# Seconds between re-reads of the stats table, to pick up what other workers learned
+SELECTOR_STATS_RELOAD = float(os.getenv("SELECTOR_STATS_RELOAD", "60"))
+
+
+def selector_domain(url):
+    """Key for selector stats: host without www."""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class SelectorStats:
+    """
+    Per-domain record of which review selectors matched, persisted in SQLite
+    
+    order() puts the selectors that won most recently first and leaves out
+    ones that have been dead for a while, so a page usually needs a single
+    soup.select call. Counts are updated additively and each process
+    re-reads the table every SELECTOR_STATS_RELOAD seconds, so gunicorn
+    workers sharing the file learn from each other within that delay.
+    """
+
+    def __init__(self, path, reload_after=SELECTOR_STATS_RELOAD):
+        self.path = path
+        self.reload_after = reload_after
+        self.rows = None
+        self.loaded_at = 0
+        self._lock = threading.Lock()
+        self._connection = None
+        self._connection_pid = None
+
+    def _db(self):
+        """SQLite connection for this process (connections must not cross a fork)"""
+        if self._connection is None or self._connection_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS selector_stats (domain TEXT, selector TEXT, hits INTEGER, "
+                "misses INTEGER, miss_streak INTEGER, last_hit REAL, last_tried REAL, "
+                "PRIMARY KEY (domain, selector))"
+            )
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def _load(self):
+        """Rows from memory, re-read from SQLite once they are reload_after seconds old"""
+        now = time.monotonic()
+        if self.rows is None or now - self.loaded_at >= self.reload_after:
+            rows = {}
+            try:
+                for domain, selector, hits, misses, miss_streak, last_hit, last_tried in self._db().execute(
+                    "SELECT domain, selector, hits, misses, miss_streak, last_hit, last_tried FROM selector_stats"
+                ):
+                    rows[(domain, selector)] = {
+                        "hits": hits, "misses": misses, "miss_streak": miss_streak,
+                        "last_hit": last_hit, "last_tried": last_tried
+                    }
+            except sqlite3.Error as e:
+                print(f"Selector stats load failed: {e}")
+                # Keep what this process already knows rather than forgetting it
+                if self.rows is not None:
+                    rows = self.rows
+            self.rows = rows
+            self.loaded_at = now
+        return self.rows
+
+    def order(self, domain, selectors):
+        """Candidates for this domain: recent winners first, dead selectors skipped"""
+        now = time.time()
+        ranked = []
+        with self._lock:
+            rows = self._load()
+            for position, selector in enumerate(selectors):
+                row = rows.get((domain, selector))
+                if row is None:
+                    ranked.append((1, 0, position, selector))
+                    continue
+                dead = (row["miss_streak"] >= SELECTOR_DEAD_AFTER and
+                        now - (row["last_hit"] or 0) > SELECTOR_DEAD_DAYS * 86400)
+                if dead and now - (row["last_tried"] or 0) < SELECTOR_RETRY_HOURS * 3600:
+                    continue
+                if row["last_hit"]:
+                    ranked.append((0, -row["last_hit"], position, selector))
+                else:
+                    ranked.append((1, 0, position, selector))
+        return [selector for *_, selector in sorted(ranked)]
+
+    def record(self, domain, tried, winner=None):
+        """Count a miss for every tried selector except the winner, which gets a hit"""
+        now = time.time()
+        with self._lock:
+            rows = self._load()
+            for selector in tried:
+                row = rows.setdefault((domain, selector), {
+                    "hits": 0, "misses": 0, "miss_streak": 0, "last_hit": None, "last_tried": None
+                })
+                row["last_tried"] = now
+                if selector == winner:
+                    row["hits"] += 1
+                    row["miss_streak"] = 0
+                    row["last_hit"] = now
+                else:
+                    row["misses"] += 1
+                    row["miss_streak"] += 1
+            try:
+                db = self._db()
+                with db:
+                    db.executemany(
+                        "INSERT INTO selector_stats VALUES (?, ?, 1, 0, 0, ?, ?) ON CONFLICT (domain, selector) "
+                        "DO UPDATE SET hits = hits + 1, miss_streak = 0, last_hit = excluded.last_hit, "
+                        "last_tried = excluded.last_tried",
+                        [(domain, selector, now, now) for selector in tried if selector == winner]
+                    )
+                    db.executemany(
+                        "INSERT INTO selector_stats VALUES (?, ?, 0, 1, 1, NULL, ?) ON CONFLICT (domain, selector) "
+                        "DO UPDATE SET misses = misses + 1, miss_streak = miss_streak + 1, "
+                        "last_tried = excluded.last_tried",
+                        [(domain, selector, now) for selector in tried if selector != winner]
+                    )
+            except sqlite3.Error as e:
+                print(f"Selector stats write failed: {e}")
+
+    def stats(self):
+        """{domain: [selector stats, best first]}"""
+        with self._lock:
+            rows = dict(self._load())
+        by_domain = {}
+        for (domain, selector), row in rows.items():
+            by_domain.setdefault(domain, []).append(dict(row, selector=selector))
+        for entries in by_domain.values():
+            entries.sort(key=lambda entry: (-(entry["last_hit"] or 0), -entry["hits"]))
+        return by_domain
+
+
+SELECTOR_STATS = SelectorStats(SELECTOR_STATS_PATH) if SELECTOR_STATS_PATH else None
+
+
+def select_page_reviews(soup, selectors, skip_text=(), domain=None):
+    """
+    Review texts from the first selector that matches anything - Takes ALL reviews including duplicates
+    
+    With a domain, selectors are tried in the order learned for it and the
+    outcome is recorded.
+    """
+    learning = domain is not None and SELECTOR_STATS is not None
+    if learning:
+        selectors = SELECTOR_STATS.order(domain, selectors)
+    
+    page_reviews = []
+    tried = []
+    for selector in selectors:
+        tried.append(selector)
+        elements = soup.select(selector)
+        
+        for element in elements:
+            text = element.get_text(strip=True)
+            if (text and 20 <= len(text) <= 3000 and
+                not any(skip in text.lower() for skip in skip_text)):
+                # Add ALL reviews including duplicates
+                page_reviews.append(text)
+        
+        if page_reviews:
+            print(f"Found {len(page_reviews)} reviews with selector '{selector}'")
+            break
+    
+    if learning:
+        SELECTOR_STATS.record(domain, tried, winner=tried[-1] if page_reviews else None)
+    return page_reviews
+
+
+def parse_amazon_page(soup, domain=None):
+    """Reviews on one Amazon review page, and whether a next page exists"""
+    page_reviews = select_page_reviews(soup, AMAZON_REVIEW_SELECTORS, AMAZON_SKIP_TEXT, domain)
+    
+    # Check for "Next page" button to confirm more pages exist
+    next_button = soup.select_one(AMAZON_NEXT_PAGE_SELECTOR)
+    has_next_page = bool(next_button) and 'a-disabled' not in str(next_button.get('class', []))
+    return page_reviews, has_next_page
+
+
+def parse_amazon_response(content, domain=None):
+    """(soup, reviews, has next page) for a fetched Amazon page - blocking, run it in a thread from async code"""
+    soup = parse_review_page(content, AMAZON_PAGE_SELECTORS)
+    return (soup,) + parse_amazon_page(soup, domain)
+
+
+def parse_listing_response(content, page_selectors, review_selectors, domain=None):
+    """(soup, reviews) for a fetched Flipkart/Meesho page - blocking, run it in a thread from async code"""
+    soup = parse_review_page(content, page_selectors)
+    return soup, select_page_reviews(soup, review_selectors, domain=domain)
+
+
+# A count as the sites print it: 1234, 1,234 or Indian-grouped 1,23,456
+COUNT_NUMBER = r'(\d{1,3}(?:,\d{2,3})+|\d+)'
+
+# Review count patterns shared by /get-review-count and the pagination planner
+REVIEW_COUNT_PATTERNS = [
+    COUNT_NUMBER + r'\s*(?:customer\s*|global\s*|with\s*)?reviews?',
+    r'See\s*all\s*' + COUNT_NUMBER + r'\s*reviews?'
+]
+RATING_COUNT_PATTERNS = [
+    COUNT_NUMBER + r'\s*(?:total\s*|global\s*)?ratings?'
+]
+
+
+def _first_count(pattern, text):
+    match = re.search(pattern, text, re.IGNORECASE)
+    return int(match.group(1).replace(',', '')) if match else 0
+
+
+def estimate_review_count(page_text):
+    """Largest advertised review/rating count in the page text (0 if none)"""
+    return max(_first_count(pattern, page_text) for pattern in REVIEW_COUNT_PATTERNS + RATING_COUNT_PATTERNS)
+
+
+def advertised_review_count(soup, count_selectors):
+    """
+    Count shown in the platform's review count element (0 if there is none)
+    
+    Only that element is read - free page text includes review bodies, where
+    "I read 2 reviews" would pass for the count. A written-review count
+    ("567 with reviews") wins over the ratings count printed next to it.
+    """
+    if not count_selectors:
+        return 0
+    text = " ".join(element.get_text(" ", strip=True) for element in soup.select(", ".join(count_selectors)))
+    for patterns in (REVIEW_COUNT_PATTERNS, RATING_COUNT_PATTERNS):
+        count = max(_first_count(pattern, text) for pattern in patterns)
+        if count:
+            return count
+    return 0
+
+
+# Incremental re-scrapes: remember each product's reviews and stop at the first one seen before
+INCREMENTAL_SCRAPE = os.getenv("INCREMENTAL_SCRAPE", "false").lower() == "true"
+CRAWL_STATE_PATH = os.getenv("CRAWL_STATE_PATH", os.path.join(CACHE_DIR, "crawl_state.sqlite3"))
+# Reviews kept per product between runs
+CRAWL_STATE_MAX_REVIEWS = int(os.getenv("CRAWL_STATE_MAX_REVIEWS", "10000"))
+
+
+def review_fingerprint(text):
+    """Identity of a review across runs: hash of its lower-cased, whitespace-collapsed text"""
+    normalized = re.sub(r'\s+', ' ', text).strip().lower()
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def product_key(url):
+    """Stable per-product key: platform + product id when the URL has one"""
+    asin_match = re.search(r'/(?:dp|product)/([A-Z0-9]{10})', url)
+    if asin_match and 'amazon' in url.lower():
+        return f"amazon:{asin_match.group(1)}"
+    product_match = re.search(r'/p/([a-zA-Z0-9]+)', url)
+    if product_match and 'flipkart' in url.lower():
+        return f"flipkart:{product_match.group(1)}"
+    return normalize_url(url)
+
+
+class CrawlStateStore:
+    """Raw reviews collected per product on the previous run, newest first (SQLite, shared by workers)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = None
+        self._connection_pid = None
+
+    def _db(self):
+        """SQLite connection for this process (connections must not cross a fork)"""
+        if self._connection is None or self._connection_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS crawl_state (product TEXT PRIMARY KEY, reviews TEXT, updated_at REAL)"
+            )
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def load(self, product):
+        """Reviews stored for the product ([] on the first run)"""
+        try:
+            with self._lock:
+                row = self._db().execute("SELECT reviews FROM crawl_state WHERE product = ?", (product,)).fetchone()
+            return json.loads(row[0]) if row else []
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Crawl state read failed: {e}")
+            return []
+
+    def save(self, product, reviews):
+        try:
+            with self._lock:
+                db = self._db()
+                with db:
+                    db.execute(
+                        "INSERT OR REPLACE INTO crawl_state VALUES (?, ?, ?)",
+                        (product, json.dumps(reviews[:CRAWL_STATE_MAX_REVIEWS]), time.time())
+                    )
+        except sqlite3.Error as e:
+            print(f"Crawl state write failed: {e}")
+
+
+CRAWL_STATE = CrawlStateStore(CRAWL_STATE_PATH) if CRAWL_STATE_PATH else None
+
+
+def merge_with_previous_run(new_reviews, previous_reviews):
+    """New reviews first, then every stored review not fetched again"""
+    fetched = {review_fingerprint(review) for review in new_reviews}
+    return new_reviews + [review for review in previous_reviews if review_fingerprint(review) not in fetched]
+
+
+class PagePlanner:
+    """
+    Page budget and repeated-page detection for one paginated crawl
+    
+    The budget starts at max_pages. Once the first page is in, it shrinks to
+    exactly the pages needed for min(advertised review count, max_reviews)
+    at the observed reviews per page, but grows back (up to max_pages) for
+    as long as the last planned page still shows more to come. Every page
+    is fingerprinted, so a
+    page that repeats an earlier one (e.g. a pagination parameter the site
+    ignores) stops the crawl at once. With `seen` review fingerprints from
+    the previous run, the crawl also stops at the first page that reaches
+    an already-seen review.
+    """
+
+    def __init__(self, max_pages, max_reviews=None, reviews_per_page=10, seen=None):
+        self.max_pages = max_pages
+        self.page_limit = max_pages
+        self.max_reviews = max_reviews
+        self.reviews_per_page = reviews_per_page
+        self.seen = seen or set()
+        self.fingerprints = {}
+        self.next_page = 1
+
+    def pages(self):
+        """
+        Page numbers to fetch, as an iterator that reads the budget on every next()
+        
+        A shrinking budget applies to pages not yet started, and once the
+        budget grows again the same iterator carries on where it stopped.
+        """
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.next_page > self.max_pages:
+            raise StopIteration
+        self.next_page += 1
+        return self.next_page - 1
+
+    def observe_first_page(self, soup, page_reviews, count_selectors=()):
+        """Size the crawl from the count in the platform's count element on page 1"""
+        advertised = advertised_review_count(soup, count_selectors)
+        if page_reviews:
+            self.reviews_per_page = len(page_reviews)
+        if not advertised:
+            return
+        wanted = min(advertised, self.max_reviews) if self.max_reviews else advertised
+        needed = max(1, -(-wanted // self.reviews_per_page))
+        if needed < self.max_pages:
+            print(f"Advertised {advertised} reviews: planning {needed} pages instead of {self.max_pages}")
+            self.max_pages = needed
+
+    def observe_page(self, page, page_reviews, has_next=None):
+        """
+        Never plan fewer pages than the site has shown to exist
+        
+        A page with reviews and an enabled Next button - or, where the
+        scraper does not read Next, a full page of reviews - means page + 1
+        exists, so the budget is raised to it whatever count was advertised.
+        """
+        if has_next is None:
+            has_next = len(page_reviews) >= self.reviews_per_page
+        if page_reviews and has_next and self.max_pages <= page < self.page_limit:
+            print(f"Page {page} still has reviews and a next page: continuing past the advertised count")
+            self.max_pages = page + 1
+
+    def is_repeat(self, page, content, page_reviews):
+        """True when this page has the same reviews (or, without reviews, the same body) as an earlier page"""
+        if page_reviews:
+            body = "\x00".join(page_reviews).encode("utf-8")
+        else:
+            body = content if isinstance(content, bytes) else content.encode("utf-8")
+        fingerprint = hashlib.blake2b(body, digest_size=16).digest()
+        if fingerprint in self.fingerprints:
+            print(f"Page {page} repeats page {self.fingerprints[fingerprint]}, stopping")
+            return True
+        self.fingerprints[fingerprint] = page
+        return False
+
+    def unseen(self, page, page_reviews):
+        """
+        (reviews not seen on the previous run, whether this page reached seen ones)
+        
+        Pages are assumed newest first, so everything after the first
+        already-seen review is old too - only pass `seen` for crawls that
+        request a recency sort (Amazon sortBy=recent, Flipkart
+        sortOrder=MOST_RECENT).
+        """
+        if not self.seen:
+            return page_reviews, False
+        for position, review in enumerate(page_reviews):
+            if review_fingerprint(review) in self.seen:
+                print(f"Page {page}: reached reviews seen on the previous run, stopping")
+                return page_reviews[:position], True
+        return page_reviews, False
+
+    def has_enough(self, collected):
+        if self.max_reviews and collected >= self.max_reviews:
+            print(f"Collected {collected} reviews (target {self.max_reviews}), stopping")
+            return True
+        return False
+
+
+async def scrape_amazon_reviews_async(url, client, max_pages=50, max_reviews=None, seen=None, on_page=None,
+                                      incremental=False):
+    """
+    Enhanced Amazon review scraping with pagination - Takes ALL reviews including duplicates
+    
+    Returns (reviews, caught_up): caught_up is True only when the crawl
+    reached a review from `seen`, i.e. everything older is already stored.
+    `incremental` crawls read newest first, the first run included.
+    """
     all_reviews = []
+    caught_up = False  # reached reviews from the previous run
     
     try:
         # Extract ASIN from URL
@@ -176,107 +622,107 @@ def scrape_amazon_reviews(url, session, max_pages=50):
             
             # Try direct review page URLs
             review_urls = [
-                f"https://www.amazon.in/product-reviews/{asin}/ref=cm_cr_dp_d_show_all_btm",
-                f"https://www.amazon.in/product-reviews/{asin}/",
-                f"https://www.amazon.in/{asin}/product-reviews/"
+                f"{AMAZON_BASE_URL}/product-reviews/{asin}/ref=cm_cr_dp_d_show_all_btm",
+                f"{AMAZON_BASE_URL}/product-reviews/{asin}/",
+                f"{AMAZON_BASE_URL}/{asin}/product-reviews/"
             ]
             
             for base_review_url in review_urls:
                 print(f"Trying Amazon base URL: {base_review_url}")
                 consecutive_failures = 0
+                planner = PagePlanner(max_pages, max_reviews, seen=seen)
                 
-                for page in range(1, max_pages + 1):
-                    try:
-                        # Construct paginated URL
-                        if page > 1:
-                            paginated_url = f"{base_review_url}?pageNumber={page}"
-                        else:
-                            paginated_url = base_review_url
-                        
-                        print(f"Scraping Amazon page {page}/{max_pages}: {paginated_url}")
-                        response = session.get(paginated_url, timeout=20)
-                        
-                        if response.status_code != 200:
-                            print(f"Page {page} returned status {response.status_code}")
-                            consecutive_failures += 1
-                            if consecutive_failures >= 3:
-                                print("Too many consecutive failures, stopping")
-                                break
-                            continue
-                        
-                        consecutive_failures = 0  # Reset on success
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        
-                        # Updated Amazon selectors for 2024/2025
-                        amazon_selectors = [
-                            '[data-hook="review-body"] > span',
-                            '[data-hook="review-body"] span:not([class*="cr-lightbox"])',
-                            'span[data-hook="review-body"] span',
-                            '.cr-original-review-text',
-                            '.review-text-content span',
-                            '[data-hook="review-body"]'
-                        ]
-                        
-                        page_reviews = []
-                        for selector in amazon_selectors:
-                            elements = soup.select(selector)
+                async def fetch_page(page, base_review_url=base_review_url):
+                    # Construct paginated URL
+                    if incremental:
+                        # Incremental runs read newest first, so later runs can stop at the first known review
+                        paginated_url = f"{base_review_url}?sortBy=recent&pageNumber={page}"
+                    elif page > 1:
+                        paginated_url = f"{base_review_url}?pageNumber={page}"
+                    else:
+                        paginated_url = base_review_url
+                    
+                    print(f"Scraping Amazon page {page}/{max_pages}: {paginated_url}")
+                    # A cached newest-first page would hide reviews posted since
+                    return await client.get(paginated_url, timeout=20, revalidate=incremental, store=False)
+                
+                # Pages are fetched concurrently but handled here in page order
+                async with aclosing(iter_pages(fetch_page, planner.pages())) as pages:
+                    async for page, pending in pages:
+                        try:
+                            response = pending.result()
+                            
+                            if response.status_code != 200:
+                                print(f"Page {page} returned status {response.status_code}")
+                                consecutive_failures += 1
+                                if consecutive_failures >= 3:
+                                    print("Too many consecutive failures, stopping")
+                                    break
+                                continue
                             
-                            for element in elements:
-                                text = element.get_text(strip=True)
-                                if (text and 20 <= len(text) <= 3000 and
-                                    not any(skip in text.lower() for skip in [
-                                        'verified purchase', 'helpful', 'report abuse',
-                                        'comment', 'was this review helpful', 'see all photos',
-                                        'by ', 'on '
-                                    ])):
-                                    # Add ALL reviews including duplicates
-                                    page_reviews.append(text)
+                            consecutive_failures = 0  # Reset on success
+                            # Parsing and the selector stats write stay off the shared scraping loop
+                            soup, page_reviews, has_next_page = await asyncio.to_thread(
+                                parse_amazon_response, response.content, selector_domain(response.url)
+                            )
+                            if page_reviews:
+                                # Only pages with reviews are cached - a bot check is a 200 too
+                                await client.keep(response)
+                            if page == 1:
+                                planner.observe_first_page(soup, page_reviews, AMAZON_REVIEW_COUNT_SELECTORS)
+                            if planner.is_repeat(page, response.content, page_reviews):
+                                break
+                            planner.observe_page(page, page_reviews, has_next_page)
+                            page_reviews, reached_seen = planner.unseen(page, page_reviews)
+                            if on_page is not None and page_reviews:
+                                await on_page(page_reviews)
+                            if reached_seen:
+                                all_reviews.extend(page_reviews)
+                                caught_up = True
+                                break
                             
                             if page_reviews:
-                                print(f"Found {len(page_reviews)} reviews with selector '{selector}'")
+                                all_reviews.extend(page_reviews)
+                                print(f"Page {page}: Added {len(page_reviews)} reviews (Total: {len(all_reviews)})")
+                                if planner.has_enough(len(all_reviews)):
+                                    break
+                            else:
+                                print(f"Page {page}: No reviews found")
+                                consecutive_failures += 1
+                                if consecutive_failures >= 2:
+                                    print("No reviews on multiple consecutive pages, stopping")
+                                    break
+                            
+                            if not has_next_page:
+                                print("No more pages available (next button disabled)")
                                 break
                         
-                        if page_reviews:
-                            all_reviews.extend(page_reviews)
-                            print(f"Page {page}: Added {len(page_reviews)} reviews (Total: {len(all_reviews)})")
-                            time.sleep(2)  # Respectful delay
-                        else:
-                            print(f"Page {page}: No reviews found")
+                        except Exception as page_error:
+                            print(f"Error on Amazon page {page}: {page_error}")
                             consecutive_failures += 1
-                            if consecutive_failures >= 2:
-                                print("No reviews on multiple consecutive pages, stopping")
+                            if consecutive_failures >= 3:
                                 break
-                        
-                        # Check for "Next page" button to confirm more pages exist
-                        next_button = soup.select_one('li.a-last a, [aria-label="Next page"]')
-                        if not next_button or 'a-disabled' in str(next_button.get('class', [])):
-                            print("No more pages available (next button disabled)")
-                            break
-                    
-                    except Exception as page_error:
-                        print(f"Error on Amazon page {page}: {page_error}")
-                        consecutive_failures += 1
-                        if consecutive_failures >= 3:
-                            break
-                        time.sleep(3)
-                        continue
+                            continue
                 
-                if all_reviews:
+                if all_reviews or caught_up:
                     print(f"Successfully scraped {len(all_reviews)} Amazon reviews")
                     break  # Success with this URL pattern
         
         # Fallback: Try original URL if no ASIN found
-        if not all_reviews:
+        if not all_reviews and not caught_up:
             print("Trying original Amazon URL as fallback...")
-            response = session.get(url, timeout=15)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            response = await client.get(url, timeout=15, store=False)
+            soup = await asyncio.to_thread(BeautifulSoup, response.content, HTML_PARSER)
             
             # Look for "See all reviews" link and follow it
             see_all_link = soup.find('a', string=re.compile(r'See all.*reviews?', re.I))
             if see_all_link and see_all_link.get('href'):
+                await client.keep(response)
                 reviews_url = urljoin(url, see_all_link['href'])
                 print(f"Found 'See all reviews' link: {reviews_url}")
-                return scrape_amazon_reviews(reviews_url, session, max_pages)
+                return await scrape_amazon_reviews_async(
+                    reviews_url, client, max_pages, max_reviews, seen, on_page, incremental
+                )
     
     except Exception as e:
         print(f"Amazon scraping error: {e}")
@@ -284,12 +730,14 @@ def scrape_amazon_reviews(url, session, max_pages=50):
     finally:
         print(f"Amazon scraping completed with {len(all_reviews)} total reviews")
     
-    return all_reviews
+    return all_reviews, caught_up
 
 
-def scrape_flipkart_reviews(url, session, max_pages=50):
-    """Enhanced Flipkart review scraping with pagination - Takes ALL reviews including duplicates"""
+async def scrape_flipkart_reviews_async(url, client, max_pages=50, max_reviews=None, seen=None, on_page=None,
+                                        incremental=False):
+    """Enhanced Flipkart review scraping with pagination - returns (reviews, caught_up) like the Amazon scraper"""
     all_reviews = []
+    caught_up = False  # reached reviews from the previous run
     
     try:
         # Extract product ID from Flipkart URL
@@ -301,81 +749,82 @@ def scrape_flipkart_reviews(url, session, max_pages=50):
             # Try direct review URLs
             base_review_url = url.replace('/p/', '/product-reviews/')
             consecutive_failures = 0
+            planner = PagePlanner(max_pages, max_reviews, seen=seen)
             
-            for page in range(1, max_pages + 1):
-                try:
-                    if page > 1:
-                        review_url = f"{base_review_url}?page={page}"
-                    else:
-                        review_url = base_review_url
-                    
-                    print(f"Scraping Flipkart page {page}/{max_pages}: {review_url}")
-                    response = session.get(review_url, timeout=20)
-                    
-                    if response.status_code != 200:
-                        # Try alternative pagination format
-                        review_url = f"{base_review_url}&page={page}"
-                        response = session.get(review_url, timeout=20)
-                        
-                    if response.status_code != 200:
-                        print(f"Page {page} returned status {response.status_code}")
-                        consecutive_failures += 1
-                        if consecutive_failures >= 3:
-                            break
-                        continue
-                    
-                    consecutive_failures = 0
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Updated Flipkart selectors
-                    flipkart_selectors = [
-                        '._2cLu-l',
-                        '.t-ZTKy',
-                        '._11pzQk',
-                        '.qwjRop',
-                        '.ZmyHeo',
-                        'div[class*="_2cLu"]',
-                        'div[class*="ZmyHeo"]',
-                        '.RcXBOT'
-                    ]
-                    
-                    page_reviews = []
-                    for selector in flipkart_selectors:
-                        elements = soup.select(selector)
+            async def fetch_page(page):
+                if incremental:
+                    # Incremental runs read newest first, so later runs can stop at the first known review
+                    review_url = f"{base_review_url}?sortOrder=MOST_RECENT&page={page}"
+                elif page > 1:
+                    review_url = f"{base_review_url}?page={page}"
+                else:
+                    review_url = base_review_url
+                
+                print(f"Scraping Flipkart page {page}/{max_pages}: {review_url}")
+                response = await client.get(review_url, timeout=20, revalidate=incremental, store=False)
+                
+                if response.status_code != 200:
+                    # Try alternative pagination format
+                    review_url = f"{base_review_url}&page={page}"
+                    response = await client.get(review_url, timeout=20, store=False)
+                return response
+            
+            # Pages are fetched concurrently but handled here in page order
+            async with aclosing(iter_pages(fetch_page, planner.pages())) as pages:
+                async for page, pending in pages:
+                    try:
+                        response = pending.result()
                         
-                        for element in elements:
-                            text = element.get_text(strip=True)
-                            if text and 20 <= len(text) <= 3000:
-                                # Add ALL reviews including duplicates
-                                page_reviews.append(text)
+                        if response.status_code != 200:
+                            print(f"Page {page} returned status {response.status_code}")
+                            consecutive_failures += 1
+                            if consecutive_failures >= 3:
+                                break
+                            continue
                         
+                        consecutive_failures = 0
+                        soup, page_reviews = await asyncio.to_thread(
+                            parse_listing_response, response.content, FLIPKART_PAGE_SELECTORS,
+                            FLIPKART_REVIEW_SELECTORS, selector_domain(response.url)
+                        )
                         if page_reviews:
-                            print(f"Found {len(page_reviews)} reviews with selector '{selector}'")
+                            await client.keep(response)
+                        if page == 1:
+                            planner.observe_first_page(soup, page_reviews, FLIPKART_REVIEW_COUNT_SELECTORS)
+                        if planner.is_repeat(page, response.content, page_reviews):
                             break
+                        planner.observe_page(page, page_reviews)
+                        page_reviews, reached_seen = planner.unseen(page, page_reviews)
+                        if on_page is not None and page_reviews:
+                            await on_page(page_reviews)
+                        if reached_seen:
+                            all_reviews.extend(page_reviews)
+                            caught_up = True
+                            break
+                        
+                        if page_reviews:
+                            all_reviews.extend(page_reviews)
+                            print(f"Page {page}: Added {len(page_reviews)} reviews (Total: {len(all_reviews)})")
+                            if planner.has_enough(len(all_reviews)):
+                                break
+                        else:
+                            print(f"Page {page}: No reviews")
+                            consecutive_failures += 1
+                            if consecutive_failures >= 2:
+                                break
                     
-                    if page_reviews:
-                        all_reviews.extend(page_reviews)
-                        print(f"Page {page}: Added {len(page_reviews)} reviews (Total: {len(all_reviews)})")
-                        time.sleep(2)
-                    else:
-                        print(f"Page {page}: No reviews")
+                    except Exception as page_error:
+                        print(f"Error on Flipkart page {page}: {page_error}")
                         consecutive_failures += 1
-                        if consecutive_failures >= 2:
+                        if consecutive_failures >= 3:
                             break
-                
-                except Exception as page_error:
-                    print(f"Error on Flipkart page {page}: {page_error}")
-                    consecutive_failures += 1
-                    if consecutive_failures >= 3:
-                        break
-                    time.sleep(3)
-                    continue
+                        continue
         
         # Fallback: Try original URL
-        if not all_reviews:
+        if not all_reviews and not caught_up:
             print("Trying original Flipkart URL as fallback...")
-            response = session.get(url, timeout=15)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            response = await client.get(url, timeout=15, store=False)
+            soup = await asyncio.to_thread(BeautifulSoup, response.content, HTML_PARSER)
             
             for selector in ['._2cLu-l', '.t-ZTKy', '._11pzQk']:
                 elements = soup.select(selector)
@@ -384,6 +833,7 @@ def scrape_flipkart_reviews(url, session, max_pages=50):
                     if text and len(text) > 20:
                         all_reviews.append(text)
                 if all_reviews:
+                    await client.keep(response)
                     break
     
     except Exception as e:
@@ -392,83 +842,91 @@ def scrape_flipkart_reviews(url, session, max_pages=50):
     finally:
         print(f"Flipkart scraping completed with {len(all_reviews)} total reviews")
     
-    return all_reviews
+    return all_reviews, caught_up
 
 
-def scrape_meesho_reviews(url, session, max_pages=30):
-    """Enhanced Meesho review scraping - Takes ALL reviews including duplicates"""
+async def scrape_meesho_reviews_async(url, client, max_pages=30, max_reviews=None, seen=None, on_page=None,
+                                      incremental=False):
+    """Enhanced Meesho review scraping - returns (reviews, caught_up) like the Amazon scraper"""
     all_reviews = []
+    caught_up = False  # reached reviews from the previous run
+    
+    if incremental:
+        # No known newest-first ordering - stopping at a seen review could skip newer
+        # ones further down, so crawl everything and let the caller merge
+        print("Meesho has no recency sort: incremental run falls back to a full crawl")
+        seen = None
     
     try:
         consecutive_failures = 0
-        
-        for page in range(1, max_pages + 1):
-            try:
-                if page > 1:
-                    paginated_urls = [
-                        f"{url}?page={page}",
-                        f"{url}&page={page}",
-                        f"{url}#page-{page}"
-                    ]
-                else:
-                    paginated_urls = [url]
+        planner = PagePlanner(max_pages, max_reviews, seen=seen)
+        
+        async def fetch_page(page):
+            if page > 1:
+                paginated_urls = [
+                    f"{url}?page={page}",
+                    f"{url}&page={page}",
+                    f"{url}#page-{page}"
+                ]
+            else:
+                paginated_urls = [url]
+            
+            for paginated_url in paginated_urls:
+                print(f"Scraping Meesho page {page}/{max_pages}: {paginated_url}")
+                response = await client.get(paginated_url, timeout=20, store=False)
                 
-                for paginated_url in paginated_urls:
-                    print(f"Scraping Meesho page {page}/{max_pages}: {paginated_url}")
-                    response = session.get(paginated_url, timeout=20)
+                if response.status_code == 200:
+                    return response
+            return None
+        
+        # Pages are fetched concurrently but handled here in page order
+        async with aclosing(iter_pages(fetch_page, planner.pages())) as pages:
+            async for page, pending in pages:
+                try:
+                    response = pending.result()
+                    if response is None:
+                        consecutive_failures += 1
+                        if consecutive_failures >= 3:
+                            break
+                        continue
                     
-                    if response.status_code == 200:
+                    consecutive_failures = 0
+                    soup, page_reviews = await asyncio.to_thread(
+                        parse_listing_response, response.content, MEESHO_REVIEW_SELECTORS,
+                        MEESHO_REVIEW_SELECTORS, selector_domain(response.url)
+                    )
+                    if page_reviews:
+                        await client.keep(response)
+                    if page == 1:
+                        # Meesho shows no review count to plan from
+                        planner.observe_first_page(soup, page_reviews)
+                    if planner.is_repeat(page, response.content, page_reviews):
                         break
-                else:
-                    consecutive_failures += 1
-                    if consecutive_failures >= 3:
+                    planner.observe_page(page, page_reviews)
+                    page_reviews, reached_seen = planner.unseen(page, page_reviews)
+                    if on_page is not None and page_reviews:
+                        await on_page(page_reviews)
+                    if reached_seen:
+                        all_reviews.extend(page_reviews)
+                        caught_up = True
                         break
-                    continue
-                
-                consecutive_failures = 0
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                meesho_selectors = [
-                    '[data-testid*="review"]',
-                    '.ReviewCard__reviewText',
-                    '[class*="Review"][class*="Text"]',
-                    '.review-content',
-                    '[class*="review"][class*="text"]',
-                    'div[class*="review"] p',
-                    '[class*="ReviewCard"] div',
-                    '[class*="UserReview"]'
-                ]
-                
-                page_reviews = []
-                for selector in meesho_selectors:
-                    elements = soup.select(selector)
-                    
-                    for element in elements:
-                        text = element.get_text(strip=True)
-                        if text and 20 <= len(text) <= 3000:
-                            # Add ALL reviews including duplicates
-                            page_reviews.append(text)
                     
                     if page_reviews:
-                        print(f"Found {len(page_reviews)} reviews with selector '{selector}'")
-                        break
+                        all_reviews.extend(page_reviews)
+                        print(f"Page {page}: Added {len(page_reviews)} reviews (Total: {len(all_reviews)})")
+                        if planner.has_enough(len(all_reviews)):
+                            break
+                    else:
+                        consecutive_failures += 1
+                        if consecutive_failures >= 2:
+                            break
                 
-                if page_reviews:
-                    all_reviews.extend(page_reviews)
-                    print(f"Page {page}: Added {len(page_reviews)} reviews (Total: {len(all_reviews)})")
-                    time.sleep(2)
-                else:
+                except Exception as page_error:
+                    print(f"Error on Meesho page {page}: {page_error}")
                     consecutive_failures += 1
-                    if consecutive_failures >= 2:
+                    if consecutive_failures >= 3:
                         break
-            
-            except Exception as page_error:
-                print(f"Error on Meesho page {page}: {page_error}")
-                consecutive_failures += 1
-                if consecutive_failures >= 3:
-                    break
-                time.sleep(3)
-                continue
+                    continue
     
     except Exception as e:
         print(f"Meesho scraping error: {e}")
@@ -476,189 +934,178 @@ def scrape_meesho_reviews(url, session, max_pages=30):
     finally:
         print(f"Meesho scraping completed with {len(all_reviews)} total reviews")
     
-    return all_reviews
+    return all_reviews, caught_up
+
+
+def scrape_amazon_reviews(url, session, max_pages=50):
+    """Synchronous wrapper around scrape_amazon_reviews_async using the given requests session"""
+    return run_sync(scrape_amazon_reviews_async(url, AsyncHttpClient(session=session), max_pages))[0]
+
+
+def scrape_flipkart_reviews(url, session, max_pages=50):
+    """Synchronous wrapper around scrape_flipkart_reviews_async using the given requests session"""
+    return run_sync(scrape_flipkart_reviews_async(url, AsyncHttpClient(session=session), max_pages))[0]
+
+
+def scrape_meesho_reviews(url, session, max_pages=30):
+    """Synchronous wrapper around scrape_meesho_reviews_async using the given requests session"""
+    return run_sync(scrape_meesho_reviews_async(url, AsyncHttpClient(session=session), max_pages))[0]
 
 
-def scrape_with_selenium_pagination(url, max_pages=20):
-    """Selenium-based scraping with pagination and dynamic loading - FIXED"""
+def scrape_with_selenium_pagination(url, max_pages=20, pool=None):
+    """
+    Selenium-based scraping with pagination and dynamic loading
+    
+    Runs on a warm browser from the process BrowserPool (or the given pool)
+    and waits for page changes instead of sleeping fixed delays.
+    """
+    pool = pool or get_browser_pool()
     try:
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        from selenium.common.exceptions import TimeoutException, NoSuchElementException
-        
-        print(f"Starting Selenium scraping with pagination (max {max_pages} pages)...")
-        
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-        
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.get(url)
-        
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
-        
-        all_reviews = []
-        unique_reviews = set()
-        
-        # Strategy 1: Infinite scroll loading
-        print("Attempting infinite scroll strategy...")
-        last_height = driver.execute_script("return document.body.scrollHeight")
-        scroll_attempts = 0
-        max_scrolls = 20
-        
-        while scroll_attempts < max_scrolls:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(3)
-            
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            
-            if new_height == last_height:
-                print(f"No more content loaded after scroll {scroll_attempts + 1}")
-                break
-            
-            last_height = new_height
-            scroll_attempts += 1
-            print(f"Scroll {scroll_attempts}: New content loaded")
-        
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        reviews = extract_reviews_from_soup(soup, url)
-        for review in reviews:
-            text_hash = hash(review.lower())
-            if text_hash not in unique_reviews:
-                unique_reviews.add(text_hash)
-                all_reviews.append(review)
-        
-        # Strategy 2: Pagination buttons
-        print("Attempting pagination strategy...")
-        
-        pagination_selectors = [
-            'li.a-last a',
-            '.a-pagination .a-normal',
-            '[aria-label="Go to next page"]',
-            '._1LKTO3',
-            '.ge-49M',
-            '[class*="next"]',
-            '.pagination a',
-            '[class*="page"][class*="next"]',
-            'a[aria-label*="next"]'
-        ]
-        
-        pages_scraped = 1
-        consecutive_failures = 0
-        
-        while pages_scraped < max_pages and consecutive_failures < 3:
-            next_button = None
-            for selector in pagination_selectors:
-                try:
-                    next_button = driver.find_element(By.CSS_SELECTOR, selector)
-                    if next_button and next_button.is_enabled():
-                        break
-                except NoSuchElementException:
-                    continue
-            
-            if not next_button or not next_button.is_enabled():
-                print("No more pages available")
-                break
-            
-            try:
-                driver.execute_script("arguments[0].click();", next_button)
-                time.sleep(4)
-                
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-                page_reviews = extract_reviews_from_soup(soup, url)
-                
-                new_reviews = []
-                for review in page_reviews:
-                    text_hash = hash(review.lower())
-                    if text_hash not in unique_reviews:
-                        unique_reviews.add(text_hash)
-                        new_reviews.append(review)
-                
-                if new_reviews:
-                    all_reviews.extend(new_reviews)
-                    print(f"Page {pages_scraped + 1}: Added {len(new_reviews)} reviews (Total: {len(all_reviews)})")
-                    pages_scraped += 1
-                    consecutive_failures = 0
-                else:
-                    print("No new reviews on this page")
-                    consecutive_failures += 1
-                    
-            except Exception as e:
-                print(f"Pagination error: {e}")
-                consecutive_failures += 1
+        with pool.checkout() as driver:
+            return _scrape_with_browser(driver, url, max_pages)
+    except ImportError:
+        print("Selenium not installed. Install with: pip install selenium")
+        return []
+    except Exception as e:
+        print(f"Selenium scraping error: {e}")
+        return []
+
+
+def _first_usable_element(driver, selectors, usable):
+    for selector in selectors:
+        for element in driver.find_elements("css selector", selector):
+            if usable(element):
+                return element
+    return None
+
+
+def _scrape_with_browser(driver, url, max_pages):
+    print(f"Starting Selenium scraping with pagination (max {max_pages} pages)...")
+    driver.get(url)
+    wait_for_document_ready(driver)
+    
+    all_reviews = []
+    unique_reviews = set()
+    
+    # Strategy 1: Infinite scroll loading
+    print("Attempting infinite scroll strategy...")
+    scroll_attempts = 0
+    max_scrolls = 20
+    
+    while scroll_attempts < max_scrolls:
+        before = page_state(driver)
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
         
-        # Strategy 3: "Load More" buttons
-        print("Looking for 'Load More' buttons...")
+        if not wait_for_page_change(driver, before, timeout=BROWSER_SCROLL_TIMEOUT):
+            print(f"No more content loaded after scroll {scroll_attempts + 1}")
+            break
         
-        load_more_selectors = [
-            '[class*="load"][class*="more"]',
-            '[id*="load"][id*="more"]',
-            'button[class*="more"]',
-            '.load-more-reviews',
-            '[data-hook*="load"]'
-        ]
+        scroll_attempts += 1
+        print(f"Scroll {scroll_attempts}: New content loaded")
+    
+    soup = BeautifulSoup(driver.page_source, HTML_PARSER)
+    reviews = extract_reviews_from_soup(soup, url)
+    for review in reviews:
+        text_hash = hash(review.lower())
+        if text_hash not in unique_reviews:
+            unique_reviews.add(text_hash)
+            all_reviews.append(review)
+    
+    # Strategy 2: Pagination buttons
+    print("Attempting pagination strategy...")
+    
+    pagination_selectors = [
+        'li.a-last a',
+        '.a-pagination .a-normal',
+        '[aria-label="Go to next page"]',
+        '._1LKTO3',
+        '.ge-49M',
+        '[class*="next"]',
+        '.pagination a',
+        '[class*="page"][class*="next"]',
+        'a[aria-label*="next"]'
+    ]
+    
+    pages_scraped = 1
+    consecutive_failures = 0
+    
+    while pages_scraped < max_pages and consecutive_failures < 3:
+        next_button = _first_usable_element(driver, pagination_selectors, lambda element: element.is_enabled())
+        if not next_button:
+            print("No more pages available")
+            break
         
-        load_attempts = 0
-        while load_attempts < 10:
-            load_more_button = None
+        try:
+            before = page_state(driver)
+            driver.execute_script("arguments[0].click();", next_button)
+            wait_for_page_change(driver, before)
             
-            for selector in load_more_selectors:
-                try:
-                    load_more_button = driver.find_element(By.CSS_SELECTOR, selector)
-                    if load_more_button and load_more_button.is_displayed():
-                        break
-                except NoSuchElementException:
-                    continue
+            soup = BeautifulSoup(driver.page_source, HTML_PARSER)
+            page_reviews = extract_reviews_from_soup(soup, url)
             
-            if not load_more_button:
-                break
+            new_reviews = []
+            for review in page_reviews:
+                text_hash = hash(review.lower())
+                if text_hash not in unique_reviews:
+                    unique_reviews.add(text_hash)
+                    new_reviews.append(review)
             
-            try:
-                driver.execute_script("arguments[0].click();", load_more_button)
-                time.sleep(3)
-                
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-                current_reviews = extract_reviews_from_soup(soup, url)
+            if new_reviews:
+                all_reviews.extend(new_reviews)
+                print(f"Page {pages_scraped + 1}: Added {len(new_reviews)} reviews (Total: {len(all_reviews)})")
+                pages_scraped += 1
+                consecutive_failures = 0
+            else:
+                print("No new reviews on this page")
+                consecutive_failures += 1
                 
-                if current_reviews and len(current_reviews) > len(all_reviews):
-                    all_reviews = current_reviews
-                    print(f"Load more {load_attempts + 1}: Total reviews now {len(all_reviews)}")
-                    load_attempts += 1
-                else:
-                    break
-                    
-            except Exception as e:
-                print(f"Load more error: {e}")
-                break
-        
-        driver.quit()
-        print(f"Selenium scraping complete: {len(all_reviews)} reviews")
-        return all_reviews
+        except Exception as e:
+            print(f"Pagination error: {e}")
+            consecutive_failures += 1
+    
+    # Strategy 3: "Load More" buttons
+    print("Looking for 'Load More' buttons...")
+    
+    load_more_selectors = [
+        '[class*="load"][class*="more"]',
+        '[id*="load"][id*="more"]',
+        'button[class*="more"]',
+        '.load-more-reviews',
+        '[data-hook*="load"]'
+    ]
+    
+    load_attempts = 0
+    while load_attempts < 10:
+        load_more_button = _first_usable_element(driver, load_more_selectors, lambda element: element.is_displayed())
+        if not load_more_button:
+            break
         
-    except ImportError:
-        print("Selenium not installed. Install with: pip install selenium")
-        return []
-    except Exception as e:
-        print(f"Selenium scraping error: {e}")
         try:
-            driver.quit()
-        except:
-            pass
-        return []
+            before = page_state(driver)
+            driver.execute_script("arguments[0].click();", load_more_button)
+            wait_for_page_change(driver, before)
+            
+            soup = BeautifulSoup(driver.page_source, HTML_PARSER)
+            current_reviews = extract_reviews_from_soup(soup, url)
+            
+            if current_reviews and len(current_reviews) > len(all_reviews):
+                all_reviews = current_reviews
+                print(f"Load more {load_attempts + 1}: Total reviews now {len(all_reviews)}")
+                load_attempts += 1
+            else:
+                break
+                
+        except Exception as e:
+            print(f"Load more error: {e}")
+            break
+    
+    print(f"Selenium scraping complete: {len(all_reviews)} reviews")
+    return all_reviews
 
 
 def extract_reviews_from_soup(soup, url):
     """Extract reviews from BeautifulSoup object with enhanced selectors"""
-    reviews = []
+    domain = selector_domain(url)
     
     if 'amazon' in url.lower():
         amazon_selectors = [
@@ -670,34 +1117,14 @@ def extract_reviews_from_soup(soup, url):
             '.review-text-content span',
             '.a-size-base.review-text span'
         ]
-        
-        for selector in amazon_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text(strip=True)
-                if (text and 20 <= len(text) <= 3000 and
-                    not any(skip in text.lower() for skip in [
-                        'verified purchase', 'helpful', 'report abuse', 'by ', 'on ',
-                        'was this review helpful', 'comment', 'see all photos'
-                    ])):
-                    reviews.append(text)
-            if reviews:
-                break
+        return select_page_reviews(soup, amazon_selectors, AMAZON_SKIP_TEXT, domain)
                 
     elif 'flipkart' in url.lower():
         flipkart_selectors = [
             '._2cLu-l', '.t-ZTKy', '._11pzQk', '.qwjRop', '.ZmyHeo',
             'div[class*="_2cLu"]', 'div[class*="ZmyHeo"]', '.RcXBOT'
         ]
-        
-        for selector in flipkart_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text(strip=True)
-                if text and 20 <= len(text) <= 3000:
-                    reviews.append(text)
-            if reviews:
-                break
+        return select_page_reviews(soup, flipkart_selectors, domain=domain)
                 
     elif 'meesho' in url.lower():
         meesho_selectors = [
@@ -705,15 +1132,7 @@ def extract_reviews_from_soup(soup, url):
             '[class*="Review"][class*="Text"]', '.review-content',
             'div[class*="review"] p', '[class*="ReviewCard"] div'
         ]
-        
-        for selector in meesho_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text(strip=True)
-                if text and 20 <= len(text) <= 3000:
-                    reviews.append(text)
-            if reviews:
-                break
+        return select_page_reviews(soup, meesho_selectors, domain=domain)
     
     else:
         generic_selectors = [
@@ -721,43 +1140,101 @@ def extract_reviews_from_soup(soup, url):
             '.review-content', '.user-review', '.customer-review',
             'div[class*="review"] p', 'div[class*="review"] span'
         ]
-        
-        for selector in generic_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text(strip=True)
-                if text and 20 <= len(text) <= 3000:
-                    reviews.append(text)
-            if reviews:
-                break
+        return select_page_reviews(soup, generic_selectors, domain=domain)
+
+
+def clean_scraped_reviews(reviews, seen_exact=None):
+    """
+    Collapse whitespace, strip symbols and drop boilerplate, out-of-range
+    and EXACT duplicate reviews (compared case-insensitively)
+    
+    Pass the same seen_exact set across calls to clean a stream page by page.
+    """
+    if seen_exact is None:
+        seen_exact = set()
+    cleaned_reviews = []
+    
+    for review in reviews:
+        cleaned = re.sub(r'\s+', ' ', review).strip()
+        cleaned = re.sub(r'[^\w\s.,!?()-]', '', cleaned)
+        
+        # Only remove EXACT duplicates (same text)
+        if (20 <= len(cleaned) <= 2000 and 
+            cleaned.lower() not in seen_exact and 
+            not cleaned.lower().startswith(('by ', 'on ', 'verified', 'helpful', 'report', 'was this'))):
+            seen_exact.add(cleaned.lower())
+            cleaned_reviews.append(cleaned)
     
-    return reviews
+    return cleaned_reviews
 
 
-def scrape_reviews_from_url(url, max_reviews=10000):
-    """Main function to scrape reviews with multiple strategies - Takes ALL reviews"""
-    session = get_session_with_headers()
+async def scrape_reviews_from_url_async(url, max_reviews=10000, client=None, incremental=False, on_page=None):
+    """
+    Main function to scrape reviews with multiple strategies - Takes ALL reviews
+    
+    Pass a shared AsyncHttpClient to run many scrapes on one event loop;
+    otherwise one is created (and closed) for this scrape. With
+    `incremental`, only reviews newer than the last run of this product are
+    fetched and the rest come from the stored crawl state. `on_page` is
+    awaited with the raw reviews of every platform page as soon as it is
+    parsed (see scrape_and_score_async).
+    """
+    if client is None:
+        async with AsyncHttpClient(headers=BROWSER_HEADERS) as client:
+            return await scrape_reviews_from_url_async(url, max_reviews, client, incremental, on_page)
+    
     all_reviews = []
+    caught_up = False
+    previous_reviews = []
+    seen = None
+    if incremental and CRAWL_STATE is not None:
+        previous_reviews = await asyncio.to_thread(CRAWL_STATE.load, product_key(url))
+        seen = {review_fingerprint(review) for review in previous_reviews}
     
     try:
         print(f"Starting comprehensive scraping for: {url}")
         print(f"Target: Up to {max_reviews} reviews")
+        if previous_reviews:
+            print(f"Incremental run: {len(previous_reviews)} reviews known from the last run")
         
-        # Calculate pages needed (assume ~10-15 reviews per page)
+        # Upper bound on pages (assume ~10-15 reviews per page) - the
+        # platform scrapers narrow it down with PagePlanner once page 1 is in
         estimated_pages = min(50, (max_reviews // 10) + 5)
         
         # Strategy 1: Platform-specific scraping with pagination
         if 'amazon' in url.lower():
-            all_reviews = scrape_amazon_reviews(url, session, max_pages=estimated_pages)
+            all_reviews, caught_up = await scrape_amazon_reviews_async(
+                url, client, max_pages=estimated_pages, max_reviews=max_reviews, seen=seen, on_page=on_page,
+                incremental=incremental
+            )
         elif 'flipkart' in url.lower():
-            all_reviews = scrape_flipkart_reviews(url, session, max_pages=estimated_pages)
+            all_reviews, caught_up = await scrape_flipkart_reviews_async(
+                url, client, max_pages=estimated_pages, max_reviews=max_reviews, seen=seen, on_page=on_page,
+                incremental=incremental
+            )
         elif 'meesho' in url.lower():
-            all_reviews = scrape_meesho_reviews(url, session, max_pages=estimated_pages)
+            all_reviews, caught_up = await scrape_meesho_reviews_async(
+                url, client, max_pages=estimated_pages, max_reviews=max_reviews, seen=seen, on_page=on_page,
+                incremental=incremental
+            )
         else:
             print("Using generic scraping approach...")
-            response = session.get(url, timeout=15)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            response = await client.get(url, timeout=15, store=False)
+            soup = await asyncio.to_thread(BeautifulSoup, response.content, HTML_PARSER)
             all_reviews = extract_reviews_from_soup(soup, url)
+            if all_reviews:
+                await client.keep(response)
+        
+        if incremental and CRAWL_STATE is not None and all_reviews:
+            print(f"Incremental run: {len(all_reviews)} new reviews")
+            all_reviews = merge_with_previous_run(all_reviews, previous_reviews)
+            await asyncio.to_thread(CRAWL_STATE.save, product_key(url), all_reviews)
+        elif previous_reviews and caught_up:
+            print("Incremental run: no new reviews")
+            all_reviews = list(previous_reviews)
+        elif previous_reviews:
+            # Blocked, failed or unparsable - the stored reviews are not a fresh result
+            print("Incremental run: crawl failed before reaching known reviews")
         
         # Strategy 2: If basic scraping didn't get enough reviews, try Selenium
         # if len(all_reviews) < 20:
@@ -768,7 +1245,7 @@ def scrape_reviews_from_url(url, max_reviews=10000):
 
         if len(all_reviews) < 20 and USE_SELENIUM:
             print("Using Selenium fallback...")
-            selenium_reviews = scrape_with_selenium_pagination(url, max_pages=estimated_pages)
+            selenium_reviews = await asyncio.to_thread(scrape_with_selenium_pagination, url, max_pages=estimated_pages)
             if len(selenium_reviews) > len(all_reviews):
                 all_reviews = selenium_reviews
         else:
@@ -779,8 +1256,9 @@ def scrape_reviews_from_url(url, max_reviews=10000):
         # Strategy 3: Enhanced text mining fallback
         if len(all_reviews) < 10:
             print("Attempting enhanced text mining fallback...")
-            response = session.get(url, timeout=15)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            found_before = len(all_reviews)
+            response = await client.get(url, timeout=15, store=False)
+            soup = await asyncio.to_thread(BeautifulSoup, response.content, HTML_PARSER)
             
             for script in soup(["script", "style", "nav", "header", "footer"]):
                 script.decompose()
@@ -809,23 +1287,20 @@ def scrape_reviews_from_url(url, max_reviews=10000):
                     all_reviews.append(text)
                     if len(all_reviews) >= 100:
                         break
+            if len(all_reviews) > found_before:
+                await client.keep(response)
         
         # Clean and deduplicate reviews (minimal deduplication - only exact duplicates)
-        cleaned_reviews = []
-        seen_exact = set()
-        
-        for review in all_reviews:
-            cleaned = re.sub(r'\s+', ' ', review).strip()
-            cleaned = re.sub(r'[^\w\s.,!?()-]', '', cleaned)
-            
-            # Only remove EXACT duplicates (same text)
-            if (20 <= len(cleaned) <= 2000 and 
-                cleaned.lower() not in seen_exact and 
-                not cleaned.lower().startswith(('by ', 'on ', 'verified', 'helpful', 'report', 'was this'))):
-                seen_exact.add(cleaned.lower())
-                cleaned_reviews.append(cleaned)
+        cleaned_reviews = clean_scraped_reviews(all_reviews)
         
         print(f"Final result: {len(cleaned_reviews)} reviews extracted (removed only exact duplicates)")
+        connections = CONNECTION_STATS.snapshot()
+        print(f"HTTP connections: {connections['new_connections']} opened, "
+              f"{connections['reused_connections']} reused for {connections['requests']} requests")
+        if RESPONSE_CACHE is not None:
+            cache_stats = RESPONSE_CACHE.stats()
+            print(f"HTTP cache: {cache_stats['hits']} fresh hits, {cache_stats['revalidated']} revalidated, "
+                  f"{cache_stats['misses']} misses")
         
         if cleaned_reviews:
             print("\nSample reviews found:")
@@ -838,6 +1313,124 @@ def scrape_reviews_from_url(url, max_reviews=10000):
         print(f"Error in scrape_reviews_from_url: {e}")
         return []
 
+def scrape_reviews_from_url(url, max_reviews=10000, incremental=False):
+    """Synchronous entry point - runs scrape_reviews_from_url_async on the process's scraping loop (run_sync)"""
+    return run_sync(scrape_reviews_from_url_async(url, max_reviews, incremental=incremental))
+
+
+# Pipelined /process: pages are cleaned and scored while later pages are still downloading
+PIPELINE_SCRAPE = os.getenv("PIPELINE_SCRAPE", "true").lower() == "true"
+# Pages (and review batches) buffered between stages - a full queue pauses the stage feeding it
+PIPELINE_QUEUE_SIZE = max(1, int(os.getenv("PIPELINE_QUEUE_SIZE", "8")))
+# Most reviews the score stage takes in one go when it has fallen behind
+PIPELINE_SCORE_BATCH = max(1, int(os.getenv("PIPELINE_SCORE_BATCH", "500")))
+
+
+async def scrape_and_score_async(url, max_reviews=10000, client=None, incremental=False, progress=None):
+    """
+    Scrape and score a product with fetching, cleaning and scoring overlapped
+    
+    Each parsed page goes through a clean stage and a score stage connected
+    by bounded queues, so at most a few pages wait between stages however
+    many are crawled. Scoring runs in a thread and the event loop keeps
+    fetching meanwhile. Returns (reviews, results DataFrame), the same as
+    scrape_reviews_from_url followed by check_reviews.
+    
+    progress(stage, **counts) is called after every page and every scored
+    batch with the running pages_fetched, reviews_found, reviews_scored,
+    fake_count and original_count.
+    """
+    pages = asyncio.Queue(PIPELINE_QUEUE_SIZE)
+    batches = asyncio.Queue(PIPELINE_QUEUE_SIZE)
+    scored = {}
+    counts = {"pages_fetched": 0, "reviews_found": 0, "reviews_scored": 0, "fake_count": 0, "original_count": 0}
+    
+    report_lock = asyncio.Lock()
+    
+    async def report():
+        # progress may write to SQLite (JobStore.update), so it runs off the shared scraping loop;
+        # the lock keeps a stale snapshot from landing after a newer one
+        if progress is not None:
+            async with report_lock:
+                await asyncio.to_thread(progress, "scraping", **counts)
+    
+    async def clean_stage():
+        seen_exact = set()
+        while True:
+            page_reviews = await pages.get()
+            if page_reviews is None:
+                await batches.put(None)
+                return
+            cleaned = clean_scraped_reviews(page_reviews, seen_exact)
+            counts["pages_fetched"] += 1
+            counts["reviews_found"] += len(cleaned)
+            await report()
+            if cleaned:
+                await batches.put(cleaned)
+    
+    async def score_stage():
+        finished = False
+        while not finished:
+            batch = await batches.get()
+            if batch is None:
+                return
+            # Take whatever else is already waiting so a backlog is scored in one go
+            while len(batch) < PIPELINE_SCORE_BATCH and not batches.empty():
+                more = batches.get_nowait()
+                if more is None:
+                    finished = True
+                    break
+                batch.extend(more)
+            try:
+                results = await asyncio.to_thread(check_review_chunk, batch)
+                scored.update(zip(results["review"], zip(results["prediction"], results["score"])))
+                fake = int((results["prediction"] == "Fake").sum())
+                counts["reviews_scored"] += len(results)
+                counts["fake_count"] += fake
+                counts["original_count"] += len(results) - fake
+                await report()
+            except Exception as e:
+                # Keep draining the queue - these reviews are scored at the end instead
+                print(f"Pipeline scoring error: {e}")
+    
+    stages = [asyncio.ensure_future(clean_stage()), asyncio.ensure_future(score_stage())]
+    try:
+        reviews = await scrape_reviews_from_url_async(url, max_reviews, client, incremental, on_page=pages.put)
+        await pages.put(None)
+        await asyncio.gather(*stages)
+    finally:
+        for stage in stages:
+            stage.cancel()
+    
+    # Fallback, previous-run and late reviews never went through the pipeline
+    scored_early = sum(1 for review in reviews if review in scored)
+    missing = [review for review in reviews if review not in scored]
+    if missing:
+        results = await asyncio.to_thread(check_review_chunk, missing)
+        scored.update(zip(results["review"], zip(results["prediction"], results["score"])))
+    print(f"Pipeline: {scored_early} of {len(reviews)} reviews scored while pages were downloading")
+    
+    results_df = pd.DataFrame(
+        [(review,) + scored[review] for review in reviews if review in scored],
+        columns=["review", "prediction", "score"]
+    )
+    print_statistics(results_df)
+    return reviews, results_df
+
+
+def scrape_and_score(url, max_reviews=10000, incremental=False, progress=None):
+    """Synchronous entry point - runs scrape_and_score_async on the process's scraping loop (run_sync)"""
+    return run_sync(scrape_and_score_async(url, max_reviews, incremental=incremental, progress=progress))
+
+
+async def scrape_many_reviews_async(urls, max_reviews=10000):
+    """Scrape several products concurrently on one event loop and one shared HTTP client"""
+    async with AsyncHttpClient(headers=BROWSER_HEADERS) as client:
+        return await asyncio.gather(*(
+            scrape_reviews_from_url_async(url, max_reviews, client) for url in urls
+        ))
+
+
 @app.route("/")
 def home():
     """Home page with upload/link input"""
@@ -879,72 +1472,151 @@ def test_scraping():
     })
 
 
-@app.route("/process", methods=["POST"])
-def process():
-    """Process uploaded dataset or link and classify reviews"""
-    reviews = []
+@app.route("/selector-stats")
+def selector_stats():
+    """Learned review selector order and hit counts per domain"""
+    if SELECTOR_STATS is None:
+        return jsonify({"error": "Selector learning is disabled"}), 404
+    return jsonify(SELECTOR_STATS.stats())
+
+
+# Scored rows of every analysis, served a page at a time by /results/<id>
+RESULTS_DB_PATH = os.getenv("RESULTS_DB_PATH", os.path.join(CACHE_DIR, "results.sqlite3"))
+# Rows per page in the /process response and the /results default
+RESULTS_PAGE_SIZE = 15
+RESULTS_MAX_PAGE_SIZE = 200
+# Stored analyses are dropped after this many seconds
+RESULTS_TTL = float(os.getenv("RESULTS_TTL", str(24 * 3600)))
+
 
+class ResultStore:
+    """
+    Scored reviews of each analysis, paged straight out of SQLite
+    
+    Rows are keyed by (run, row number) with a second index on the
+    prediction, so any page of the full list or of one class is a short
+    index range scan however many reviews the run has. An empty
+    RESULTS_DB_PATH keeps results in memory (single web worker only).
+    """
+
+    def __init__(self, path):
+        self.path = path or ":memory:"
+        self._lock = threading.Lock()
+        self._connection = None
+        self._connection_pid = None
+
+    def _db(self):
+        """SQLite connection for this process (connections must not cross a fork)"""
+        if self._connection is None or self._connection_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS runs (id TEXT PRIMARY KEY, total INTEGER, counts TEXT, created_at REAL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results (run TEXT, row INTEGER, review TEXT, prediction TEXT, "
+                "score REAL, PRIMARY KEY (run, row)) WITHOUT ROWID"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_by_prediction ON results (run, prediction, row)"
+            )
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def begin(self, run_id):
+        """Register a run about to be written (its pages are served once finish() is called)"""
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            with db:
+                # Runs past their TTL go, including ones whose analysis died half-written
+                expired = [row[0] for row in db.execute(
+                    "SELECT id FROM runs WHERE created_at < ?", (now - RESULTS_TTL,)
+                )]
+                for expired_id in expired:
+                    db.execute("DELETE FROM results WHERE run = ?", (expired_id,))
+                    db.execute("DELETE FROM runs WHERE id = ?", (expired_id,))
+                db.execute("INSERT OR REPLACE INTO runs VALUES (?, NULL, NULL, ?)", (run_id, now))
+
+    def add_rows(self, run_id, results_df, first_row=0):
+        """Append a chunk of check_reviews rows, numbered from first_row"""
+        rows = zip(
+            repeat(run_id), range(first_row, first_row + len(results_df)), results_df["review"].astype(str),
+            results_df["prediction"].astype(str), results_df["score"].astype(float)
+        )
+        with self._lock:
+            db = self._db()
+            with db:
+                db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)", rows)
+
+    def finish(self, run_id, total, counts):
+        with self._lock:
+            db = self._db()
+            with db:
+                db.execute("UPDATE runs SET total = ?, counts = ? WHERE id = ?", (total, json.dumps(counts), run_id))
+
+    def page(self, run_id, page=1, size=RESULTS_PAGE_SIZE, prediction=None):
+        """
+        One page of a run's rows, optionally only one prediction class
+        
+        Returns None for an unknown or unfinished run.
+        """
+        with self._lock:
+            db = self._db()
+            run = db.execute("SELECT total, counts FROM runs WHERE id = ?", (run_id,)).fetchone()
+            if run is None or run[0] is None:
+                return None
+            counts = json.loads(run[1])
+            offset = (page - 1) * size
+            if prediction:
+                total = counts.get(prediction, 0)
+                rows = db.execute(
+                    "SELECT review, prediction, score FROM results WHERE run = ? AND prediction = ? "
+                    "ORDER BY row LIMIT ? OFFSET ?",
+                    (run_id, prediction, size, offset)
+                ).fetchall()
+            else:
+                total = run[0]
+                rows = db.execute(
+                    "SELECT review, prediction, score FROM results WHERE run = ? ORDER BY row LIMIT ? OFFSET ?",
+                    (run_id, size, offset)
+                ).fetchall()
+        return {
+            "results": [{"review": review, "prediction": label, "score": score} for review, label, score in rows],
+            "page": page,
+            "size": size,
+            "total": total,
+            "total_pages": (total + size - 1) // size,
+            "counts": counts,
+        }
+
+
+RESULT_STORE = ResultStore(RESULTS_DB_PATH)
+
+
+def analysis_request_source():
+    """
+    Work out what the current request asks to analyse
+    
+    Returns ({"file": saved path, "format": ..., "compression": ...} or
+    {"link": url}, None), or (None, (error data, status)) when the request
+    is unusable.
+    """
     # Case 1: File Upload
     if "file" in request.files and request.files["file"].filename != "":
         file = request.files["file"]
-        if not file.filename.endswith('.csv'):
-            return jsonify({"error": "Please upload a CSV file"}), 400
-            
-        filepath = os.path.join(UPLOAD_FOLDER, file.filename)
+        detected = upload_format(file.filename)
+        if detected is None:
+            return None, ({"error": "Please upload a CSV, JSONL or Parquet file (CSV and JSONL may be .gz or .zst compressed)"}, 400)
+        
+        # Prefixed so uploads with the same name in concurrent analyses do not overwrite each other
+        filepath = os.path.join(UPLOAD_FOLDER, f"{uuid.uuid4().hex[:8]}_{os.path.basename(file.filename)}")
         file.save(filepath)
-
-        try:
-            encodings = ['utf-8', 'latin1', 'iso-8859-1', 'cp1252']
-            df = None
-            
-            for encoding in encodings:
-                try:
-                    print(f"Trying encoding: {encoding}")
-                    
-                    try:
-                        df = pd.read_csv(filepath, usecols=["reviews.text"], encoding=encoding, nrows=1000)
-                        reviews = df["reviews.text"].dropna().astype(str).tolist()
-                        print(f"Found reviews in 'reviews.text' column with {encoding} encoding")
-                        break
-                    except:
-                        df = pd.read_csv(filepath, encoding=encoding, nrows=1000)
-                        
-                        possible_cols = [
-                            "reviews.text", "review", "Review", "reviews", "Reviews", 
-                            "text", "Text", "comment", "Comment", "review_text", 
-                            "reviewText", "content", "Content", "feedback", "Feedback"
-                        ]
-                        
-                        col = None
-                        for c in possible_cols:
-                            if c in df.columns:
-                                col = c
-                                break
-                        
-                        if col:
-                            reviews = df[col].dropna().astype(str).tolist()
-                            print(f"Found reviews in '{col}' column with {encoding} encoding")
-                            break
-                        else:
-                            available_cols = ", ".join(df.columns.tolist()[:10])
-                            print(f"Available columns: {available_cols}")
-                            continue
-                            
-                except Exception as e:
-                    print(f"Error with encoding {encoding}: {e}")
-                    continue
-            
-            if not reviews:
-                if df is not None:
-                    available_cols = ", ".join(df.columns.tolist()[:10])
-                    return jsonify({
-                        "error": f"No review column found. Available columns: {available_cols}. Please ensure your CSV has a column named 'reviews.text', 'review', or 'Review'."
-                    }), 400
-                else:
-                    return jsonify({"error": "Could not read CSV file. Please check file format and encoding."}), 400
-                
-        except Exception as e:
-            return jsonify({"error": f"Error reading CSV file: {str(e)}"}), 400
+        file_format, compression = detected
+        return {"file": filepath, "format": file_format, "compression": compression}, None
 
     # Case 2: URL Link Input - Enhanced Web Scraping with Pagination
     elif "link" in request.form and request.form["link"].strip() != "":
@@ -962,15 +1634,123 @@ def process():
             r'(?:/?|[/?]\S+)', re.IGNORECASE)
         
         if not url_pattern.match(link):
-            return jsonify({"error": "Invalid URL format. Please provide a valid product page URL (e.g., https://amazon.in/product-name/dp/XXXXXXXXXX)"}), 400
-        
+            return None, ({"error": "Invalid URL format. Please provide a valid product page URL (e.g., https://amazon.in/product-name/dp/XXXXXXXXXX)"}, 400)
+        return {"link": link}, None
+    
+    return None, ({"error": "Please provide either a CSV file or a valid product URL"}, 400)
+
+
+class ReviewLengths:
+    """Running length summary of the raw reviews, for the response statistics"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.longest = 0
+        self.shortest = 0
+
+    def update(self, reviews):
+        lengths = pd.Series(reviews, dtype=object).astype(str).str.len()
+        if lengths.empty:
+            return
+        self.shortest = int(lengths.min()) if not self.count else min(self.shortest, int(lengths.min()))
+        self.longest = max(self.longest, int(lengths.max()))
+        self.count += len(lengths)
+        self.total += int(lengths.sum())
+
+    def to_dict(self):
+        return {
+            "average_review_length": self.total / self.count if self.count else 0,
+            "longest_review": self.longest,
+            "shortest_review": self.shortest
+        }
+
+
+def save_result_chunks(run_id, result_file, result_chunks, progress=None):
+    """
+    Write check_reviews result chunks to the result CSV and RESULT_STORE as they arrive
+    
+    Only running totals are kept, so a stream of any length is saved at flat
+    memory. Returns the ReviewStatistics of everything written.
+    """
+    stats = ReviewStatistics()
+    RESULT_STORE.begin(run_id)
+    out = None
+    try:
+        for results in result_chunks:
+            if results.empty:
+                continue
+            if out is None:
+                out = open(result_file, "w", encoding="utf-8", newline="")
+            results.to_csv(out, header=not stats.processed_count, index=False)
+            RESULT_STORE.add_rows(run_id, results, stats.processed_count)
+            stats.update(results)
+            if progress is not None:
+                progress(
+                    "scoring", reviews_scored=stats.processed_count,
+                    fake_count=stats.fake_count, original_count=stats.original_count
+                )
+    finally:
+        if out is not None:
+            out.close()
+    
+    if stats.processed_count:
+        RESULT_STORE.finish(run_id, stats.processed_count, stats.prediction_counts())
+        print(f"Results saved to: {result_file}")
+    return stats
+
+
+def run_analysis(source, progress=None):
+    """
+    Fetch and classify the reviews of an analysis_request_source() source
+    
+    Runs without a request context (POST /jobs calls it from a background
+    thread), so the result names its CSV in "result_file" and the route
+    adds the download link. progress(stage, **counts) is called as the
+    analysis moves on. Returns (response data, status).
+    """
+    lengths = ReviewLengths()
+    uid = str(uuid.uuid4())[:8]
+    result_file = os.path.join(RESULT_FOLDER, f"result_{uid}.csv")
+    
+    def report(stage, **counts):
+        if progress is not None:
+            progress(stage, **counts)
+
+    if "file" in source:
+        report("reading")
+        try:
+            upload = sniff_upload(source["file"], source.get("format", "csv"), source.get("compression"))
+        except (ValueError, OSError) as e:
+            return {"error": str(e)}, 400
+        print(f"Streaming reviews through ML model in chunks of {UPLOAD_CHUNK_SIZE} (NO filtering applied)...")
+        
+        def scored_chunks():
+            # The whole column is scored - chunk by chunk, so the file is never fully in memory
+            for reviews in iter_upload_reviews(source["file"], upload):
+                lengths.update(reviews)
+                report("scoring", reviews_found=lengths.count)
+                yield check_review_chunk(reviews, workers=SCORING_WORKERS)
+        
+        result_chunks = scored_chunks()
+
+    else:
+        link = source["link"]
         print(f"Starting comprehensive web scraping for: {link}")
+        report("scraping")
+        results_df = None
         
         # Enhanced scraping with NO limit - get ALL reviews
-        reviews = scrape_reviews_from_url(link, max_reviews=10000)
+        if PIPELINE_SCRAPE:
+            # Reviews are scored while the crawl is still running
+            reviews, results_df = scrape_and_score(
+                link, max_reviews=10000, incremental=INCREMENTAL_SCRAPE, progress=progress
+            )
+        else:
+            reviews = scrape_reviews_from_url(link, max_reviews=10000, incremental=INCREMENTAL_SCRAPE)
         
         if not reviews:
-            return jsonify({
+            return {
                 "error": f"Could not extract reviews from: {link}. "
                         f"Possible solutions: "
                         f"1) Ensure the URL is a product page with visible customer reviews "
@@ -979,66 +1759,484 @@ def process():
                         f"4) Install Selenium for JavaScript-heavy sites: pip install selenium "
                         f"5) Use the /test-scraping endpoint to debug the URL first. "
                         f"Note: Some sites may block automated access or require special handling."
-            }), 400
+            }, 400
         
         print(f"Successfully extracted {len(reviews)} reviews from URL")
-    else:
-        return jsonify({"error": "Please provide either a CSV file or a valid product URL"}), 400
-
-    # Validate reviews
-    if not reviews or len(reviews) == 0:
-        return jsonify({"error": "No reviews found to analyze. Please check your input."}), 400
+        lengths.update(reviews)
 
-    # NO filtering or duplicate removal - process ALL reviews as-is
-    print(f"Processing {len(reviews)} reviews through ML model (NO filtering applied)...")
+        # NO filtering or duplicate removal - process ALL reviews as-is
+        print(f"Processing {len(reviews)} reviews through ML model (NO filtering applied)...")
 
-    # Process reviews through ML model
-    try:
-        results_df = check_reviews(reviews)
+        # Process reviews through ML model
+        try:
+            if results_df is None:
+                report("scoring", reviews_found=len(reviews))
+                results_df = check_reviews(reviews, workers=SCORING_WORKERS)
+        except Exception as e:
+            print(f"ML model error: {e}")
+            return {"error": f"Error processing reviews through ML model: {str(e)}"}, 400
         
-        if results_df.empty:
-            return jsonify({"error": "No valid reviews to process after ML analysis"}), 400
-            
-    except Exception as e:
-        print(f"ML model error: {e}")
-        return jsonify({"error": f"Error processing reviews through ML model: {str(e)}"}), 400
+        result_chunks = [results_df]
 
-    # Save results to CSV
-    uid = str(uuid.uuid4())[:8]
-    result_file = os.path.join(RESULT_FOLDER, f"result_{uid}.csv")
-    
+    # Save results to CSV, and every row server-side - the response only
+    # carries the first page (see /results/<id>)
     try:
-        results_df.to_csv(result_file, index=False, encoding='utf-8')
-        print(f"Results saved to: {result_file}")
+        stats = save_result_chunks(uid, result_file, result_chunks, report)
     except Exception as e:
-        print(f"Error saving results: {e}")
-        return jsonify({"error": "Error saving results"}), 400
+        print(f"Error processing reviews: {e}")
+        return {"error": f"Error processing reviews: {str(e)}"}, 400
+
+    # Validate reviews
+    if lengths.count == 0:
+        return {"error": "No reviews found to analyze. Please check your input."}, 400
+    if not stats.processed_count:
+        return {"error": "No valid reviews to process after ML analysis"}, 400
+    if "file" in source:
+        stats.print()
 
-    # Convert DataFrame to dict for frontend
     try:
-        results = results_df.to_dict(orient="records")
-        counts = results_df["prediction"].value_counts().to_dict()
+        first_page = RESULT_STORE.page(uid, 1, RESULTS_PAGE_SIZE)
         
         response_data = {
-            "results": results,
-            "counts": counts,
-            "download_url": url_for("download_file", filename=os.path.basename(result_file)),
-            "total_reviews_scraped": len(reviews),
-            "total_reviews": len(reviews),
-            "processed_reviews": len(results_df),
-            "statistics": {
-                "average_review_length": sum(len(str(r)) for r in reviews) / len(reviews) if reviews else 0,
-                "longest_review": max(len(str(r)) for r in reviews) if reviews else 0,
-                "shortest_review": min(len(str(r)) for r in reviews) if reviews else 0
-            }
+            "result_id": uid,
+            "results": first_page["results"],
+            "page": 1,
+            "page_size": RESULTS_PAGE_SIZE,
+            "total_pages": first_page["total_pages"],
+            "counts": stats.prediction_counts(),
+            "result_file": os.path.basename(result_file),
+            "total_reviews_scraped": lengths.count,
+            "total_reviews": lengths.count,
+            "processed_reviews": stats.processed_count,
+            "statistics": lengths.to_dict()
         }
         
-        print(f"Returning results: {len(results)} processed reviews")
-        return jsonify(response_data)
+        print(f"Returning results: {stats.processed_count} processed reviews ({len(first_page['results'])} on the first page)")
+        return response_data, 200
         
     except Exception as e:
         print(f"Error preparing response: {e}")
-        return jsonify({"error": "Error preparing results for display"}), 400
+        return {"error": "Error preparing results for display"}, 400
+
+
+def with_download_url(data):
+    """Swap an analysis result's "result_file" for its /download link (needs a request context)"""
+    data = dict(data)
+    result_file = data.pop("result_file", None)
+    if result_file:
+        data["download_url"] = url_for("download_file", filename=result_file)
+    if data.get("result_id"):
+        data["results_url"] = url_for("get_results", result_id=data["result_id"])
+    return data
+
+
+@app.route("/process", methods=["POST"])
+def process():
+    """Process uploaded dataset or link and classify reviews"""
+    source, error = analysis_request_source()
+    if error:
+        data, status = error
+        return jsonify(data), status
+    
+    data, status = run_analysis(source)
+    return jsonify(with_download_url(data)), status
+
+
+# Background analyses: POST /jobs queues what /process would do and GET /jobs/<id> polls it
+JOBS_PATH = os.getenv("JOBS_PATH", os.path.join(CACHE_DIR, "jobs.sqlite3"))
+# Analyses running at once per web worker process
+JOB_WORKERS = max(1, int(os.getenv("JOB_WORKERS", "2")))
+# Queued + running analyses across ALL web workers before POST /jobs answers 503
+JOB_QUEUE_LIMIT = max(1, int(os.getenv("JOB_QUEUE_LIMIT", "20")))
+# Finished jobs are forgotten after this many seconds
+JOB_TTL = float(os.getenv("JOB_TTL", str(24 * 3600)))
+# Runners refresh their unfinished jobs this often; a queued/running job not
+# refreshed for JOB_STALE_AFTER seconds lost its worker and is marked failed
+JOB_HEARTBEAT = float(os.getenv("JOB_HEARTBEAT", "30"))
+JOB_STALE_AFTER = float(os.getenv("JOB_STALE_AFTER", "300"))
+JOB_LOST_ERROR = "The analysis stopped unexpectedly (its worker was restarted). Please submit it again."
+
+
+class JobStore:
+    """
+    Status, progress and result of every analysis job
+    
+    Kept in SQLite so a poll answered by any gunicorn worker sees jobs run
+    by the others. An empty JOBS_PATH keeps jobs in memory, which only
+    works with a single web worker.
+    """
+
+    def __init__(self, path):
+        self.path = path or ":memory:"
+        self._lock = threading.Lock()
+        self._connection = None
+        self._connection_pid = None
+
+    def _db(self):
+        """SQLite connection for this process (connections must not cross a fork)"""
+        if self._connection is None or self._connection_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, status TEXT, progress TEXT, "
+                "result TEXT, error TEXT, created_at REAL, updated_at REAL)"
+            )
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def create(self, job_id, limit=JOB_QUEUE_LIMIT):
+        """
+        Record a queued job; False (nothing recorded) when `limit` jobs are
+        already queued or running in any worker
+        """
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            # Write lock up front, so workers cannot both take the last free slot
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                self._reap(db, now)
+                active = db.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')").fetchone()[0]
+                if active >= limit:
+                    db.rollback()
+                    return False
+                db.execute("INSERT INTO jobs VALUES (?, 'queued', '{}', NULL, NULL, ?, ?)", (job_id, now, now))
+                db.commit()
+                return True
+            except Exception:
+                db.rollback()
+                raise
+
+    @staticmethod
+    def _reap(db, now):
+        """Drop finished jobs past JOB_TTL and fail jobs whose worker stopped refreshing them"""
+        db.execute("DELETE FROM jobs WHERE status IN ('done', 'failed') AND updated_at < ?", (now - JOB_TTL,))
+        db.execute(
+            "UPDATE jobs SET status = 'failed', error = ?, updated_at = ? "
+            "WHERE status IN ('queued', 'running') AND updated_at < ?",
+            (JOB_LOST_ERROR, now, now - JOB_STALE_AFTER)
+        )
+
+    def reap(self):
+        """_reap in its own transaction (run from the JobRunner heartbeat)"""
+        try:
+            with self._lock:
+                db = self._db()
+                with db:
+                    self._reap(db, time.time())
+        except sqlite3.Error as e:
+            print(f"Job store write failed: {e}")
+
+    def touch(self, job_ids):
+        """Heartbeat: mark unfinished jobs as still being worked on"""
+        try:
+            with self._lock:
+                db = self._db()
+                with db:
+                    db.executemany(
+                        "UPDATE jobs SET updated_at = ? WHERE id = ? AND status IN ('queued', 'running')",
+                        [(time.time(), job_id) for job_id in job_ids]
+                    )
+        except sqlite3.Error as e:
+            print(f"Job store write failed: {e}")
+
+    def update(self, job_id, status, progress=None, result=None, error=None):
+        try:
+            with self._lock:
+                db = self._db()
+                with db:
+                    db.execute(
+                        "UPDATE jobs SET status = ?, progress = COALESCE(?, progress), result = COALESCE(?, result), "
+                        "error = COALESCE(?, error), updated_at = ? WHERE id = ?",
+                        (status, json.dumps(progress) if progress is not None else None,
+                         json.dumps(result) if result is not None else None, error, time.time(), job_id)
+                    )
+        except sqlite3.Error as e:
+            print(f"Job store write failed: {e}")
+
+    def get(self, job_id, include_result=False):
+        """
+        Job as a dict (None if unknown); the result payload only when asked for
+        
+        Read-only, as watchers call it every JOB_EVENTS_POLL seconds: a job
+        whose worker stopped refreshing it is reported as failed here and
+        only written back by the next reap.
+        """
+        with self._lock:
+            row = self._db().execute(
+                "SELECT status, progress, error, created_at, updated_at"
+                + (", result" if include_result else "") + " FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = {
+            "id": job_id,
+            "status": row[0],
+            "progress": json.loads(row[1] or "{}"),
+            "error": row[2],
+            "created_at": row[3],
+            "updated_at": row[4],
+        }
+        if job["status"] in ("queued", "running") and time.time() - (row[4] or 0) > JOB_STALE_AFTER:
+            job["status"] = "failed"
+            job["error"] = JOB_LOST_ERROR
+        if include_result:
+            job["result"] = json.loads(row[5]) if row[5] else None
+        return job
+
+
+JOB_STORE = JobStore(JOBS_PATH)
+
+# /jobs/<id>/events keeps its request open for the whole job, so it needs a
+# threaded (gthread) or async (gevent) gunicorn worker: with the default sync
+# worker every watcher blocks a whole process and is killed at the 30s timeout.
+# The Procfile runs gthread workers, each serving many watchers on cheap threads.
+# Longest an /events watcher goes without re-reading the job store (jobs run by other workers)
+JOB_EVENTS_POLL = float(os.getenv("JOB_EVENTS_POLL", "1"))
+# Comment line sent to idle event streams so proxies keep the connection open
+JOB_EVENTS_HEARTBEAT = float(os.getenv("JOB_EVENTS_HEARTBEAT", "15"))
+
+
+class JobEvents:
+    """
+    In-process progress channel for job watchers
+    
+    Every watcher blocks on one Condition and is woken when a job run by
+    this process reports progress, so an idle stream costs a sleeping
+    thread rather than a polling loop. Jobs run by other workers are picked
+    up from the job store every JOB_EVENTS_POLL seconds.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.versions = {}
+
+    def publish(self, job_id):
+        with self.condition:
+            self.versions[job_id] = self.versions.get(job_id, 0) + 1
+            self.condition.notify_all()
+
+    def finish(self, job_id):
+        """Wake the job's watchers one last time and forget it"""
+        with self.condition:
+            self.versions.pop(job_id, None)
+            self.condition.notify_all()
+
+    def wait(self, job_id, version, timeout):
+        """Wait until the job moves past `version` or timeout passes; returns the current version"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.versions.get(job_id, 0) != version, timeout)
+            return self.versions.get(job_id, 0)
+
+
+JOB_EVENTS = JobEvents()
+
+
+def job_event_stream(job_id):
+    """
+    Server-Sent Events for a job (run under stream_with_context): a `progress`
+    event whenever its status or counts change, then one `done` (with the
+    result link) or `failed` event
+    """
+    last_state = None
+    last_sent = time.monotonic()
+    version = 0
+    
+    while True:
+        job = JOB_STORE.get(job_id)
+        if job is None:
+            yield f"event: failed\ndata: {json.dumps({'error': 'Job not found'})}\n\n"
+            return
+        
+        state = (job["status"], job["progress"])
+        if state != last_state:
+            last_state = state
+            event = job["status"] if job["status"] in ("done", "failed") else "progress"
+            payload = {"status": job["status"], "progress": job["progress"]}
+            if job["status"] == "done":
+                payload["result_url"] = url_for("get_job_result", job_id=job_id)
+            elif job["status"] == "failed":
+                payload["error"] = job["error"]
+            yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+            last_sent = time.monotonic()
+        elif time.monotonic() - last_sent >= JOB_EVENTS_HEARTBEAT:
+            yield ": keep-alive\n\n"
+            last_sent = time.monotonic()
+        
+        if job["status"] in ("done", "failed"):
+            return
+        version = JOB_EVENTS.wait(job_id, version, JOB_EVENTS_POLL)
+
+
+class JobRunner:
+    """
+    Bounded pool of background threads running analyses for POST /jobs
+    
+    At most `workers` analyses run at once in this process; `limit` caps
+    queued + running ones across every worker (counted in the store) so a
+    burst of submissions cannot pile up without bound. A heartbeat thread
+    keeps this runner's unfinished jobs fresh in the store, so jobs lost
+    with a dead worker can be told apart and failed.
+    """
+
+    def __init__(self, store, workers=JOB_WORKERS, limit=JOB_QUEUE_LIMIT):
+        self.store = store
+        self.limit = limit
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis")
+        self.jobs = set()
+        self.lock = threading.Lock()
+        self.heartbeat = None
+
+    def submit(self, source):
+        """Queue an analysis; returns the job id, or None when the queue is full"""
+        job_id = uuid.uuid4().hex[:12]
+        if not self.store.create(job_id, self.limit):
+            return None
+        with self.lock:
+            self.jobs.add(job_id)
+            if self.heartbeat is None:
+                self.heartbeat = threading.Thread(target=self._beat, name="job-heartbeat", daemon=True)
+                self.heartbeat.start()
+        try:
+            self.executor.submit(self._run, job_id, source)
+        except Exception as e:
+            with self.lock:
+                self.jobs.discard(job_id)
+            self.store.update(job_id, "failed", error=str(e))
+            raise
+        return job_id
+
+    def _beat(self):
+        while True:
+            time.sleep(JOB_HEARTBEAT)
+            with self.lock:
+                job_ids = list(self.jobs)
+            if job_ids:
+                self.store.touch(job_ids)
+            self.store.reap()
+
+    def _run(self, job_id, source):
+        progress = {}
+        
+        def report(stage, **counts):
+            progress.update(counts, stage=stage)
+            self.store.update(job_id, "running", progress=progress)
+            JOB_EVENTS.publish(job_id)
+        
+        try:
+            report("starting")
+            data, status = run_analysis(source, report)
+            if status == 200:
+                progress["stage"] = "done"
+                self.store.update(job_id, "done", progress=progress, result=data)
+            else:
+                self.store.update(job_id, "failed", progress=progress, error=data.get("error"))
+        except Exception as e:
+            print(f"Job {job_id} failed: {e}")
+            self.store.update(job_id, "failed", error=str(e))
+        finally:
+            JOB_EVENTS.finish(job_id)
+            with self.lock:
+                self.jobs.discard(job_id)
+
+
+_job_runners = {}
+_job_runners_lock = threading.Lock()
+
+def get_job_runner():
+    """Process-wide JobRunner (threads never cross a gunicorn fork)"""
+    with _job_runners_lock:
+        runner = _job_runners.get(os.getpid())
+        if runner is None:
+            runner = _job_runners[os.getpid()] = JobRunner(JOB_STORE)
+        return runner
+
+
+@app.route("/jobs", methods=["POST"])
+def create_job():
+    """Queue an analysis (same form fields as /process) and return its id straight away"""
+    source, error = analysis_request_source()
+    if error:
+        data, status = error
+        return jsonify(data), status
+    
+    job_id = get_job_runner().submit(source)
+    if job_id is None:
+        return jsonify({"error": "Too many analyses queued, please try again shortly"}), 503
+    
+    return jsonify({
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": url_for("get_job", job_id=job_id),
+        "events_url": url_for("job_events", job_id=job_id)
+    }), 202
+
+
+@app.route("/jobs/<job_id>")
+def get_job(job_id):
+    """Status and progress of a job, with links to its results once it is done"""
+    job = JOB_STORE.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    if job["status"] == "done":
+        job["result_url"] = url_for("get_job_result", job_id=job_id)
+    return jsonify(job)
+
+
+@app.route("/jobs/<job_id>/events")
+def job_events(job_id):
+    """Live progress of a job as a Server-Sent Events stream"""
+    if JOB_STORE.get(job_id) is None:
+        return jsonify({"error": "Job not found"}), 404
+    return Response(
+        stream_with_context(job_event_stream(job_id)),
+        mimetype="text/event-stream",
+        # Stop nginx from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.route("/jobs/<job_id>/result")
+def get_job_result(job_id):
+    """The /process response of a finished job"""
+    job = JOB_STORE.get(job_id, include_result=True)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    if job["status"] == "failed":
+        return jsonify({"error": job["error"]}), 400
+    if job["status"] != "done":
+        return jsonify({"error": "Job has not finished yet", "status": job["status"]}), 409
+    return jsonify(with_download_url(job["result"]))
+
+
+@app.route("/results/<result_id>")
+def get_results(result_id):
+    """
+    One page of an analysis' scored reviews
+    
+    Query parameters: page (from 1), size (rows per page, at most
+    RESULTS_MAX_PAGE_SIZE) and filter (all, fake or original).
+    """
+    try:
+        page = max(1, int(request.args.get("page", 1)))
+        size = min(RESULTS_MAX_PAGE_SIZE, max(1, int(request.args.get("size", RESULTS_PAGE_SIZE))))
+    except ValueError:
+        return jsonify({"error": "page and size must be numbers"}), 400
+    
+    review_filter = request.args.get("filter", "all").strip().lower()
+    predictions = {"all": None, "fake": "Fake", "original": "Original"}
+    if review_filter not in predictions:
+        return jsonify({"error": "filter must be one of: all, fake, original"}), 400
+    
+    data = RESULT_STORE.page(result_id, page, size, predictions[review_filter])
+    if data is None:
+        return jsonify({"error": "Results not found (they may have expired)"}), 404
+    data["filter"] = review_filter
+    return jsonify(data)
 
 
 @app.route("/download/<filename>")
@@ -1066,26 +2264,14 @@ def get_review_count():
     
     try:
         session = get_session_with_headers()
-        response = session.get(url, timeout=10)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        review_count_patterns = [
-            r'(\d+,?\d*)\s*(?:customer\s*)?reviews?',
-            r'(\d+,?\d*)\s*(?:total\s*)?ratings?',
-            r'See\s*all\s*(\d+,?\d*)\s*reviews?'
-        ]
+        response = cached_get(session, url, timeout=10)
+        soup = BeautifulSoup(response.content, HTML_PARSER)
         
-        page_text = soup.get_text()
-        estimated_count = 0
-        
-        for pattern in review_count_patterns:
-            matches = re.findall(pattern, page_text, re.IGNORECASE)
-            if matches:
-                try:
-                    count = int(matches[0].replace(',', ''))
-                    estimated_count = max(estimated_count, count)
-                except:
-                    continue
+        # The count element when the page has one, free text otherwise
+        estimated_count = (
+            advertised_review_count(soup, AMAZON_REVIEW_COUNT_SELECTORS + FLIPKART_REVIEW_COUNT_SELECTORS)
+            or estimate_review_count(soup.get_text())
+        )
         
         return jsonify({
             "url": url,
@@ -1154,6 +2340,7 @@ if __name__ == "__main__":
     print("- Proper try-except-finally blocks")
     print("Available endpoints:")
     print("- /process (main processing)")
+    print("- /jobs (background processing with status polling)")
     print("- /test-scraping (test URL without ML)")
     print("- /get-review-count (estimate total reviews)")
     print("- /scrape-maximum (scrape up to specified limit)")
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Scoring benchmark
+
+Times the compiled rule engine and the column-wise score_batch in model.py
+against the original one-findall-per-pattern scorer and checks that all of
+them give identical scores. Also times hashed n-gram model inference, whose
+throughput does not depend on the trained weights, and the review page
+parser (full html.parser tree vs lxml restricted to the review region) on
+generated Amazon-sized pages.
+
+Usage:
+    python benchmark.py [number_of_reviews]
+"""
+import contextlib
+import io
+import random
+import re
+import sys
+import time
+
+import numpy as np
+
+from bs4 import BeautifulSoup
+
+from app import AMAZON_PAGE_SELECTORS, parse_amazon_page, parse_review_page
+from model import (
+    FAKE_PATTERNS, SUSPICIOUS_PATTERNS, GENERIC_PHRASES, POSITIVE_WORDS,
+    SPECIFIC_INDICATORS, STARTER_PHRASES, EMOJI_RE,
+    PHRASE_AUTOMATON, preprocess_text, calculate_fake_score, score_batch,
+    HashingVectorizer, LinearReviewModel
+)
+
+SAMPLE_WORDS = (
+    "good product nice quality amazing awesome perfect best product highly recommend "
+    "must buy 5 stars value for money paisa vasool go for it just buy it no regrets "
+    "worth buying good buy the phone battery lasts two days but the camera is poor "
+    "after a week of use however delivery was late packaging was fine price is okay "
+    "love it loved it satisfied as expected as described ! ! ? . . , 😀 😍"
+).split()
+
+
+def make_reviews(count, seed=42):
+    """Generate synthetic reviews with a realistic spread of lengths"""
+    rng = random.Random(seed)
+    lengths = [3, 5, 8, 12, 20, 35, 60, 120]
+    return [
+        " ".join(rng.choice(SAMPLE_WORDS) for _ in range(rng.choice(lengths)))
+        for _ in range(count)
+    ]
+
+
+def reference_fake_score(review_text):
+    """Original scorer: one re.findall per pattern and one substring scan per phrase"""
+    text = preprocess_text(review_text)
+    fake_score = 0
+
+    for pattern in FAKE_PATTERNS:
+        matches = re.findall(pattern, text)
+        if matches:
+            fake_score += 1.0 * len(matches)
+    for pattern in SUSPICIOUS_PATTERNS:
+        matches = re.findall(pattern, text)
+        if matches:
+            fake_score += 0.8 * len(matches)
+
+    word_count = len(text.split())
+    if word_count < 5:
+        fake_score += 2.5
+    elif word_count < 10:
+        fake_score += 1.5
+    elif word_count < 15:
+        fake_score += 0.5
+    elif word_count > 300:
+        fake_score += 1.0
+
+    for phrase in GENERIC_PHRASES:
+        if phrase in text:
+            fake_score += 0.7
+
+    exclamation_count = text.count('!')
+    if exclamation_count > 5:
+        fake_score += 3.0
+    elif exclamation_count > 3:
+        fake_score += 2.0
+    elif exclamation_count > 1:
+        fake_score += 1.0
+
+    if text.count('?') > 2:
+        fake_score += 1.0
+
+    words = text.split()
+    caps_words = [word for word in words if word.isupper() and len(word) > 2]
+    if len(caps_words) > 4:
+        fake_score += 2.0
+    elif len(caps_words) > 2:
+        fake_score += 1.5
+    elif len(caps_words) > 0:
+        fake_score += 0.5
+
+    word_freq = {}
+    for word in words:
+        if len(word) > 3:
+            word_freq[word.lower()] = word_freq.get(word.lower(), 0) + 1
+    max_repetition = max(word_freq.values()) if word_freq else 0
+    if max_repetition > 4:
+        fake_score += 2.0
+    elif max_repetition > 2:
+        fake_score += 1.0
+
+    positive_count = sum(1 for word in POSITIVE_WORDS if word in text)
+    if positive_count >= 4 and word_count < 50:
+        fake_score += 2.5
+    elif positive_count >= 3 and word_count < 30:
+        fake_score += 2.0
+    elif positive_count >= 2 and word_count < 20:
+        fake_score += 1.5
+
+    has_specifics = sum(1 for indicator in SPECIFIC_INDICATORS if indicator in text)
+    if has_specifics == 0 and word_count > 10:
+        fake_score += 2.0
+    elif has_specifics <= 1 and word_count > 15:
+        fake_score += 1.0
+
+    emoji_count = len(EMOJI_RE.findall(review_text))
+    if emoji_count > 3:
+        fake_score += 1.5
+    elif emoji_count > 1:
+        fake_score += 0.5
+
+    positive_ratio = positive_count / word_count if word_count > 0 else 0
+    if positive_ratio > 0.3:
+        fake_score += 1.5
+    elif positive_ratio > 0.2:
+        fake_score += 1.0
+
+    sentence_count = text.count('.') + text.count('!') + text.count('?')
+    if sentence_count <= 1 and word_count > 5:
+        fake_score += 1.0
+
+    if any(text.startswith(phrase) for phrase in STARTER_PHRASES):
+        fake_score += 1.0
+
+    if re.search(r'\b(\w+)\s+\1\s+\1\b', text):
+        fake_score += 2.0
+    elif re.search(r'\b(\w+)\s+\1\b', text):
+        fake_score += 1.0
+
+    return fake_score
+
+
+def make_review_page(page, reviews_per_page=10, filler_blocks=400):
+    """Amazon-like review page: a few reviews buried in a large document"""
+    rng = random.Random(page)
+    filler = "".join(
+        f'<div class="a-section s-item"><a href="/dp/B0{i:08d}"><img src="/i/{i}.jpg" alt="item {i}">'
+        f'<span class="a-price">Rs. {rng.randint(100, 9999)}</span></a><p>{" ".join(rng.choice(SAMPLE_WORDS) for _ in range(15))}</p></div>'
+        for i in range(filler_blocks)
+    )
+    reviews = "".join(
+        f'<div id="R{page}-{i}" class="a-section review"><div class="a-row"><span class="a-profile-name">User {i}</span></div>'
+        f'<span data-hook="review-body" class="a-size-base review-text review-text-content">'
+        f'<span>{" ".join(rng.choice(SAMPLE_WORDS) for _ in range(40))}</span></span></div>'
+        for i in range(reviews_per_page)
+    )
+    script = "<script>var data = {" + ",".join(f'"k{i}": {i}' for i in range(2000)) + "};</script>"
+    return (
+        f'<html><head><title>Reviews</title>{script}</head><body><div id="nav">{filler[:len(filler) // 2]}</div>'
+        f'<div id="cm_cr-review_list">{reviews}</div><ul class="a-pagination"><li class="a-last">'
+        f'<a href="?pageNumber={page + 1}">Next page</a></li></ul><div id="footer">{filler[len(filler) // 2:]}</div>'
+        f'</body></html>'
+    ).encode("utf-8")
+
+
+def time_call(label, func, reviews):
+    """Run func over every review and print throughput"""
+    start = time.perf_counter()
+    results = [func(review) for review in reviews]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:8.3f}s  {len(reviews) / elapsed:10.0f} reviews/s")
+    return results, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    reviews = make_reviews(count)
+
+    print(f"Scoring {count} synthetic reviews")
+    print(f"Phrase matcher backend: {PHRASE_AUTOMATON.backend}")
+    print(f"{'='*60}")
+    reference_scores, reference_time = time_call("reference (per-pattern)", reference_fake_score, reviews)
+    engine_scores, engine_time = time_call("compiled rule engine", calculate_fake_score, reviews)
+
+
+    start = time.perf_counter()
+    batch_scores, _ = score_batch(reviews)
+    batch_time = time.perf_counter() - start
+    print(f"{'score_batch':<24} {batch_time:8.3f}s  {count / batch_time:10.0f} reviews/s")
+
+    vectorizer = HashingVectorizer()
+    ml_model = LinearReviewModel(np.zeros(vectorizer.n_features, dtype=np.float32))
+    start = time.perf_counter()
+    ml_model.predict(vectorizer.transform(reviews))
+    ml_time = time.perf_counter() - start
+    print(f"{'hashed n-gram model':<24} {ml_time:8.3f}s  {count / ml_time:10.0f} reviews/s")
+
+    pages = [make_review_page(page) for page in range(1, 21)]
+    # parse_amazon_page logs every page - keep the table readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        full_results = [parse_amazon_page(BeautifulSoup(html, 'html.parser')) for html in pages]
+        full_parse_time = time.perf_counter() - start
+    print(f"{'page parse (full tree)':<24} {full_parse_time:8.3f}s  {len(pages) / full_parse_time:10.1f} pages/s")
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        fast_results = [parse_amazon_page(parse_review_page(html, AMAZON_PAGE_SELECTORS)) for html in pages]
+        fast_parse_time = time.perf_counter() - start
+    print(f"{'page parse (fast path)':<24} {fast_parse_time:8.3f}s  {len(pages) / fast_parse_time:10.1f} pages/s")
+
+    mismatches = sum(1 for a, b in zip(reference_scores, engine_scores) if a != b)
+    mismatches += sum(1 for a, b in zip(reference_scores, batch_scores) if a != b)
+    mismatches += sum(1 for a, b in zip(full_results, fast_results) if a != b)
+    print(f"{'='*60}")
+    print(f"Speedup (rule engine): {reference_time / engine_time:.2f}x")
+    print(f"Speedup (score_batch): {reference_time / batch_time:.2f}x")
+    print(f"Speedup (hashed model): {reference_time / ml_time:.2f}x")
+    print(f"Speedup (page parse): {full_parse_time / fast_parse_time:.2f}x")
+    print(f"Score mismatches: {mismatches}")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
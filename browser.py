@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+import atexit
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+# Long-lived headless browsers kept per process for the Selenium fallback
+BROWSER_POOL_SIZE = max(1, int(os.getenv("BROWSER_POOL_SIZE", "2")))
+# Restart a browser after this many jobs so leaks in long sessions do not pile up
+BROWSER_MAX_USES = max(1, int(os.getenv("BROWSER_MAX_USES", "50")))
+# Longest wait for a page to load or change after a scroll/click
+BROWSER_WAIT_TIMEOUT = float(os.getenv("BROWSER_WAIT_TIMEOUT", "8"))
+# After a scroll, nothing new within this long means the end of an infinite list
+BROWSER_SCROLL_TIMEOUT = float(os.getenv("BROWSER_SCROLL_TIMEOUT", "2"))
+
+# Images, fonts and CSS are never needed to read review text
+BLOCKED_RESOURCES = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.css", "*.woff", "*.woff2", "*.ttf", "*.otf"
+]
+
+# Cheap summary of the page that changes when new content is loaded
+PAGE_STATE_JS = (
+    "return [location.href, document.body ? document.body.scrollHeight : 0, "
+    "document.getElementsByTagName('*').length].join('|')"
+)
+
+
+def wait_until(condition, timeout=BROWSER_WAIT_TIMEOUT, poll=0.2):
+    """Poll condition() until it is truthy (returns True) or timeout passes (returns False)"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if condition():
+                return True
+        except Exception:
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(poll)
+
+
+def page_state(driver):
+    return driver.execute_script(PAGE_STATE_JS)
+
+
+def wait_for_page_change(driver, before, timeout=BROWSER_WAIT_TIMEOUT):
+    """Wait until the page state differs from `before` (new content, new page or new URL)"""
+    return wait_until(lambda: page_state(driver) != before, timeout)
+
+
+def wait_for_document_ready(driver, timeout=15):
+    return wait_until(
+        lambda: driver.execute_script("return document.readyState") in ("interactive", "complete"), timeout
+    )
+
+
+def chrome_driver_factory():
+    """Headless Chrome that skips images, fonts and stylesheets"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.fonts": 2,
+    })
+    # Hand the page over once the DOM is ready instead of after every subresource
+    chrome_options.page_load_strategy = "eager"
+
+    driver = webdriver.Chrome(options=chrome_options)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_RESOURCES})
+    except Exception as e:
+        print(f"Could not block page resources: {e}")
+    return driver
+
+
+class BrowserPool:
+    """
+    Pool of warm browser sessions checked out one job at a time
+
+    Browsers are started on demand up to `size` and reused across jobs, so
+    only the first job pays the start-up cost. `factory` builds a driver
+    object with the Selenium WebDriver methods the scrapers use (get,
+    execute_script, find_elements, page_source, delete_all_cookies, quit),
+    so tests can plug in a fake driver.
+    """
+
+    def __init__(self, factory=chrome_driver_factory, size=BROWSER_POOL_SIZE, max_uses=BROWSER_MAX_USES):
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.idle = queue.LifoQueue()
+        self.uses = {}
+        self.started = 0
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def checkout(self, timeout=120):
+        """Borrow a browser; it goes back to the pool unless the job raised"""
+        driver = self._acquire(timeout)
+        healthy = False
+        try:
+            yield driver
+            healthy = True
+        finally:
+            self._release(driver, healthy)
+
+    def _acquire(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self.idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self.lock:
+                start_new = self.started < self.size
+                if start_new:
+                    self.started += 1
+            if start_new:
+                try:
+                    driver = self.factory()
+                except Exception:
+                    with self.lock:
+                        self.started -= 1
+                    raise
+                self.uses[id(driver)] = 0
+                return driver
+            if time.monotonic() >= deadline:
+                raise TimeoutError("No browser became free in time")
+            # A browser is either returned or discarded (freeing a slot) - check again shortly
+            try:
+                return self.idle.get(timeout=min(1.0, max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                continue
+
+    def _release(self, driver, healthy):
+        self.uses[id(driver)] = self.uses.get(id(driver), 0) + 1
+        if healthy and self.uses[id(driver)] < self.max_uses:
+            try:
+                # Leave no state behind for the next job
+                driver.delete_all_cookies()
+                driver.get("about:blank")
+                self.idle.put(driver)
+                return
+            except Exception:
+                pass
+        self._discard(driver)
+
+    def _discard(self, driver):
+        self.uses.pop(id(driver), None)
+        with self.lock:
+            self.started -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        while True:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_browser_pool():
+    """Process-wide BrowserPool (browsers never cross a gunicorn fork)"""
+    with _pools_lock:
+        pool = _pools.get(os.getpid())
+        if pool is None:
+            pool = _pools[os.getpid()] = BrowserPool()
+            atexit.register(pool.close)
+        return pool
@@ -0,0 +1,593 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+try:
+    import aiohttp  # Optional non-blocking HTTP client: pip install aiohttp
+    import yarl  # Installed with aiohttp
+except ImportError:
+    aiohttp = None
+
+# Pages fetched at once per scrape (1 = strictly one page after another)
+SCRAPE_CONCURRENCY = max(1, int(os.getenv("SCRAPE_CONCURRENCY", "4")))
+# Threads for blocking work handed off by the scraping loop (parsing, SQLite, the requests backend)
+SCRAPE_THREADS = max(1, int(os.getenv("SCRAPE_THREADS", "32")))
+# Politeness per host: sustained requests/second and how many may go out back to back
+SCRAPE_RATE = float(os.getenv("SCRAPE_RATE", "1.0"))
+SCRAPE_BURST = max(1, int(os.getenv("SCRAPE_BURST", "2")))
+# Requests in flight at once across every scrape sharing one AsyncHttpClient
+ASYNC_MAX_IN_FLIGHT = max(1, int(os.getenv("ASYNC_MAX_IN_FLIGHT", "200")))
+# Keep-alive connections kept open per host, and retries for connection errors / 429 / 5xx
+HTTP_POOL_PER_HOST = max(1, int(os.getenv("HTTP_POOL_PER_HOST", "10")))
+HTTP_RETRIES = max(0, int(os.getenv("HTTP_RETRIES", "2")))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Default home of the on-disk caches - next to the code, whatever the working directory
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache"))
+# Shared on-disk response cache (HTTP_CACHE_PATH= disables it)
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", os.path.join(CACHE_DIR, "http_responses.sqlite3"))
+HTTP_CACHE_TTL = float(os.getenv("HTTP_CACHE_TTL", str(6 * 60 * 60)))
+HTTP_CACHE_MAX_MB = float(os.getenv("HTTP_CACHE_MAX_MB", "256"))
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: acquire() blocks until a token is available
+
+    Tokens refill at `rate` per second up to `burst`, so requests can go out
+    back to back after a quiet period but never faster than `rate` on average.
+    """
+
+    def __init__(self, rate=SCRAPE_RATE, burst=SCRAPE_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how many seconds to wait before using it"""
+        if self.rate <= 0:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Going negative queues the caller behind earlier reservations
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
+
+    def acquire(self):
+        time.sleep(self.reserve())
+
+
+class HostRateLimiter:
+    """One TokenBucket per host, shared by every scrape in the process"""
+
+    def __init__(self, rate=SCRAPE_RATE, burst=SCRAPE_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, url):
+        host = urlparse(url).netloc.lower()
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rate, self.burst)
+            return self.buckets[host]
+
+    def reserve(self, url):
+        return self.bucket(url).reserve()
+
+    def acquire(self, url):
+        self.bucket(url).acquire()
+
+
+RATE_LIMITER = HostRateLimiter()
+
+
+class ConnectionStats:
+    """Process-wide counters of HTTP requests sent and TCP/TLS connections opened for them"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+
+    def record_request(self):
+        with self.lock:
+            self.requests += 1
+
+    def record_new_connection(self):
+        with self.lock:
+            self.new_connections += 1
+
+    def snapshot(self):
+        with self.lock:
+            requests_sent, new_connections = self.requests, self.new_connections
+        return {
+            "requests": requests_sent,
+            "new_connections": new_connections,
+            # Every request that did not open a connection went over a kept-alive one
+            "reused_connections": max(0, requests_sent - new_connections),
+        }
+
+
+CONNECTION_STATS = ConnectionStats()
+
+
+class CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        CONNECTION_STATS.record_new_connection()
+        return super()._new_conn()
+
+
+class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        CONNECTION_STATS.record_new_connection()
+        return super()._new_conn()
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter with per-host keep-alive pools, retries and connection counters"""
+
+    def __init__(self, pool_per_host=HTTP_POOL_PER_HOST, retries=HTTP_RETRIES):
+        retry = Retry(
+            total=retries, backoff_factor=0.5, status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["GET", "HEAD"]), raise_on_status=False
+        )
+        super().__init__(pool_connections=32, pool_maxsize=pool_per_host, max_retries=retry)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        CONNECTION_STATS.record_request()
+        return super().send(request, **kwargs)
+
+
+class PooledSession(requests.Session):
+    """requests.Session over a shared adapter - close() leaves the process's connections open"""
+
+    def close(self):
+        pass
+
+
+_shared_adapters = {}
+_shared_adapters_lock = threading.Lock()
+
+def get_shared_session(headers=None):
+    """
+    New requests.Session with the given default headers over the process's shared connection pool
+
+    Connections are kept alive and reused across scrapes and threads through
+    one PooledHTTPAdapter per process, built on first use, so gunicorn
+    workers forked after --preload never share sockets. Each call gets its
+    own cookie jar, so cookies set during one scrape never reach another.
+    """
+    with _shared_adapters_lock:
+        adapter = _shared_adapters.get(os.getpid())
+        if adapter is None:
+            adapter = _shared_adapters[os.getpid()] = PooledHTTPAdapter()
+    session = PooledSession()
+    session.headers.update(headers or {})
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_shared_aiohttp_sessions = {}
+
+
+def get_shared_aiohttp_session(headers=None, max_in_flight=ASYNC_MAX_IN_FLIGHT):
+    """
+    aiohttp counterpart of get_shared_session: one pooled ClientSession per
+    process, event loop and default headers (call it from inside the loop)
+
+    Scrapes run through run_sync all share the process's scraping loop, so
+    they all reuse this session's keep-alive connections. The session keeps
+    no cookies - each AsyncHttpClient carries its own jar.
+    """
+    loop = asyncio.get_running_loop()
+    key = (os.getpid(), loop, tuple(sorted((headers or {}).items())))
+    session = _shared_aiohttp_sessions.get(key)
+    if session is None or session.closed:
+        headers = dict(headers or {})
+        # aiohttp can only decode br when the optional Brotli package is installed
+        headers["Accept-Encoding"] = "gzip, deflate"
+        connector = aiohttp.TCPConnector(limit=max_in_flight, limit_per_host=HTTP_POOL_PER_HOST)
+        session = _shared_aiohttp_sessions[key] = aiohttp.ClientSession(
+            headers=headers, connector=connector, cookie_jar=aiohttp.DummyCookieJar(),
+            trace_configs=[_aiohttp_trace_config()]
+        )
+    return session
+
+
+def _aiohttp_trace_config():
+    """Feed aiohttp request / new connection events into CONNECTION_STATS"""
+    async def on_request_start(session, context, params):
+        CONNECTION_STATS.record_request()
+
+    async def on_connection_create_end(session, context, params):
+        CONNECTION_STATS.record_new_connection()
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    return trace_config
+
+
+# Response as seen by the scrapers, whichever HTTP backend fetched it. url is
+# where redirects ended, requested_url what was asked for (the cache key) and
+# cached whether it came out of the ResponseCache
+FetchedPage = namedtuple(
+    "FetchedPage", ["url", "status_code", "content", "headers", "requested_url", "cached"], defaults=(None, False)
+)
+
+
+def normalize_url(url):
+    """Cache key for a URL: lower-case scheme/host, no fragment, sorted query without utm_* tracking"""
+    parts = urlparse(url.strip())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_")
+    )
+    netloc = parts.netloc.lower()
+    if (parts.scheme.lower(), netloc.rsplit(":", 1)[-1]) in (("http", "80"), ("https", "443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    return urlunparse((parts.scheme.lower(), netloc, parts.path or "/", parts.params, urlencode(query), ""))
+
+
+class CachedResponse(namedtuple("CachedResponse", ["page", "etag", "last_modified", "fetched_at"])):
+
+    def is_fresh(self, ttl):
+        return time.time() - self.fetched_at < ttl
+
+    def validators(self):
+        """Conditional request headers that let the server answer 304 Not Modified"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    SQLite cache of successful GET responses, shared by every worker process
+
+    Entries younger than ttl are served without touching the network; older
+    ones are revalidated with If-None-Match / If-Modified-Since. The file is
+    kept under max_bytes by evicting the least recently used responses.
+    """
+
+    def __init__(self, path, ttl=HTTP_CACHE_TTL, max_bytes=int(HTTP_CACHE_MAX_MB * 1024 * 1024)):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._connection = None
+        self._connection_pid = None
+
+    def _db(self):
+        """SQLite connection for this process (connections must not cross a fork)"""
+        if self._connection is None or self._connection_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, url TEXT, status INTEGER, "
+                "content BLOB, headers TEXT, etag TEXT, last_modified TEXT, fetched_at REAL, "
+                "accessed_at REAL, size INTEGER)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def lookup(self, url):
+        """CachedResponse for url, or None"""
+        key = normalize_url(url)
+        try:
+            with self._lock:
+                db = self._db()
+                row = db.execute(
+                    "SELECT url, status, content, headers, etag, last_modified, fetched_at FROM responses WHERE key = ?",
+                    (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                with db:
+                    db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error as e:
+            print(f"HTTP cache read failed: {e}")
+            return None
+        page = FetchedPage(row[0], row[1], bytes(row[2]), json.loads(row[3]))
+        return CachedResponse(page, row[4], row[5], row[6])
+
+    def fresh_or_validators(self, url, revalidate=False):
+        """(page, None) when a fresh copy is cached, else (None, cached entry or None)"""
+        entry = self.lookup(url)
+        if entry is not None and not revalidate and entry.is_fresh(self.ttl):
+            self.hits += 1
+            return entry.page, None
+        self.misses += 1
+        return None, entry
+
+    def finish(self, url, page, entry, store=True):
+        """Store a fresh 200 (unless store is False), or turn a 304 into the cached page"""
+        if page.status_code == 304 and entry is not None:
+            self.revalidated += 1
+            self.refresh(url)
+            return entry.page
+        if page.status_code == 200 and store:
+            self.store(url, page)
+        return page
+
+    def store(self, url, page):
+        """Remember a 200 response, then evict least recently used entries over max_bytes"""
+        headers = {name.lower(): value for name, value in page.headers.items()}
+        if "no-store" in headers.get("cache-control", "").lower():
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                db = self._db()
+                with db:
+                    db.execute(
+                        "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (normalize_url(url), page.url, page.status_code, page.content, json.dumps(dict(page.headers)),
+                         headers.get("etag"), headers.get("last-modified"), now, now, len(page.content))
+                    )
+                    self._evict(db)
+        except sqlite3.Error as e:
+            print(f"HTTP cache write failed: {e}")
+
+    def refresh(self, url):
+        """The server confirmed the cached copy (304): restart its TTL"""
+        now = time.time()
+        try:
+            with self._lock:
+                db = self._db()
+                with db:
+                    db.execute("UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?",
+                               (now, now, normalize_url(url)))
+        except sqlite3.Error as e:
+            print(f"HTTP cache write failed: {e}")
+
+    def _evict(self, db):
+        excess = (db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]) - self.max_bytes
+        if excess <= 0:
+            return
+        victims = []
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        db.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+RESPONSE_CACHE = ResponseCache(HTTP_CACHE_PATH) if HTTP_CACHE_PATH else None
+
+
+def cached_get(session, url, timeout=20, cache=None):
+    """Blocking GET through the response cache - returns a FetchedPage"""
+    cache = cache or RESPONSE_CACHE
+    entry = None
+    if cache is not None:
+        page, entry = cache.fresh_or_validators(url)
+        if page is not None:
+            return page
+
+    headers = entry.validators() if entry is not None else None
+    response = session.get(url, timeout=timeout, headers=headers)
+    page = FetchedPage(response.url, response.status_code, response.content, dict(response.headers))
+    return cache.finish(url, page, entry) if cache is not None else page
+
+
+class AsyncHttpClient:
+    """
+    Shared HTTP client for the asyncio scraping engine
+
+    With aiohttp installed, all requests go through the process's shared
+    aiohttp session (get_shared_aiohttp_session), so a single event loop keeps
+    up to max_in_flight requests open without a thread per request and
+    connections are reused across scrapes. Without aiohttp (or when a requests session is passed in),
+    each request runs the blocking session.get in a worker thread instead.
+    Cookies live only as long as the client, as with a fresh browser session.
+    Responses go through the shared ResponseCache: fresh hits skip the
+    network (and the rate limiter) entirely. Every real request waits for
+    the per-host rate limiter first.
+    """
+
+    def __init__(self, session=None, headers=None, max_in_flight=ASYNC_MAX_IN_FLIGHT, rate_limiter=None,
+                 cache=RESPONSE_CACHE):
+        self.headers = dict(headers or {})
+        self.backend = "aiohttp" if session is None and aiohttp is not None else "requests"
+        if self.backend == "requests" and session is None:
+            session = get_shared_session(self.headers)
+        self.session = session
+        self.max_in_flight = max_in_flight
+        self.rate_limiter = rate_limiter or RATE_LIMITER
+        self.cache = cache
+        self._http = None
+        self._cookies = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        # The aiohttp session is shared by the whole process and stays open
+        self._http = None
+
+    async def get(self, url, timeout=20, revalidate=False, store=True):
+        """
+        GET url and return a FetchedPage
+        
+        With revalidate, a cached copy is only used after a 304. With store
+        False a 200 is not cached - bot checks and captchas come back as 200
+        too, so scrapers pass it and keep() only pages that had reviews.
+        """
+        # The SQLite cache can wait on its busy timeout, so it is read and written
+        # off the event loop, which every scrape in the process shares
+        entry = None
+        if self.cache is not None:
+            page, entry = await asyncio.to_thread(self.cache.fresh_or_validators, url, revalidate)
+            if page is not None:
+                return page._replace(requested_url=url, cached=True)
+        validators = entry.validators() if entry is not None else None
+
+        # Created on first use so they belong to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        await asyncio.sleep(self.rate_limiter.reserve(url))
+
+        async with self._semaphore:
+            if self.backend == "aiohttp":
+                if self._http is None:
+                    self._http = get_shared_aiohttp_session(self.headers, self.max_in_flight)
+                    # Cookies stay with this client (one scrape), not the shared session
+                    self._cookies = aiohttp.CookieJar(unsafe=True)  # accept IP hosts, like requests
+                async with self._http.get(
+                    url, headers=validators, cookies=self._cookies.filter_cookies(yarl.URL(url)),
+                    timeout=aiohttp.ClientTimeout(total=timeout)
+                ) as response:
+                    self._cookies.update_cookies(response.cookies, response.url)
+                    content = await response.read()
+                    page = FetchedPage(str(response.url), response.status, content, dict(response.headers))
+            else:
+                response = await asyncio.to_thread(self.session.get, url, timeout=timeout, headers=validators)
+                page = FetchedPage(response.url, response.status_code, response.content, dict(response.headers))
+
+        cached = False
+        if self.cache is not None:
+            cached = page.status_code == 304 and entry is not None
+            page = await asyncio.to_thread(self.cache.finish, url, page, entry, store)
+        return page._replace(requested_url=url, cached=cached)
+
+    async def keep(self, page):
+        """Cache a page fetched with store=False once it proved to be real content"""
+        if self.cache is not None and page.status_code == 200 and not page.cached:
+            await asyncio.to_thread(self.cache.store, page.requested_url or page.url, page)
+
+
+async def iter_pages(fetch, pages, concurrency=SCRAPE_CONCURRENCY):
+    """
+    Run the coroutine fetch(page) for several pages at once, yielding (page, task) IN PAGE ORDER
+
+    At most `concurrency` fetches are in flight. The caller handles each page
+    (task.result() re-raises the fetch error) and can stop at any time by
+    breaking out of the loop - pages not yet started are never fetched, so a
+    stop condition costs at most concurrency - 1 extra requests. Wrap the
+    generator in contextlib.aclosing so queued fetches are cancelled on break.
+    `pages` is re-read after each page, so an iterator that runs out and then
+    gets more pages (PagePlanner raising its budget) keeps the crawl going.
+    """
+    pages = iter(pages)
+    pending = deque()
+
+    def submit_next():
+        for page in pages:
+            pending.append((page, asyncio.ensure_future(fetch(page))))
+            return
+
+    try:
+        for _ in range(max(1, concurrency)):
+            submit_next()
+        while pending:
+            page, task = pending.popleft()
+            # Wait here so the page is complete before the caller sees it
+            await asyncio.wait([task])
+            yield page, task
+            # Refill only after the caller has accepted this page and not stopped
+            submit_next()
+    finally:
+        for _, task in pending:
+            task.cancel()
+
+
+_loops = {}
+_loops_lock = threading.Lock()
+
+
+def _close_loop(loop):
+    async def close_sessions():
+        for key, session in list(_shared_aiohttp_sessions.items()):
+            if key[1] is loop:
+                await session.close()
+                del _shared_aiohttp_sessions[key]
+    try:
+        asyncio.run_coroutine_threadsafe(close_sessions(), loop).result(timeout=5)
+    except Exception:
+        pass
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def get_scraping_loop():
+    """
+    Process-wide event loop running in a background thread
+
+    Every run_sync call (Flask views, job threads, scripts) runs its
+    coroutine here, so pooled aiohttp sessions outlive a single scrape.
+    Each process starts its own loop, so nothing crosses a gunicorn fork.
+    Anything blocking (parsing, SQLite, callbacks) must go through
+    asyncio.to_thread, or it stalls every scrape in the process; those
+    calls share SCRAPE_THREADS threads.
+    """
+    with _loops_lock:
+        loop = _loops.get(os.getpid())
+        if loop is None:
+            loop = _loops[os.getpid()] = asyncio.new_event_loop()
+            loop.set_default_executor(ThreadPoolExecutor(SCRAPE_THREADS, thread_name_prefix="scraping"))
+            threading.Thread(target=loop.run_forever, name="scraping-loop", daemon=True).start()
+            atexit.register(_close_loop, loop)
+        return loop
+
+
+def run_sync(coroutine):
+    """Run a scraping coroutine to completion from synchronous code (Flask views, scripts)"""
+    loop = get_scraping_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coroutine.close()
+        raise RuntimeError("run_sync cannot be called from the scraping loop itself - await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
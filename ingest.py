@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+import codecs
+import csv
+import gzip
+import io
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq  # Optional Parquet reader: pip install pyarrow
+except ImportError:
+    pq = None
+
+try:
+    import zstandard  # Optional .zst decompression: pip install zstandard
+except ImportError:
+    zstandard = None
+
+# Reviews read from an upload per chunk - memory stays flat whatever the file size
+UPLOAD_CHUNK_SIZE = max(1, int(os.getenv("UPLOAD_CHUNK_SIZE", "50000")))
+# Bytes of an upload read to detect its encoding and review column
+UPLOAD_SNIFF_BYTES = 64 * 1024
+
+# Review column names looked for in uploads, in order of preference
+REVIEW_COLUMNS = [
+    "reviews.text", "review", "Review", "reviews", "Reviews",
+    "text", "Text", "comment", "Comment", "review_text",
+    "reviewText", "content", "Content", "feedback", "Feedback"
+]
+
+UPLOAD_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+UPLOAD_COMPRESSIONS = {".gz": "gzip", ".zst": "zstd"}
+
+
+def upload_format(filename):
+    """
+    (format, compression) of an upload from its file name, None if unsupported
+
+    e.g. "reviews.jsonl.gz" -> ("jsonl", "gzip"). Parquet compresses its
+    own pages, so a compressed Parquet file is not accepted.
+    """
+    name = filename.lower()
+    compression = None
+    for suffix, kind in UPLOAD_COMPRESSIONS.items():
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+            compression = kind
+            break
+    for suffix, kind in UPLOAD_FORMATS.items():
+        if name.endswith(suffix):
+            if kind == "parquet" and compression:
+                return None
+            return kind, compression
+    return None
+
+
+def open_upload(filepath, compression=None):
+    """Binary file object over the upload's decompressed bytes"""
+    if compression == "gzip":
+        return gzip.open(filepath, "rb")
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("Reading .zst files needs the zstandard package (pip install zstandard)")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(filepath, "rb")))
+    return open(filepath, "rb")
+
+
+def _pick_review_column(columns):
+    """First REVIEW_COLUMNS name among columns; ValueError listing what is there otherwise"""
+    column = next((c for c in REVIEW_COLUMNS if c in columns), None)
+    if column is None:
+        available_cols = ", ".join(str(c) for c in list(columns)[:10])
+        print(f"Available columns: {available_cols}")
+        raise ValueError(
+            f"No review column found. Available columns: {available_cols}. "
+            f"Please ensure your file has a column named 'reviews.text', 'review', or 'Review'."
+        )
+    return column
+
+
+def _sniff_csv(filepath, compression):
+    with open_upload(filepath, compression) as f:
+        sample = f.read(UPLOAD_SNIFF_BYTES)
+
+    # latin1 decodes any bytes, so it is the last resort
+    for encoding in ['utf-8-sig', 'cp1252', 'latin1']:
+        try:
+            # Incremental decoder - a character cut off at the end of the sample is not an error
+            text = codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            break
+        except UnicodeDecodeError:
+            continue
+
+    header = next(csv.reader(io.StringIO(text)), [])
+    if not header:
+        raise ValueError("Could not read CSV file. Please check file format and encoding.")
+    return _pick_review_column(header), encoding
+
+
+def _sniff_jsonl(filepath, compression):
+    # Keys of the first record, which may be longer than UPLOAD_SNIFF_BYTES
+    with open_upload(filepath, compression) as f:
+        for line in io.TextIOWrapper(f, encoding="utf-8-sig", errors="replace"):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                raise ValueError("Could not read JSONL file: the first line is not a JSON object.")
+            if not isinstance(record, dict):
+                raise ValueError("Could not read JSONL file: each line must be a JSON object.")
+            return _pick_review_column(record.keys()), "utf-8"
+    raise ValueError("Could not read JSONL file: it has no records.")
+
+
+def _sniff_parquet(filepath):
+    if pq is None:
+        raise ValueError("Reading Parquet files needs the pyarrow package (pip install pyarrow)")
+    try:
+        columns = pq.ParquetFile(filepath).schema_arrow.names
+    except Exception as e:
+        raise ValueError(f"Could not read Parquet file: {e}")
+    return _pick_review_column(columns), None
+
+
+def sniff_upload(filepath, file_format="csv", compression=None):
+    """
+    Work out how to read an upload from its first few KB (or its schema)
+
+    Returns a dict with format, compression, column and encoding for
+    iter_upload_reviews. Raises ValueError with a message for the user when
+    the file cannot be read or has no review column.
+    """
+    if file_format == "parquet":
+        column, encoding = _sniff_parquet(filepath)
+    elif file_format == "jsonl":
+        column, encoding = _sniff_jsonl(filepath, compression)
+    else:
+        column, encoding = _sniff_csv(filepath, compression)
+
+    print(f"Found reviews in '{column}' column of {file_format} upload"
+          + (f" with {encoding} encoding" if encoding else ""))
+    return {"format": file_format, "compression": compression, "column": column, "encoding": encoding}
+
+
+def _iter_csv(filepath, upload, chunk_size):
+    with open_upload(filepath, upload["compression"]) as f:
+        chunks = pd.read_csv(
+            f, usecols=[upload["column"]], encoding=upload["encoding"], encoding_errors="replace",
+            dtype=str, chunksize=chunk_size, engine="c"
+        )
+        with chunks:
+            for chunk in chunks:
+                yield chunk[upload["column"]].dropna()
+
+
+def _iter_jsonl(filepath, upload, chunk_size):
+    column = upload["column"]
+    reviews = []
+    bad_lines = 0
+    with open_upload(filepath, upload["compression"]) as f:
+        # One record in memory at a time, however large the file
+        for line in io.TextIOWrapper(f, encoding="utf-8-sig", errors="replace"):
+            if not line.strip():
+                continue
+            try:
+                review = json.loads(line).get(column)
+            except (ValueError, AttributeError):
+                bad_lines += 1
+                continue
+            if review is not None:
+                reviews.append(str(review))
+            if len(reviews) >= chunk_size:
+                yield pd.Series(reviews, dtype=object)
+                reviews = []
+    if reviews:
+        yield pd.Series(reviews, dtype=object)
+    if bad_lines:
+        print(f"Skipped {bad_lines} JSONL lines that are not JSON objects")
+
+
+def _iter_parquet(filepath, upload, chunk_size):
+    column = upload["column"]
+    # Only the review column is read from disk
+    for batch in pq.ParquetFile(filepath).iter_batches(batch_size=chunk_size, columns=[column]):
+        yield batch.column(0).to_pandas().dropna().astype(str)
+
+
+def iter_upload_reviews(filepath, upload, chunk_size=UPLOAD_CHUNK_SIZE):
+    """Review texts of an upload described by sniff_upload, as pandas Series of up to chunk_size reviews"""
+    if upload["format"] == "parquet":
+        return _iter_parquet(filepath, upload, chunk_size)
+    if upload["format"] == "jsonl":
+        return _iter_jsonl(filepath, upload, chunk_size)
+    return _iter_csv(filepath, upload, chunk_size)
@@ -1,258 +1,326 @@
 # -*- coding: utf-8 -*-
+import hashlib
+import json
+import multiprocessing
+import numpy as np
+import os
 import pandas as pd
 import random
 import re
+import sqlite3
 import string
+import threading
+from collections import Counter, OrderedDict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
 
-def preprocess_text(text):
-    """Clean and preprocess review text"""
-    if not text or pd.isna(text):
-        return ""
-    
-    text = str(text).lower()
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
-    # Remove special characters but keep basic punctuation
-    text = re.sub(r'[^\w\s.,!?-]', '', text)
-    return text
+try:
+    import ahocorasick  # Optional accelerated phrase matcher: pip install pyahocorasick
+except ImportError:
+    ahocorasick = None
 
-def calculate_fake_score(review_text):
-    """Calculate likelihood of review being fake based on patterns - ULTRA AGGRESSIVE MODE"""
-    text = preprocess_text(review_text)
-    fake_score = 0
-    
-    # MASSIVELY EXPANDED fake review patterns (Indian e-commerce specific)
-    fake_patterns = [
-        # Superlatives
-        r'\b(amazing|awesome|perfect|excellent|outstanding|phenomenal|incredible|superb|fantastic|wonderful|brilliant|fabulous|marvelous|spectacular|stunning|breathtaking)\b',
-        # Best/Top patterns
-        r'\b(best|greatest|finest|top|ultimate|supreme|premier) (product|item|purchase|buy|thing|deal|choice)\b',
-        # Recommendation patterns
-        r'\bhighly recommend\b',
-        r'\bstrongly recommend\b',
-        r'\bwould recommend\b',
-        r'\brecommend (it|this)\b',
-        # Must buy patterns
-        r'\bmust buy\b',
-        r'\bmust have\b',
-        r'\bmust purchase\b',
-        r'\bshould buy\b',
-        # Star patterns
-        r'\b5 stars?\b',
-        r'\bfive stars?\b',
-        r'\b5/5\b',
-        r'\b10/10\b',
-        # Delivery patterns (often fake)
-        r'\bsuper fast delivery\b',
-        r'\bfast delivery\b',
-        r'\bquick delivery\b',
-        r'\bon time delivery\b',
-        r'\btimely delivery\b',
-        # Expectation patterns
-        r'\bexceeded expectations\b',
-        r'\bbeyond expectations\b',
-        r'\bmet expectations\b',
-        # Value patterns
-        r'\bmoney well spent\b',
-        r'\bworth every penny\b',
-        r'\bworth every rupee\b',
-        r'\bbest purchase ever\b',
-        r'\bvalue for money\b',
-        r'\bpaisa vasool\b',
-        r'\bvfm\b',
-        # Satisfaction patterns
-        r'\btotally satisfied\b',
-        r'\bfully satisfied\b',
-        r'\bcompletely satisfied\b',
-        r'\b100%\s*(satisfied|genuine|authentic|original|recommended|happy)\b',
-        # Quality patterns
-        r'\bgreat quality\b',
-        r'\bgood quality\b',
-        r'\bexcellent quality\b',
-        r'\bsuperior quality\b',
-        r'\btop quality\b',
-        r'\bbest quality\b',
-        # Product praise patterns
-        r'\bnice product\b',
-        r'\bgood product\b',
-        r'\bgreat product\b',
-        r'\blove it\b',
-        r'\bloved it\b',
-        r'\bloving it\b',
-        r'\bamazing product\b',
-        r'\bawesome product\b',
-        r'\bexcellent product\b',
-        r'\bsuperb product\b',
-        # Generic praise
-        r'\bvery (good|nice|happy|satisfied)\b',
-        r'\bso (good|nice|happy|satisfied|glad)\b',
-        r'\breally (good|nice|great|happy)\b',
-    ]
-    
-    # MASSIVELY EXPANDED suspicious characteristics
-    suspicious_patterns = [
-        # Urgency patterns
-        r'\b(buy|purchase|get|order) (this|it) (now|today|immediately|right now|asap)\b',
-        r'\bdon\'t (hesitate|wait|think twice|delay)\b',
-        r'\bworthwhile investment\b',
-        r'\bgo for it\b',
-        r'\bjust (buy|get|order|go for) it\b',
-        r'\bno regrets\b',
-        r'\bno doubt\b',
-        r'\bwithout (any )?doubt\b',
-        # Deal patterns
-        r'\bbest deal\b',
-        r'\bgreat deal\b',
-        r'\bgood deal\b',
-        r'\bamazing deal\b',
-        r'\btotally worth it\b',
-        r'\bcompletely worth it\b',
-        r'\bdefinitely worth\b',
-        # Indian specific
-        r'\bpaisa vasool\b',
-        r'\bbargain price\b',
-        r'\bvalue pack\b',
-        # Purchase encouragement
-        r'\bgood buy\b',
-        r'\bnice buy\b',
-        r'\bgreat buy\b',
-        r'\bbest buy\b',
-        r'\bworth buying\b',
-        r'\bwill buy again\b',
-        r'\bwould buy again\b',
-        r'\bgo ahead\b',
-        r'\bgo for this\b',
-        r'\bblindly buy\b',
-        r'\bblindly go for\b',
-        r'\bdon\'t think (twice|much)\b',
-        r'\b(you|u) (should|must|can) buy\b',
-        # Comparison patterns (often fake)
-        r'\bbetter than\b',
-        r'\bbest in\b',
-        r'\btop in\b',
-        # As described (generic)
-        r'\bas (shown|described|expected)\b',
-        r'\bsame as (pic|picture|image)\b',
-    ]
-    
-    # Check for fake patterns - COUNT ALL OCCURRENCES
-    for pattern in fake_patterns:
-        matches = re.findall(pattern, text)
-        if matches:
-            fake_score += 0.8 * len(matches)  # Each occurrence adds points
-    
-    for pattern in suspicious_patterns:
-        matches = re.findall(pattern, text)
-        if matches:
-            fake_score += 0.7 * len(matches)
-    
-    # Length-based scoring - VERY AGGRESSIVE
-    word_count = len(text.split())
-    if word_count < 5:  # Very short reviews
-        fake_score += 3.0
-    elif word_count < 8:  # Short reviews
-        fake_score += 2.0
-    elif word_count < 12:  # Still quite short
-        fake_score += 1.0
-    elif word_count < 18:  # Somewhat short
-        fake_score += 0.5
-    elif word_count > 300:  # Very long reviews (also suspicious)
-        fake_score += 1.0
-    
-    # MASSIVELY EXPANDED generic phrases
-    generic_phrases = [
-        'good product', 'nice product', 'quality product', 
-        'good quality', 'nice quality', 'recommend this',
-        'great product', 'awesome product', 'excellent product',
-        'good one', 'nice one', 'superb product', 'loved it',
-        'worth buying', 'good buy', 'satisfied', 'happy with purchase',
-        'as expected', 'as described', 'value for money',
-        'must buy', 'best product', 'nice purchase',
-        'satisfied with', 'happy with', 'good purchase',
-        'nice choice', 'good choice', 'perfect product',
-        'awesome quality', 'super product', 'great buy',
-        'nice buy', 'good deal', 'great deal', 'best buy',
-        'worth it', 'totally worth', 'paisa vasool',
-        'loved this', 'love this', 'like it', 'liked it',
-        'satisfied customer', 'happy customer', 'repeat customer',
-        'will recommend', 'highly recommended', 'strongly recommended',
-        'go for it', 'just buy', 'must have',
-        'fast delivery', 'good delivery', 'quick delivery',
-        'nice packaging', 'good packaging', 'proper packaging',
-        'original product', 'genuine product', 'authentic product',
-        'value pack', 'good value', 'great value',
-    ]
-    
-    phrase_count = 0
-    for phrase in generic_phrases:
-        if phrase in text:
-            phrase_count += 1
-            fake_score += 0.6
-    
-    # Multiple generic phrases = super suspicious
-    if phrase_count >= 3:
-        fake_score += 1.5
-    elif phrase_count >= 2:
-        fake_score += 0.8
-    
-    # Excessive punctuation - VERY AGGRESSIVE
-    exclamation_count = text.count('!')
-    if exclamation_count > 5:
-        fake_score += 3.5
-    elif exclamation_count > 3:
-        fake_score += 2.5
-    elif exclamation_count > 2:
-        fake_score += 1.5
-    elif exclamation_count > 0:
-        fake_score += 0.5
-    
-    question_count = text.count('?')
-    if question_count > 2:
-        fake_score += 1.5
-    elif question_count > 0:
-        fake_score += 0.5
-    
-    # All caps words - VERY AGGRESSIVE
-    words = text.split()
-    caps_words = [word for word in words if word.isupper() and len(word) > 2]
-    if len(caps_words) > 4:
-        fake_score += 2.5
-    elif len(caps_words) > 2:
-        fake_score += 1.8
-    elif len(caps_words) > 1:
-        fake_score += 1.0
-    elif len(caps_words) > 0:
-        fake_score += 0.5
+# Common fake review patterns - HIGHLY EXPANDED
+FAKE_PATTERNS = [
+    r'\b(amazing|awesome|perfect|excellent|outstanding|phenomenal|incredible|superb|fantastic|wonderful|brilliant|fabulous|marvelous)\b',
+    r'\b(best|greatest|finest|top|ultimate) (product|item|purchase|buy|thing|deal)\b',
+    r'\bhighly recommend\b',
+    r'\bmust buy\b',
+    r'\b5 stars?\b',
+    r'\bfive stars?\b',
+    r'\bsuper fast delivery\b',
+    r'\bexceeded expectations\b',
+    r'\bmoney well spent\b',
+    r'\bworth every penny\b',
+    r'\bbest purchase ever\b',
+    r'\bvalue for money\b',
+    r'\btotally satisfied\b',
+    r'\b100%\s*(satisfied|genuine|authentic|original|recommended)\b',
+    r'\bgreat quality\b',
+    r'\bgood quality\b',
+    r'\bnice product\b',
+    r'\blove it\b',
+    r'\bloved it\b',
+    r'\bamazing product\b',
+    r'\bawesome product\b',
+    r'\bexcellent product\b',
+]
+
+# Suspicious characteristics - HIGHLY EXPANDED
+SUSPICIOUS_PATTERNS = [
+    r'\b(buy|purchase|get|order) (this|it) (now|today|immediately|right now)\b',
+    r'\bdon\'t (hesitate|wait|think twice)\b',
+    r'\bworthwhile investment\b',
+    r'\bgo for it\b',
+    r'\bjust (buy|get|order) it\b',
+    r'\bno regrets\b',
+    r'\bbest deal\b',
+    r'\btotally worth it\b',
+    r'\bpaisa vasool\b',
+    r'\bbargain price\b',
+    r'\bgood buy\b',
+    r'\bnice buy\b',
+    r'\bworth buying\b',
+    r'\bwill buy again\b',
+    r'\bgo ahead\b',
+    r'\bblindly buy\b',
+    r'\bdon\'t think (twice|much)\b',
+]
+
+FAKE_PATTERN_WEIGHT = 1.0
+SUSPICIOUS_PATTERN_WEIGHT = 0.8
+
+# Generic phrases (often in fake reviews) - MASSIVELY EXPANDED
+GENERIC_PHRASES = [
+    'good product', 'nice product', 'quality product',
+    'good quality', 'nice quality', 'recommend this',
+    'great product', 'awesome product', 'excellent product',
+    'good one', 'nice one', 'superb product', 'loved it',
+    'worth buying', 'good buy', 'satisfied', 'happy with purchase',
+    'as expected', 'as described', 'value for money',
+    'must buy', 'best product', 'nice purchase',
+    'satisfied with', 'happy with', 'good purchase',
+    'nice choice', 'good choice', 'perfect product',
+    'awesome quality', 'super product', 'great buy',
+    'nice buy', 'good deal', 'great deal', 'best buy',
+    'worth it', 'totally worth', 'paisa vasool',
+]
+
+GENERIC_PHRASE_WEIGHT = 0.7
+
+POSITIVE_WORDS = ['good', 'great', 'excellent', 'amazing', 'awesome',
+                  'perfect', 'nice', 'best', 'super', 'fantastic',
+                  'wonderful', 'love', 'loved', 'brilliant']
+
+SPECIFIC_INDICATORS = [
+    'because', 'but', 'however', 'although', 'after', 'before',
+    'when', 'while', 'using', 'used', 'feature', 'features',
+    'quality', 'material', 'size', 'color', 'price', 'delivery',
+    'packaging', 'condition', 'performance', 'day', 'week', 'month',
+    'issue', 'problem', 'like', 'dislike', 'compared', 'better',
+    'worse', 'pros', 'cons', 'advantage', 'disadvantage'
+]
+
+# Common fake review starter phrases
+STARTER_PHRASES = (
+    'nice', 'good', 'great', 'excellent', 'amazing',
+    'awesome', 'best', 'super', 'must buy', 'highly recommend'
+)
+
+# Suspicious emoji/emoticon patterns (if present)
+EMOJI_RE = re.compile(r'[😀😁😂🤣😃😄😅😆😉😊😋😎😍😘🥰😗😙😚]')
+
+# Repetitive patterns (e.g., "good good good")
+REPEAT3_RE = re.compile(r'\b(\w+)\s+\1\s+\1\b')
+REPEAT2_RE = re.compile(r'\b(\w+)\s+\1\b')
+
+# Word runs plus the punctuation the scorer counts - one findall gives both
+TOKEN_RE = re.compile(r'\w+|[.!?]')
+
+# Scores at or above this are labelled Fake
+# MUCH LOWER threshold for aggressive detection
+# Old: >= 3.0, New: >= 2.0
+FAKE_THRESHOLD = 2.0
+
+Rule = namedtuple('Rule', ['pattern', 'regex', 'weight', 'anchors', 'kind'])
+
+
+def _rule_anchors(pattern):
+    """Leading words a pattern can start with - a rule can only match if one of them is in the text"""
+    body = pattern[2:] if pattern.startswith(r'\b') else pattern
+    if body.startswith('('):
+        alternatives = body[1:body.index(')')].split('|')
+    else:
+        alternatives = [body]
+
+    anchors = set()
+    for alternative in alternatives:
+        match = re.match(r'\w+', alternative)
+        rest = alternative[match.end():] if match else ''
+        if not match or rest[:1] in ('?', '*', '+', '{', '[', '('):
+            raise ValueError(f"Cannot derive a leading word for rule: {pattern}")
+        anchors.add(match.group(0))
+    return frozenset(anchors)
+
+
+def compile_ruleset():
+    """Compile the weighted pattern rules and index them by leading word"""
+    rules = []
+    for kind, patterns, weight in (("fake", FAKE_PATTERNS, FAKE_PATTERN_WEIGHT),
+                                   ("suspicious", SUSPICIOUS_PATTERNS, SUSPICIOUS_PATTERN_WEIGHT)):
+        for pattern in patterns:
+            rules.append(Rule(pattern, re.compile(pattern), weight, _rule_anchors(pattern), kind))
+
+    anchor_index = {}
+    for i, rule in enumerate(rules):
+        for anchor in rule.anchors:
+            anchor_index.setdefault(anchor, []).append(i)
+    return rules, anchor_index
+
+
+# Bump when score_features / score_batch_features logic changes, so cached
+# scores from the old logic are never served
+SCORER_REVISION = 1
+
+def ruleset_fingerprint():
+    """Short hash of every list, weight and revision the fake score depends on"""
+    ruleset = {
+        "revision": SCORER_REVISION,
+        "fake_patterns": [FAKE_PATTERNS, FAKE_PATTERN_WEIGHT],
+        "suspicious_patterns": [SUSPICIOUS_PATTERNS, SUSPICIOUS_PATTERN_WEIGHT],
+        "generic_phrases": [GENERIC_PHRASES, GENERIC_PHRASE_WEIGHT],
+        "positive_words": POSITIVE_WORDS,
+        "specific_indicators": SPECIFIC_INDICATORS,
+        "starter_phrases": list(STARTER_PHRASES),
+        "emoji": EMOJI_RE.pattern,
+    }
+    return hashlib.sha1(json.dumps(ruleset, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+RULESET_VERSION = ruleset_fingerprint()
+
+# Parallel scoring: inputs smaller than this are always scored serially,
+# since starting the pool costs more than it saves
+PARALLEL_MIN_REVIEWS = 20000
+DEFAULT_CHUNK_SIZE = 10000
+# Pool workers start from a forkserver (spawn where there is none), never a plain
+# fork: the web process runs threads (gthread workers, the scraping loop, jobs)
+# and a lock one of them holds at fork time would stay locked in the child
+try:
+    POOL_CONTEXT = multiprocessing.get_context("forkserver")
+    POOL_CONTEXT.set_forkserver_preload([__name__])
+except ValueError:
+    POOL_CONTEXT = multiprocessing.get_context("spawn")
+# iter_check_reviews: reviews pulled from the input per scoring step
+STREAM_CHUNK_SIZE = 1000
+
+# Compiled once at import - every scoring call reuses the same matchers
+RULES, RULE_INDEX = compile_ruleset()
+
+# Any leading word of any rule, longest first so alternation picks the whole word
+ANCHOR_RE = re.compile(r'\b(?:' + '|'.join(sorted(RULE_INDEX, key=len, reverse=True)) + r')\b')
+
+
+class PhraseAutomaton:
+    """
+    Aho-Corasick automaton over several literal phrase lists
     
-    # Repetitive words - ENHANCED
-    word_freq = {}
-    for word in words:
-        if len(word) > 3:
-            word_lower = word.lower()
-            word_freq[word_lower] = word_freq.get(word_lower, 0) + 1
-    
-    max_repetition = max(word_freq.values()) if word_freq else 0
-    if max_repetition > 5:
-        fake_score += 2.5
-    elif max_repetition > 3:
-        fake_score += 1.5
-    elif max_repetition > 2:
-        fake_score += 0.8
-    
-    # Too positive without specifics - VERY AGGRESSIVE
-    positive_words = ['good', 'great', 'excellent', 'amazing', 'awesome', 
-                     'perfect', 'nice', 'best', 'super', 'fantastic', 
-                     'wonderful', 'love', 'loved', 'brilliant', 'superb',
-                     'outstanding', 'fabulous', 'happy', 'satisfied', 'glad']
-    positive_count = sum(1 for word in positive_words if word in text)
-    
-    # Aggressive scoring for positive word density
-    if positive_count >= 5 and word_count < 60:
-        fake_score# -*- coding: utf-8 -*-
-import pandas as pd
-import random
-import re
-import string
+    One pass over the text finds every phrase (overlapping matches included)
+    and reports, per list, how many entries occur in the text - the same
+    number as summing `phrase in text` over that list.
+    """
+
+    def __init__(self, phrase_lists, backend=None):
+        if backend is None:
+            backend = "pyahocorasick" if ahocorasick is not None else "python"
+        if backend not in ("pyahocorasick", "python"):
+            raise ValueError(f"Unknown phrase matcher backend: {backend}")
+        if backend == "pyahocorasick" and ahocorasick is None:
+            raise ImportError("pyahocorasick is not installed")
+
+        self.backend = backend
+        self.list_names = list(phrase_lists)
+        self.phrases = []
+        # Lists each unique phrase belongs to (repeated if a list repeats it)
+        self._members = []
+        phrase_ids = {}
+        for name, phrases in phrase_lists.items():
+            for phrase in phrases:
+                if phrase not in phrase_ids:
+                    phrase_ids[phrase] = len(self.phrases)
+                    self.phrases.append(phrase)
+                    self._members.append([])
+                self._members[phrase_ids[phrase]].append(name)
+
+        # (phrases x lists) array: how many times each list contains each phrase
+        self.membership = np.zeros((len(self.phrases), len(self.list_names)), dtype=np.int64)
+        for i, names in enumerate(self._members):
+            for name in names:
+                self.membership[i, self.list_names.index(name)] += 1
+
+        if backend == "pyahocorasick":
+            self._automaton = ahocorasick.Automaton()
+            for i, phrase in enumerate(self.phrases):
+                self._automaton.add_word(phrase, i)
+            self._automaton.make_automaton()
+        else:
+            self._build_dfa()
+
+    def _build_dfa(self):
+        """Build the trie, failure links and a full transition table per state"""
+        goto = [{}]
+        outputs = [[]]
+        for i, phrase in enumerate(self.phrases):
+            state = 0
+            for ch in phrase:
+                if ch not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            outputs[state].append(i)
+
+        # Breadth-first so every failure target is finished before it is used
+        fail = [0] * len(goto)
+        transitions = [None] * len(goto)
+        transitions[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            transitions[state] = dict(transitions[fail[state]])
+            transitions[state].update(goto[state])
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for ch, child in goto[state].items():
+                fail[child] = transitions[fail[state]].get(ch, 0) if state else 0
+                queue.append(child)
+
+        self._transitions = transitions
+        self._outputs = [tuple(ids) for ids in outputs]
+
+    def find(self, text):
+        """Ids (indexes into self.phrases) of every phrase occurring in text"""
+        if self.backend == "pyahocorasick":
+            return {i for _, i in self._automaton.iter(text)} if text else set()
+
+        found = set()
+        transitions = self._transitions
+        outputs = self._outputs
+        state = 0
+        for ch in text:
+            state = transitions[state].get(ch, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+    def iter_matches(self, text):
+        """Yield (end_index, phrase_id) for every occurrence, overlapping ones included"""
+        if self.backend == "pyahocorasick":
+            if text:
+                yield from self._automaton.iter(text)
+            return
+
+        transitions = self._transitions
+        outputs = self._outputs
+        state = 0
+        for end, ch in enumerate(text):
+            state = transitions[state].get(ch, 0)
+            for i in outputs[state]:
+                yield end, i
+
+    def count(self, text):
+        """Number of entries from each phrase list that occur in text"""
+        counts = dict.fromkeys(self.list_names, 0)
+        for i in self.find(text):
+            for name in self._members[i]:
+                counts[name] += 1
+        return counts
+
+
+# Literal phrase lists share one automaton - cost per review stays flat as they grow
+PHRASE_AUTOMATON = PhraseAutomaton({
+    "generic": GENERIC_PHRASES,
+    "positive": POSITIVE_WORDS,
+    "specific": SPECIFIC_INDICATORS,
+})
+
 
 def preprocess_text(text):
     """Clean and preprocess review text"""
@@ -266,71 +334,60 @@ def preprocess_text(text):
     text = re.sub(r'[^\w\s.,!?-]', '', text)
     return text
 
-def calculate_fake_score(review_text):
-    """Calculate likelihood of review being fake based on patterns - AGGRESSIVE MODE"""
+def extract_features(review_text):
+    """
+    Single scan over the normalized review text
+    
+    Returns:
+        dict: rule hit counts (by rule index) plus the word, phrase
+        and punctuation counts calculate_fake_score is built from
+    """
     text = preprocess_text(review_text)
+    tokens = Counter(TOKEN_RE.findall(text))
+
+    # Only rules whose leading word occurs in the text can match
+    candidates = set()
+    for token in tokens.keys() & RULE_INDEX.keys():
+        candidates.update(RULE_INDEX[token])
+
+    rule_hits = {}
+    for i in sorted(candidates):
+        count = len(RULES[i].regex.findall(text))
+        if count:
+            rule_hits[i] = count
+
+    phrase_counts = PHRASE_AUTOMATON.count(text)
+
+    words = text.split()
+    word_freq = Counter(word.lower() for word in words if len(word) > 3)
+
+    return {
+        "rule_hits": rule_hits,
+        "char_count": len(text),
+        "word_count": len(words),
+        "caps_count": sum(1 for word in words if word.isupper() and len(word) > 2),
+        "max_repetition": max(word_freq.values()) if word_freq else 0,
+        "phrase_count": phrase_counts["generic"],
+        "positive_count": phrase_counts["positive"],
+        "specifics_count": phrase_counts["specific"],
+        "exclamation_count": tokens['!'],
+        "question_count": tokens['?'],
+        "sentence_count": tokens['.'] + tokens['!'] + tokens['?'],
+        "emoji_count": len(EMOJI_RE.findall(review_text)),
+        "starter_phrase": text.startswith(STARTER_PHRASES),
+        "repeat_run": 3 if REPEAT3_RE.search(text) else 2 if REPEAT2_RE.search(text) else 0,
+    }
+
+def score_features(features):
+    """Turn extract_features output into the fake score - AGGRESSIVE MODE"""
     fake_score = 0
     
-    # Common fake review patterns - HIGHLY EXPANDED
-    fake_patterns = [
-        r'\b(amazing|awesome|perfect|excellent|outstanding|phenomenal|incredible|superb|fantastic|wonderful|brilliant|fabulous|marvelous)\b',
-        r'\b(best|greatest|finest|top|ultimate) (product|item|purchase|buy|thing|deal)\b',
-        r'\bhighly recommend\b',
-        r'\bmust buy\b',
-        r'\b5 stars?\b',
-        r'\bfive stars?\b',
-        r'\bsuper fast delivery\b',
-        r'\bexceeded expectations\b',
-        r'\bmoney well spent\b',
-        r'\bworth every penny\b',
-        r'\bbest purchase ever\b',
-        r'\bvalue for money\b',
-        r'\btotally satisfied\b',
-        r'\b100%\s*(satisfied|genuine|authentic|original|recommended)\b',
-        r'\bgreat quality\b',
-        r'\bgood quality\b',
-        r'\bnice product\b',
-        r'\blove it\b',
-        r'\bloved it\b',
-        r'\bamazing product\b',
-        r'\bawesome product\b',
-        r'\bexcellent product\b',
-    ]
-    
-    # Suspicious characteristics - HIGHLY EXPANDED
-    suspicious_patterns = [
-        r'\b(buy|purchase|get|order) (this|it) (now|today|immediately|right now)\b',
-        r'\bdon\'t (hesitate|wait|think twice)\b',
-        r'\bworthwhile investment\b',
-        r'\bgo for it\b',
-        r'\bjust (buy|get|order) it\b',
-        r'\bno regrets\b',
-        r'\bbest deal\b',
-        r'\btotally worth it\b',
-        r'\bpaisa vasool\b',
-        r'\bbargain price\b',
-        r'\bgood buy\b',
-        r'\bnice buy\b',
-        r'\bworth buying\b',
-        r'\bwill buy again\b',
-        r'\bgo ahead\b',
-        r'\bblindly buy\b',
-        r'\bdon\'t think (twice|much)\b',
-    ]
-    
-    # Check for fake patterns - INCREASED scoring
-    for pattern in fake_patterns:
-        matches = re.findall(pattern, text)
-        if matches:
-            fake_score += 1.0 * len(matches)  # Count multiple occurrences
-    
-    for pattern in suspicious_patterns:
-        matches = re.findall(pattern, text)
-        if matches:
-            fake_score += 0.8 * len(matches)
+    # Pattern rules - each occurrence counts, in rule order
+    for i, count in features["rule_hits"].items():
+        fake_score += RULES[i].weight * count
     
     # Length-based scoring - MORE AGGRESSIVE
-    word_count = len(text.split())
+    word_count = features["word_count"]
     if word_count < 5:  # Very short reviews
         fake_score += 2.5
     elif word_count < 10:  # Short reviews
@@ -340,28 +397,12 @@ def calculate_fake_score(review_text):
     elif word_count > 300:  # Very long reviews (also suspicious)
         fake_score += 1.0
     
-    # Generic phrases (often in fake reviews) - MASSIVELY EXPANDED
-    generic_phrases = [
-        'good product', 'nice product', 'quality product', 
-        'good quality', 'nice quality', 'recommend this',
-        'great product', 'awesome product', 'excellent product',
-        'good one', 'nice one', 'superb product', 'loved it',
-        'worth buying', 'good buy', 'satisfied', 'happy with purchase',
-        'as expected', 'as described', 'value for money',
-        'must buy', 'best product', 'nice purchase',
-        'satisfied with', 'happy with', 'good purchase',
-        'nice choice', 'good choice', 'perfect product',
-        'awesome quality', 'super product', 'great buy',
-        'nice buy', 'good deal', 'great deal', 'best buy',
-        'worth it', 'totally worth', 'paisa vasool',
-    ]
-    
-    for phrase in generic_phrases:
-        if phrase in text:
-            fake_score += 0.7
+    # Generic phrases - added one at a time to keep the float sum stable
+    for _ in range(features["phrase_count"]):
+        fake_score += GENERIC_PHRASE_WEIGHT
     
     # Excessive punctuation - MORE AGGRESSIVE
-    exclamation_count = text.count('!')
+    exclamation_count = features["exclamation_count"]
     if exclamation_count > 5:
         fake_score += 3.0
     elif exclamation_count > 3:
@@ -369,40 +410,27 @@ def calculate_fake_score(review_text):
     elif exclamation_count > 1:
         fake_score += 1.0
     
-    question_count = text.count('?')
-    if question_count > 2:
+    if features["question_count"] > 2:
         fake_score += 1.0
     
     # All caps words (excitement indicators) - MORE AGGRESSIVE
-    words = text.split()
-    caps_words = [word for word in words if word.isupper() and len(word) > 2]
-    if len(caps_words) > 4:
+    caps_count = features["caps_count"]
+    if caps_count > 4:
         fake_score += 2.0
-    elif len(caps_words) > 2:
+    elif caps_count > 2:
         fake_score += 1.5
-    elif len(caps_words) > 0:
+    elif caps_count > 0:
         fake_score += 0.5
     
     # Repetitive words - ENHANCED
-    word_freq = {}
-    for word in words:
-        if len(word) > 3:
-            word_lower = word.lower()
-            word_freq[word_lower] = word_freq.get(word_lower, 0) + 1
-    
-    max_repetition = max(word_freq.values()) if word_freq else 0
+    max_repetition = features["max_repetition"]
     if max_repetition > 4:
         fake_score += 2.0
     elif max_repetition > 2:
         fake_score += 1.0
     
-    # Too positive without specifics - ENHANCED
-    positive_words = ['good', 'great', 'excellent', 'amazing', 'awesome', 
-                     'perfect', 'nice', 'best', 'super', 'fantastic', 
-                     'wonderful', 'love', 'loved', 'brilliant']
-    positive_count = sum(1 for word in positive_words if word in text)
-    
     # If many positive words but short review = likely fake
+    positive_count = features["positive_count"]
     if positive_count >= 4 and word_count < 50:
         fake_score += 2.5
     elif positive_count >= 3 and word_count < 30:
@@ -411,24 +439,13 @@ def calculate_fake_score(review_text):
         fake_score += 1.5
     
     # No specific details - ENHANCED
-    specific_indicators = [
-        'because', 'but', 'however', 'although', 'after', 'before',
-        'when', 'while', 'using', 'used', 'feature', 'features',
-        'quality', 'material', 'size', 'color', 'price', 'delivery',
-        'packaging', 'condition', 'performance', 'day', 'week', 'month',
-        'issue', 'problem', 'like', 'dislike', 'compared', 'better',
-        'worse', 'pros', 'cons', 'advantage', 'disadvantage'
-    ]
-    has_specifics = sum(1 for indicator in specific_indicators if indicator in text)
-    
+    has_specifics = features["specifics_count"]
     if has_specifics == 0 and word_count > 10:
         fake_score += 2.0
     elif has_specifics <= 1 and word_count > 15:
         fake_score += 1.0
     
-    # Suspicious emoji/emoticon patterns (if present)
-    emoji_pattern = r'[😀😁😂🤣😃😄😅😆😉😊😋😎😍😘🥰😗😙😚]'
-    emoji_count = len(re.findall(emoji_pattern, review_text))
+    emoji_count = features["emoji_count"]
     if emoji_count > 3:
         fake_score += 1.5
     elif emoji_count > 1:
@@ -442,97 +459,425 @@ def calculate_fake_score(review_text):
         fake_score += 1.0
     
     # Single sentence reviews (often fake)
-    sentence_count = text.count('.') + text.count('!') + text.count('?')
-    if sentence_count <= 1 and word_count > 5:
+    if features["sentence_count"] <= 1 and word_count > 5:
         fake_score += 1.0
     
-    # Common fake review starter phrases
-    starter_phrases = [
-        text.startswith(phrase) for phrase in [
-            'nice', 'good', 'great', 'excellent', 'amazing',
-            'awesome', 'best', 'super', 'must buy', 'highly recommend'
-        ]
-    ]
-    if any(starter_phrases):
+    if features["starter_phrase"]:
         fake_score += 1.0
     
     # Repetitive patterns (e.g., "good good good")
-    if re.search(r'\b(\w+)\s+\1\s+\1\b', text):
+    if features["repeat_run"] == 3:
         fake_score += 2.0
-    elif re.search(r'\b(\w+)\s+\1\b', text):
+    elif features["repeat_run"] == 2:
         fake_score += 1.0
     
     return fake_score
 
+def calculate_fake_score(review_text):
+    """Calculate likelihood of review being fake based on patterns - AGGRESSIVE MODE"""
+    return score_features(extract_features(review_text))
+
+def label_from_score(fake_score):
+    """Map a fake score to the "Fake" / "Original" label"""
+    if fake_score >= FAKE_THRESHOLD:
+        return "Fake"
+    else:
+        return "Original"
+
+def feature_columns(features):
+    """Flatten extract_features output into scalar columns for a results row"""
+    columns = {key: value for key, value in features.items() if key != "rule_hits"}
+    columns["fake_pattern_hits"] = 0
+    columns["suspicious_pattern_hits"] = 0
+    for i, count in features["rule_hits"].items():
+        columns[f"{RULES[i].kind}_pattern_hits"] += count
+    return columns
+
+def score_review(review_text):
+    """
+    Score a review once
+    
+    Returns:
+        tuple: (fake_score, prediction, features)
+    """
+    features = extract_features(review_text)
+    fake_score = score_features(features)
+    return fake_score, label_from_score(fake_score), features
+
 def detect_fake_review(review_text):
     """
     Determine if a review is fake or original - VERY AGGRESSIVE MODE
     Replace this logic with your trained ML model
     """
-    fake_score = calculate_fake_score(review_text)
+    return label_from_score(calculate_fake_score(review_text))
+
+def _as_text_series(reviews):
+    """Object-dtype Series with a fresh positional index, so .str uses Python's re"""
+    return pd.Series(list(reviews), dtype=object)
+
+def preprocess_series(reviews):
+    """Column-wise preprocess_text over a Series or list of reviews"""
+    texts = _as_text_series(reviews)
+    present = texts.notna() & texts.astype(bool)
+    texts = texts.where(present, "").map(str).str.lower()
+    # Remove extra whitespace
+    texts = texts.str.replace(r'\s+', ' ', regex=True).str.strip()
+    # Remove special characters but keep basic punctuation
+    return texts.str.replace(r'[^\w\s.,!?-]', '', regex=True)
+
+class _JoinedBatch:
+    """
+    A batch of texts joined into one string with a separator no pattern can
+    match across, so each regex / automaton runs once over the whole batch
+    and hits are mapped back to rows by offset
+    """
+
+    SEPARATOR = '\x00'
+
+    def __init__(self, texts):
+        texts = list(texts)
+        lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+        self.size = len(texts)
+        self.starts = np.cumsum(lengths + 1) - (lengths + 1)
+        self.text = self.SEPARATOR.join(texts) + self.SEPARATOR
+
+    def rows(self, positions):
+        """Row number for each character position"""
+        return np.searchsorted(self.starts, np.asarray(positions, dtype=np.int64), side='right') - 1
+
+    def count(self, regex):
+        """Non-overlapping matches of regex per row - same as len(regex.findall(row))"""
+        positions = [match.start() for match in regex.finditer(self.text)]
+        return np.bincount(self.rows(positions), minlength=self.size)
+
+    def contains(self, regex):
+        """Whether regex matches anywhere in each row"""
+        return self.count(regex) > 0
+
+    def codepoints(self):
+        """The joined text as an array of code points, aligned with string indexes"""
+        return np.frombuffer(self.text.encode('utf-32-le'), dtype='<u4')
+
+    def per_row_sum(self, values):
+        """Sum a per-character array over each row (rows are never empty - each ends with the separator)"""
+        if not self.size:
+            return np.zeros(0, dtype=np.int64)
+        return np.add.reduceat(values.astype(np.int64), self.starts)
+
+
+def _batch_rule_hits(batch):
+    """
+    (reviews x rules) hit-count matrix
     
-    # MUCH LOWER threshold for aggressive detection
-    # Old: >= 3.0, New: >= 2.0
-    if fake_score >= 2.0:
-        return "Fake"
+    Rules are only tried where one of their leading words starts, and a rule
+    resumes after its previous match - the same non-overlapping count as
+    re.findall per review.
+    """
+    text = batch.text
+    last_end = [0] * len(RULES)
+    positions = []
+    rule_ids = []
+    for anchor in ANCHOR_RE.finditer(text):
+        start = anchor.start()
+        for i in RULE_INDEX[anchor.group()]:
+            if start < last_end[i]:
+                continue
+            match = RULES[i].regex.match(text, start)
+            if match:
+                last_end[i] = match.end()
+                positions.append(start)
+                rule_ids.append(i)
+
+    hits = np.zeros((batch.size, len(RULES)), dtype=np.int64)
+    np.add.at(hits, (batch.rows(positions), np.asarray(rule_ids, dtype=np.int64)), 1)
+    return hits
+
+def _batch_word_stats(texts, batch):
+    """Word count, all-caps word count and max word repetition per review"""
+    n = batch.size
+    chars = batch.codepoints()
+    # Preprocessed text only has ' ' as whitespace; a word starts after a space or a separator
+    in_word = (chars != ord(' ')) & (chars != 0)
+    word_start = in_word & ~np.concatenate(([False], in_word[:-1]))
+    word_count = batch.per_row_sum(word_start)
+
+    words = texts.str.split().explode().dropna()
+    lengths = words.str.len()
+
+    caps = (words.str.isupper() & (lengths > 2)).groupby(level=0).sum()
+    caps_count = caps.reindex(range(n), fill_value=0).to_numpy()
+
+    long_words = words[lengths > 3].str.lower()
+    if long_words.empty:
+        max_repetition = np.zeros(n, dtype=np.int64)
     else:
-        return "Original"
+        frequency = long_words.groupby([long_words.index, long_words.to_numpy()]).size()
+        max_repetition = frequency.groupby(level=0).max().reindex(range(n), fill_value=0).to_numpy()
 
-def check_reviews(reviews):
+    return word_count, caps_count, max_repetition
+
+def _batch_phrase_counts(batch):
+    """Per-list phrase counts for every row from one automaton pass over the batch"""
+    names = PHRASE_AUTOMATON.list_names
+    counts = np.zeros((batch.size, len(names)), dtype=np.int64)
+    matches = list(PHRASE_AUTOMATON.iter_matches(batch.text))
+    if matches:
+        ends, phrase_ids = np.array(matches, dtype=np.int64).T
+        # Presence, not occurrences: keep one hit per (row, phrase)
+        n_phrases = len(PHRASE_AUTOMATON.phrases)
+        keys = np.unique(batch.rows(ends) * n_phrases + phrase_ids)
+        np.add.at(counts, keys // n_phrases, PHRASE_AUTOMATON.membership[keys % n_phrases])
+    return {name: counts[:, j] for j, name in enumerate(names)}
+
+# Batch feature matrix layout: one hit-count column per rule, then the per-review counts
+COUNT_FEATURES = [
+    "char_count", "word_count", "caps_count", "max_repetition",
+    "phrase_count", "positive_count", "specifics_count",
+    "exclamation_count", "question_count", "sentence_count",
+    "emoji_count", "starter_phrase", "repeat_run",
+]
+FEATURE_NAMES = [f"rule_{i}" for i in range(len(RULES))] + COUNT_FEATURES
+
+# Extra columns derived for models on top of the raw counts
+RATIO_FEATURES = ["positive_ratio", "specifics_ratio", "exclamation_ratio", "avg_word_length"]
+
+
+class FeatureMatrix:
     """
-    Process list of reviews and return DataFrame with predictions
+    Array-backed (reviews x features) matrix shared by the heuristic scorer
+    and trained models, so a batch is only featurized once
     
-    Args:
-        reviews (list): List of review texts
+    Every column is an integer count, stored as int32. Indexing by name
+    returns a column; features["rule_hits"] returns the (reviews x rules) block.
+    """
+
+    def __init__(self, values):
+        self.values = values
+        self.columns = FEATURE_NAMES
+        self._index = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+    def __len__(self):
+        return self.values.shape[0]
+
+    def __getitem__(self, name):
+        if name == "rule_hits":
+            return self.values[:, :len(RULES)]
+        return self.values[:, self._index[name]]
+
+    def keys(self):
+        return ["rule_hits"] + COUNT_FEATURES
+
+    def model_input(self):
+        """float32 matrix of every count column plus RATIO_FEATURES, for trained models"""
+        word_count = self["word_count"]
+        has_words = word_count > 0
+
+        def per_word(column):
+            return np.divide(self[column], word_count, out=np.zeros(len(self)), where=has_words)
+
+        ratios = np.column_stack([
+            per_word("positive_count"),
+            per_word("specifics_count"),
+            per_word("exclamation_count"),
+            per_word("char_count"),
+        ])
+        return np.hstack([self.values, ratios]).astype(np.float32)
+
+    def to_frame(self):
+        return pd.DataFrame(self.values, columns=self.columns)
+
+
+def extract_batch_features(reviews):
+    """
+    Column-wise extract_features over many reviews
     
     Returns:
-        pd.DataFrame: DataFrame with 'review' and 'prediction' columns
+        FeatureMatrix: one row per review, in input order
     """
-    if not reviews:
-        return pd.DataFrame(columns=['review', 'prediction'])
-    
-    data = []
-    processed_count = 0
-    fake_count = 0
-    original_count = 0
+    raw = _as_text_series(reviews)
+    texts = preprocess_series(raw)
+    batch = _JoinedBatch(texts)
+    values = np.zeros((batch.size, len(FEATURE_NAMES)), dtype=np.int32)
+    column = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+    values[:, :len(RULES)] = _batch_rule_hits(batch)
+
+    word_count, caps_count, max_repetition = _batch_word_stats(texts, batch)
+    values[:, column["char_count"]] = np.diff(np.append(batch.starts, len(batch.text))) - 1
+    values[:, column["word_count"]] = word_count
+    values[:, column["caps_count"]] = caps_count
+    values[:, column["max_repetition"]] = max_repetition
+
+    phrase_counts = _batch_phrase_counts(batch)
+    values[:, column["phrase_count"]] = phrase_counts["generic"]
+    values[:, column["positive_count"]] = phrase_counts["positive"]
+    values[:, column["specifics_count"]] = phrase_counts["specific"]
+
+    chars = batch.codepoints()
+    exclamation_count = batch.per_row_sum(chars == ord('!'))
+    question_count = batch.per_row_sum(chars == ord('?'))
+    values[:, column["exclamation_count"]] = exclamation_count
+    values[:, column["question_count"]] = question_count
+    values[:, column["sentence_count"]] = batch.per_row_sum(chars == ord('.')) + exclamation_count + question_count
+
+    values[:, column["emoji_count"]] = _JoinedBatch(raw.map(str)).count(EMOJI_RE)
+    values[:, column["starter_phrase"]] = texts.str.startswith(STARTER_PHRASES).to_numpy()
+
+    repeat3 = batch.contains(REPEAT3_RE)
+    repeat2 = batch.contains(REPEAT2_RE)
+    values[:, column["repeat_run"]] = np.where(repeat3, 3, np.where(repeat2, 2, 0))
+
+    return FeatureMatrix(values)
+
+def score_batch_features(features):
+    """Vectorized score_features over a FeatureMatrix - same thresholds, same order of additions"""
+    word_count = features["word_count"]
+    fake_score = np.zeros(len(word_count))
+
+    for i, rule in enumerate(RULES):
+        fake_score += rule.weight * features["rule_hits"][:, i]
+
+    fake_score += np.select(
+        [word_count < 5, word_count < 10, word_count < 15, word_count > 300],
+        [2.5, 1.5, 0.5, 1.0], 0.0)
+
+    # One addition per matched phrase, as in the per-review loop
+    phrase_count = features["phrase_count"]
+    for k in range(1, phrase_count.max(initial=0) + 1):
+        fake_score += np.where(phrase_count >= k, GENERIC_PHRASE_WEIGHT, 0.0)
+
+    exclamation_count = features["exclamation_count"]
+    fake_score += np.select(
+        [exclamation_count > 5, exclamation_count > 3, exclamation_count > 1],
+        [3.0, 2.0, 1.0], 0.0)
+    fake_score += np.where(features["question_count"] > 2, 1.0, 0.0)
+
+    caps_count = features["caps_count"]
+    fake_score += np.select([caps_count > 4, caps_count > 2, caps_count > 0], [2.0, 1.5, 0.5], 0.0)
+
+    max_repetition = features["max_repetition"]
+    fake_score += np.select([max_repetition > 4, max_repetition > 2], [2.0, 1.0], 0.0)
+
+    positive_count = features["positive_count"]
+    fake_score += np.select(
+        [(positive_count >= 4) & (word_count < 50),
+         (positive_count >= 3) & (word_count < 30),
+         (positive_count >= 2) & (word_count < 20)],
+        [2.5, 2.0, 1.5], 0.0)
+
+    has_specifics = features["specifics_count"]
+    fake_score += np.select(
+        [(has_specifics == 0) & (word_count > 10), (has_specifics <= 1) & (word_count > 15)],
+        [2.0, 1.0], 0.0)
+
+    emoji_count = features["emoji_count"]
+    fake_score += np.select([emoji_count > 3, emoji_count > 1], [1.5, 0.5], 0.0)
+
+    positive_ratio = np.divide(positive_count, word_count,
+                               out=np.zeros(len(word_count)), where=word_count > 0)
+    fake_score += np.select([positive_ratio > 0.3, positive_ratio > 0.2], [1.5, 1.0], 0.0)
+
+    fake_score += np.where((features["sentence_count"] <= 1) & (word_count > 5), 1.0, 0.0)
+    fake_score += np.where(features["starter_phrase"], 1.0, 0.0)
+    fake_score += np.select([features["repeat_run"] == 3, features["repeat_run"] == 2], [2.0, 1.0], 0.0)
+
+    return fake_score
+
+def labels_from_scores(scores):
+    """Vectorized label_from_score"""
+    return np.where(scores >= FAKE_THRESHOLD, "Fake", "Original")
+
+def batch_feature_columns(features):
+    """Vectorized feature_columns over a FeatureMatrix"""
+    columns = {key: features[key] for key in COUNT_FEATURES}
+    columns["starter_phrase"] = columns["starter_phrase"].astype(bool)
+    for kind in ("fake", "suspicious"):
+        mask = np.array([rule.kind == kind for rule in RULES])
+        columns[f"{kind}_pattern_hits"] = features["rule_hits"][:, mask].sum(axis=1)
+    return columns
+
+def score_batch(reviews):
+    """
+    Score a pandas Series (or list) of reviews column-wise
     
-    # Score distribution tracking
-    score_distribution = []
+    Returns:
+        tuple: (scores, labels) as NumPy arrays aligned with the input
+    """
+    scores = score_batch_features(extract_batch_features(reviews))
+    return scores, labels_from_scores(scores)
+
+def clean_review_series(reviews):
+    """Stripped review texts, dropping empty and very short (< 10 chars) ones"""
+    texts = _as_text_series(reviews)
+    texts = texts[texts.astype(bool)].map(str).str.strip()
+    # Skip very short reviews
+    return texts[texts.str.len() >= 10].reset_index(drop=True)
+
+class ReviewStatistics:
+    """
+    Running detection summary, updated one results chunk at a time
     
-    for review in reviews:
-        if review and len(str(review).strip()) > 0:
-            review_text = str(review).strip()
-            
-            # Skip very short reviews
-            if len(review_text) < 10:
-                continue
-                
-            # Calculate score for debugging
-            score = calculate_fake_score(review_text)
-            score_distribution.append(score)
-            
-            # Detect fake vs original
-            prediction = detect_fake_review(review_text)
-            
-            # Count predictions
-            if prediction == "Fake":
-                fake_count += 1
-            else:
-                original_count += 1
-            
-            data.append({
-                "review": review_text,
-                "prediction": prediction
-            })
-            
-            processed_count += 1
-    
-    # Calculate statistics
-    if score_distribution:
-        avg_score = sum(score_distribution) / len(score_distribution)
-        max_score = max(score_distribution)
-        min_score = min(score_distribution)
-        
+    Only counters and the first few sample rows are kept, so it can follow
+    a stream of any length.
+    """
+
+    SAMPLE_SIZE = 5
+
+    def __init__(self):
+        self.processed_count = 0
+        self.fake_count = 0
+        self.score_sum = 0.0
+        self.highest_score = None
+        self.lowest_score = None
+        self.samples = []
+
+    @property
+    def original_count(self):
+        return self.processed_count - self.fake_count
+
+    @property
+    def average_score(self):
+        return self.score_sum / self.processed_count if self.processed_count else 0.0
+
+    def update(self, results):
+        """Add a results DataFrame (review, prediction, score) to the totals"""
+        if results.empty:
+            return
+        scores = results["score"]
+        self.processed_count += len(results)
+        self.fake_count += int((results["prediction"] == "Fake").sum())
+        self.score_sum += float(scores.sum())
+        high, low = float(scores.max()), float(scores.min())
+        self.highest_score = high if self.highest_score is None else max(self.highest_score, high)
+        self.lowest_score = low if self.lowest_score is None else min(self.lowest_score, low)
+        if len(self.samples) < self.SAMPLE_SIZE:
+            needed = self.SAMPLE_SIZE - len(self.samples)
+            self.samples.extend(results[["review", "prediction", "score"]].head(needed).itertuples(index=False))
+
+    def prediction_counts(self):
+        """Reviews per label, largest first (like results["prediction"].value_counts())"""
+        counts = sorted((("Fake", self.fake_count), ("Original", self.original_count)), key=lambda item: -item[1])
+        return {label: count for label, count in counts if count}
+
+    def to_dict(self):
+        return {
+            "total_processed": self.processed_count,
+            "fake_count": self.fake_count,
+            "original_count": self.original_count,
+            "average_score": self.average_score,
+            "highest_score": self.highest_score,
+            "lowest_score": self.lowest_score,
+        }
+
+    def print(self):
+        """Print the detection summary"""
+        if not self.processed_count:
+            return
+
+        processed_count = self.processed_count
+        fake_count = self.fake_count
+        original_count = self.original_count
+
         print(f"\n{'='*60}")
         print(f"FAKE DETECTION STATISTICS")
         print(f"{'='*60}")
@@ -540,46 +885,645 @@ def check_reviews(reviews):
         print(f"Fake Reviews Found: {fake_count} ({(fake_count/processed_count*100):.1f}%)")
         print(f"Original Reviews Found: {original_count} ({(original_count/processed_count*100):.1f}%)")
         print(f"\nScore Statistics:")
-        print(f"  Average Score: {avg_score:.2f}")
-        print(f"  Highest Score: {max_score:.2f}")
-        print(f"  Lowest Score: {min_score:.2f}")
-        print(f"  Detection Threshold: 2.0 (scores >= 2.0 = Fake)")
+        print(f"  Average Score: {self.average_score:.2f}")
+        print(f"  Highest Score: {self.highest_score:.2f}")
+        print(f"  Lowest Score: {self.lowest_score:.2f}")
+        print(f"  Detection Threshold: {FAKE_THRESHOLD} (scores >= {FAKE_THRESHOLD} = Fake)")
         print(f"{'='*60}\n")
         
         # Show sample classifications
         print("Sample Classifications:")
-        for i, (review, score, pred) in enumerate(zip(reviews[:5], score_distribution[:5], 
-                                                        [d['prediction'] for d in data[:5]])):
-            print(f"\n{i+1}. Score: {score:.2f} → {pred}")
-            print(f"   Review: {str(review)[:80]}...")
+        for i, row in enumerate(self.samples):
+            print(f"\n{i+1}. Score: {row.score:.2f} → {row.prediction}")
+            print(f"   Review: {row.review[:80]}...")
         print(f"{'='*60}\n")
+
+def print_statistics(results):
+    """Print the detection summary for a check_reviews results DataFrame"""
+    stats = ReviewStatistics()
+    stats.update(results)
+    stats.print()
+
+class ScoreCache:
+    """
+    Bounded LRU cache of fake scores keyed by score_cache_keys fingerprints
+    
+    With a path, scores are also kept in a SQLite file shared by every
+    process, so repeated texts survive restarts and are shared across
+    gunicorn workers. The disk tier is trimmed oldest-write-first.
+    """
+
+    def __init__(self, maxsize=100000, path=None, disk_maxsize=1000000):
+        self.maxsize = maxsize
+        self.path = path
+        self.disk_maxsize = disk_maxsize
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        self._connection_pid = None
+
+    def _disk(self):
+        """SQLite connection for this process (connections must not cross a fork)"""
+        if not self.path:
+            return None
+        if self._connection is None or self._connection_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS scores (key BLOB PRIMARY KEY, score REAL)")
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def get_many(self, keys):
+        """Cached scores for the given keys; keys that are not cached are left out"""
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+
+            missing = [key for key in keys if key not in found]
+            if missing and self.path:
+                try:
+                    disk = self._disk()
+                    for i in range(0, len(missing), 500):
+                        part = missing[i:i + 500]
+                        rows = disk.execute(
+                            f"SELECT key, score FROM scores WHERE key IN ({','.join('?' * len(part))})", part
+                        ).fetchall()
+                        for key, score in rows:
+                            found[bytes(key)] = score
+                            self._remember(bytes(key), score)
+                            self.disk_hits += 1
+                except sqlite3.Error as e:
+                    print(f"Score cache disk read failed: {e}")
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def _remember(self, key, score):
+        self._entries[key] = score
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def put_many(self, items):
+        """Store (key, score) pairs"""
+        items = [(key, float(score)) for key, score in items]
+        with self._lock:
+            for key, score in items:
+                self._remember(key, score)
+            if items and self.path:
+                try:
+                    disk = self._disk()
+                    with disk:
+                        disk.executemany("INSERT OR REPLACE INTO scores (key, score) VALUES (?, ?)", items)
+                        excess = disk.execute("SELECT COUNT(*) FROM scores").fetchone()[0] - self.disk_maxsize
+                        if excess > 0:
+                            disk.execute(
+                                "DELETE FROM scores WHERE rowid IN (SELECT rowid FROM scores ORDER BY rowid LIMIT ?)",
+                                (excess,)
+                            )
+                except sqlite3.Error as e:
+                    print(f"Score cache disk write failed: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.disk_hits = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ruleset_version": RULESET_VERSION,
+        }
+
+
+# Process-wide score cache (SCORE_CACHE_SIZE=0 disables it)
+SCORE_CACHE_SIZE = int(os.getenv("SCORE_CACHE_SIZE", "100000"))
+SCORE_CACHE = ScoreCache(SCORE_CACHE_SIZE, path=os.getenv("SCORE_CACHE_PATH") or None) if SCORE_CACHE_SIZE > 0 else None
+
+def score_cache_keys(texts, normalized=None):
+    """
+    Cache key per review: a hash of the preprocess_text output, the emoji
+    count (emojis are scored from the raw text but stripped by
+    preprocessing) and RULESET_VERSION
+    """
+    if normalized is None:
+        normalized = preprocess_series(texts)
+    emoji_counts = _JoinedBatch(_as_text_series(texts).map(str)).count(EMOJI_RE)
+    prefix = f"{RULESET_VERSION}\x00"
+    return [
+        hashlib.blake2b(f"{prefix}{emoji}\x00{text}".encode("utf-8"), digest_size=16).digest()
+        for text, emoji in zip(normalized, emoji_counts)
+    ]
+
+def _score_chunk(texts, include_features=False):
+    """Score one chunk of cleaned reviews into a results DataFrame (runs in pool workers too)"""
+    features = extract_batch_features(texts)
+    scores = score_batch_features(features)
+    
+    results = pd.DataFrame({
+        "review": np.asarray(texts, dtype=object),
+        "prediction": labels_from_scores(scores),
+        "score": scores
+    })
+    if include_features:
+        for column, values in batch_feature_columns(features).items():
+            results[column] = values
+    return results
+
+def _score_parallel(texts, include_features, workers, chunk_size):
+    """Score chunks across a process pool and stitch them back in input order"""
+    chunks = [texts.iloc[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    workers = min(workers, len(chunks))
+    print(f"Scoring {len(texts)} reviews in {len(chunks)} chunks on {workers} worker processes")
+    
+    with ProcessPoolExecutor(max_workers=workers, mp_context=POOL_CONTEXT) as pool:
+        # map yields results in submission order, whatever order chunks finish in
+        parts = list(pool.map(_score_chunk, chunks, repeat(include_features)))
+    return pd.concat(parts, ignore_index=True)
+
+def _score_texts(texts, include_features, workers, chunk_size):
+    """Score cleaned reviews, in parallel chunks when it pays off"""
+    # Score whole chunks at once - the label is derived from the same score
+    if workers > 1 and len(texts) >= PARALLEL_MIN_REVIEWS and len(texts) > chunk_size:
+        try:
+            return _score_parallel(texts, include_features, workers, chunk_size)
+        except Exception as e:
+            print(f"Parallel scoring failed ({e}), falling back to serial scoring")
+    return _score_chunk(texts, include_features)
+
+def _score_texts_cached(texts, workers, chunk_size, report=True):
+    """Score only texts whose fingerprint is neither cached nor repeated earlier in the batch"""
+    keys = score_cache_keys(texts)
+    first_row = {}
+    for row, key in enumerate(keys):
+        first_row.setdefault(key, row)
+    
+    scores_by_key = SCORE_CACHE.get_many(list(first_row))
+    missing = [key for key in first_row if key not in scores_by_key]
+    if missing:
+        rows = [first_row[key] for key in missing]
+        scored = _score_texts(texts.iloc[rows].reset_index(drop=True), False, workers, chunk_size)
+        new_scores = list(zip(missing, scored["score"].to_numpy()))
+        SCORE_CACHE.put_many(new_scores)
+        scores_by_key.update(new_scores)
+    
+    stats = SCORE_CACHE.stats()
+    if report:
+        print(f"Score cache: {len(texts) - len(missing)} of {len(texts)} reviews reused "
+              f"(hits {stats['hits']}, misses {stats['misses']}, size {stats['size']})")
     
-    return pd.DataFrame(data)
+    scores = np.array([scores_by_key[key] for key in keys], dtype=np.float64)
+    return pd.DataFrame({
+        "review": texts.to_numpy(),
+        "prediction": labels_from_scores(scores),
+        "score": scores
+    })
 
-# Optional: Advanced ML model placeholder
-def load_ml_model():
+def check_reviews(reviews, include_features=False, workers=1, chunk_size=DEFAULT_CHUNK_SIZE):
     """
-    Placeholder for loading a trained ML model
-    Replace this with your actual model loading code
+    Process reviews and return DataFrame with predictions
+    
+    Args:
+        reviews (list or pd.Series): Review texts
+        include_features (bool): Also add the rule-hit and count columns
+            the score was built from
+        workers (int): Worker processes to score with; None uses every core.
+            Inputs under PARALLEL_MIN_REVIEWS are scored serially regardless
+        chunk_size (int): Reviews per chunk handed to a worker
+    
+    Returns:
+        pd.DataFrame: DataFrame with 'review', 'prediction' and 'score' columns
     """
-    # Example:
-    # import joblib
-    # model = joblib.load('fake_review_model.pkl')
-    # vectorizer = joblib.load('vectorizer.pkl')
-    # return model, vectorizer
-    pass
+    texts = clean_review_series(reviews if reviews is not None else [])
+    if texts.empty:
+        return pd.DataFrame(columns=['review', 'prediction', 'score'])
+    
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunk_size = max(1, int(chunk_size))
+    
+    if include_features or SCORE_CACHE is None:
+        results = _score_texts(texts, include_features, workers, chunk_size)
+    else:
+        results = _score_texts_cached(texts, workers, chunk_size)
+    
+    print_statistics(results)
+    return results
+
+def check_review_chunk(reviews, include_features=False, workers=1):
+    """
+    check_reviews for one chunk of a stream, without the statistics
+    printout (serial in the calling thread unless workers > 1)
+    """
+    texts = clean_review_series(reviews if reviews is not None else [])
+    if texts.empty:
+        return pd.DataFrame(columns=['review', 'prediction', 'score'])
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if include_features or SCORE_CACHE is None:
+        return _score_texts(texts, include_features, workers, DEFAULT_CHUNK_SIZE)
+    return _score_texts_cached(texts, workers, DEFAULT_CHUNK_SIZE, report=False)
+
+def iter_check_reviews(reviews, include_features=False, chunk_size=STREAM_CHUNK_SIZE, stats=None):
+    """
+    Stream version of check_reviews: yields one result dict per kept review
+    
+    reviews can be any iterable (a generator over CSV chunks, scraped pages,
+    ...). It is consumed chunk_size reviews at a time, so memory stays flat
+    however long the input is. Pass a ReviewStatistics as stats to read the
+    running totals while the stream is being consumed; the summary is
+    printed once the input is exhausted.
+    """
+    if stats is None:
+        stats = ReviewStatistics()
+    chunk_size = max(1, int(chunk_size))
+    source = iter(reviews if reviews is not None else [])
+    
+    while True:
+        chunk = list(islice(source, chunk_size))
+        if not chunk:
+            break
+        
+        results = check_review_chunk(chunk, include_features)
+        if results.empty:
+            continue
+        
+        stats.update(results)
+        yield from results.to_dict(orient="records")
+    
+    stats.print()
+
+# Trained model artifact: a directory holding model.json (manifest) and
+# weights.npy. weights.npy is memory-mapped read-only, so every worker
+# process reading the same artifact shares its pages through the page cache.
+MODEL_FORMAT_VERSION = 1
+MODEL_PATH = os.getenv(
+    "MODEL_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "review_model")
+)
+MODEL_MANIFEST = "model.json"
+MODEL_WEIGHTS = "weights.npy"
+
+_model_lock = threading.Lock()
+_loaded_models = {}
+
+# Label values counted as fake when training from a labelled CSV
+FAKE_LABELS = {"fake", "cg", "1", "1.0", "true", "yes", "deceptive", "spam"}
+
+_HASH_BASE = 1000003
+_HASH_MIX = 0x9E3779B97F4A7C15
+_UINT64_MASK = (1 << 64) - 1
+
+
+class HashedFeatures:
+    """
+    Sparse (reviews x n_features) matrix in coordinate form
+    
+    Duplicate (row, column) entries are allowed and simply add up, so the
+    matrix products below are plain bincounts.
+    """
+
+    def __init__(self, rows, cols, values, shape):
+        self.rows = rows
+        self.cols = cols
+        self.values = values
+        self.shape = shape
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __matmul__(self, weights):
+        """X @ w - one weighted bincount for the whole batch"""
+        return np.bincount(self.rows, weights=self.values * weights[self.cols], minlength=self.shape[0])
+
+    def rmatvec(self, residuals):
+        """X.T @ r, used for the training gradient"""
+        return np.bincount(self.cols, weights=self.values * residuals[self.rows], minlength=self.shape[1])
+
+
+class HashingVectorizer:
+    """
+    Pure-NumPy signed feature hashing of word and character n-grams
+    
+    The batch is joined into one code-point array and every n-gram hash is
+    computed from prefix sums of a polynomial rolling hash (mod 2**64), so
+    there is no Python loop per review or per token. Hashes are stable
+    across processes, unlike hash().
+    """
+
+    def __init__(self, n_features=2 ** 18, word_ngram_range=(1, 2), char_ngram_range=(3, 4)):
+        if n_features <= 1 or n_features & (n_features - 1):
+            raise ValueError("n_features must be a power of two")
+        self.n_features = int(n_features)
+        self.word_ngram_range = tuple(word_ngram_range)
+        self.char_ngram_range = tuple(char_ngram_range)
+        self._bits = self.n_features.bit_length() - 1
+
+    def get_params(self):
+        return {
+            "n_features": self.n_features,
+            "word_ngram_range": list(self.word_ngram_range),
+            "char_ngram_range": list(self.char_ngram_range),
+        }
+
+    @staticmethod
+    def _powers(base, count):
+        """base**0 .. base**(count - 1) mod 2**64"""
+        powers = np.full(count, base, dtype=np.uint64)
+        powers[0] = 1
+        return np.cumprod(powers, dtype=np.uint64)
+
+    def _bucket(self, hashes, seed):
+        """Mix hashes with a per-n-gram-kind seed into (column, sign)"""
+        mixed = (hashes ^ np.uint64(seed)) * np.uint64(_HASH_MIX)
+        columns = (mixed >> np.uint64(64 - self._bits)).astype(np.int64)
+        signs = np.where((mixed >> np.uint64(32)) & np.uint64(1), 1.0, -1.0)
+        return columns, signs
+
+    def transform(self, reviews):
+        texts = preprocess_series(reviews)
+        batch = _JoinedBatch(texts)
+        chars = batch.codepoints().astype(np.uint64)
+        length = len(chars)
+
+        # prefix[i] = sum(chars[j] * base**-j for j < i); substring hash
+        # of [a, b) = (prefix[b] - prefix[a]) * base**(b - 1)
+        inverse = pow(_HASH_BASE, -1, 1 << 64)
+        base_powers = self._powers(_HASH_BASE, length + 1)
+        prefix = np.zeros(length + 1, dtype=np.uint64)
+        np.cumsum(chars * self._powers(inverse, length), out=prefix[1:])
+
+        def span_hash(starts, ends):
+            return (prefix[ends] - prefix[starts]) * base_powers[ends - 1]
+
+        # Row of each character = separators seen before it
+        separators = np.concatenate(([0], np.cumsum(chars == 0)))
+        row_parts, col_parts, value_parts = [], [], []
+
+        def add(positions, hashes, seed):
+            columns, signs = self._bucket(hashes, seed)
+            row_parts.append(separators[positions])
+            col_parts.append(columns)
+            value_parts.append(signs)
+
+        # Words: runs of anything but whitespace, kept punctuation and the separator
+        is_word = ~np.isin(chars, np.array([ord(c) for c in ' .,!?-\x00'], dtype=np.uint64))
+        padded = np.concatenate(([False], is_word, [False]))
+        word_starts = np.flatnonzero(padded[1:-1] & ~padded[:-2])
+        word_ends = np.flatnonzero(padded[1:-1] & ~padded[2:]) + 1
+        word_hashes = span_hash(word_starts, word_ends)
+        word_rows = separators[word_starts]
+
+        low, high = self.word_ngram_range
+        for n in range(low, high + 1):
+            if len(word_starts) < n:
+                break
+            count = len(word_starts) - n + 1
+            same_row = word_rows[:count] == word_rows[n - 1:]
+            hashes = word_hashes[:count].copy()
+            for k in range(1, n):
+                hashes = hashes * np.uint64(_HASH_BASE) + word_hashes[k:k + count]
+            add(word_starts[:count][same_row], hashes[same_row], seed=n)
+
+        # Character n-grams that do not cross a review boundary
+        low, high = self.char_ngram_range
+        for n in range(low, high + 1):
+            if length < n:
+                break
+            starts = np.arange(length - n + 1)
+            valid = separators[starts + n] == separators[starts]
+            starts = starts[valid]
+            add(starts, span_hash(starts, starts + n), seed=100 + n)
+
+        if row_parts:
+            rows = np.concatenate(row_parts)
+            cols = np.concatenate(col_parts)
+            values = np.concatenate(value_parts)
+        else:
+            rows = cols = np.zeros(0, dtype=np.int64)
+            values = np.zeros(0)
+
+        # Scale each review by 1/sqrt(number of n-grams) so long reviews do not dominate
+        per_row = np.bincount(rows, minlength=batch.size)
+        values = values / np.sqrt(np.maximum(per_row, 1))[rows]
+        return HashedFeatures(rows, cols, values, (batch.size, self.n_features))
+
+
+
+class LinearReviewModel:
+    """
+    Logistic-regression classifier over a fixed feature layout
+    
+    predict() takes a (reviews x features) matrix and returns "Fake" /
+    "Original" labels; weights may be a read-only memory map.
+    """
+
+    def __init__(self, weights, bias=0.0, threshold=0.5, feature_names=None, metadata=None):
+        self.weights = weights
+        self.bias = float(bias)
+        self.threshold = float(threshold)
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        self.metadata = dict(metadata or {})
+
+    def decision_function(self, X):
+        return X @ self.weights + self.bias
+
+    def predict_proba(self, X):
+        """Probability that each review is fake"""
+        return 1.0 / (1.0 + np.exp(-np.clip(self.decision_function(X), -30, 30)))
+
+    def predict(self, X):
+        return np.where(self.predict_proba(X) >= self.threshold, "Fake", "Original")
+
+
+def save_ml_model(model, path=None, vectorizer=None):
+    """Write a LinearReviewModel (and optional vectorizer) as a versioned artifact directory"""
+    path = path or MODEL_PATH
+    os.makedirs(path, exist_ok=True)
+
+    np.save(os.path.join(path, MODEL_WEIGHTS), np.asarray(model.weights, dtype=np.float32))
+    manifest = {
+        "format_version": MODEL_FORMAT_VERSION,
+        "model_type": "linear",
+        "n_features": int(len(model.weights)),
+        "bias": model.bias,
+        "threshold": model.threshold,
+        "feature_names": model.feature_names,
+        "vectorizer": vectorizer.get_params() if vectorizer is not None else None,
+        "metadata": model.metadata,
+    }
+    # Manifest last and atomically, so a reader never sees it without its weights
+    manifest_path = os.path.join(path, MODEL_MANIFEST)
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return path
+
+def _read_model_artifact(path):
+    """Read an artifact directory into (model, vectorizer)"""
+    with open(os.path.join(path, MODEL_MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    version = manifest.get("format_version")
+    if version != MODEL_FORMAT_VERSION:
+        raise ValueError(f"Unsupported model format version {version} (expected {MODEL_FORMAT_VERSION})")
+    if manifest.get("model_type") != "linear":
+        raise ValueError(f"Unsupported model type {manifest.get('model_type')}")
+
+    weights = np.load(os.path.join(path, MODEL_WEIGHTS), mmap_mode="r")
+    if weights.shape != (manifest["n_features"],):
+        raise ValueError(f"Weights shape {weights.shape} does not match n_features {manifest['n_features']}")
+
+    vectorizer = None
+    if manifest.get("vectorizer") is not None:
+        vectorizer = HashingVectorizer(**manifest["vectorizer"])
+        if vectorizer.n_features != manifest["n_features"]:
+            raise ValueError("Vectorizer n_features does not match the weights")
+    else:
+        # Heuristic-feature model: its columns must match this ruleset's layout
+        expected = FEATURE_NAMES + RATIO_FEATURES
+        if manifest.get("feature_names") != expected:
+            raise ValueError("Model was trained on a different feature layout than this ruleset")
+
+    model = LinearReviewModel(
+        weights,
+        bias=manifest["bias"],
+        threshold=manifest["threshold"],
+        feature_names=manifest.get("feature_names"),
+        metadata=manifest.get("metadata"),
+    )
+    return model, vectorizer
+
+def load_ml_model(path=None, reload=False):
+    """
+    Load the trained model artifact once per process
+    
+    Returns:
+        tuple: (model, vectorizer); (None, None) when there is no usable artifact
+    """
+    path = path or MODEL_PATH
+    with _model_lock:
+        if path in _loaded_models and not reload:
+            return _loaded_models[path]
+
+        loaded = (None, None)
+        if os.path.exists(os.path.join(path, MODEL_MANIFEST)):
+            try:
+                loaded = _read_model_artifact(path)
+                print(f"Loaded ML model from {path}")
+            except Exception as e:
+                print(f"Could not load ML model from {path}: {e}")
+
+        _loaded_models[path] = loaded
+        return loaded
+
+def train_ml_model(csv_path, text_column="review", label_column="label", n_features=2 ** 18,
+                   epochs=60, learning_rate=0.1, l2=1e-6, validation_split=0.1, seed=42):
+    """
+    Train a hashed n-gram logistic-regression model from a labelled CSV
+    
+    Labels in FAKE_LABELS (case-insensitive, e.g. "Fake", "CG", 1) count as
+    fake, anything else as original. Full-batch Adam over the sparse matrix:
+    each epoch is one X @ w and one X.T @ r.
+    
+    Returns:
+        tuple: (model, vectorizer, report)
+    """
+    df = pd.read_csv(csv_path, usecols=[text_column, label_column]).dropna()
+    texts = df[text_column].astype(str).reset_index(drop=True)
+    labels = df[label_column].astype(str).str.strip().str.lower().isin(FAKE_LABELS).to_numpy(dtype=np.float64)
+    if len(texts) < 2 or labels.min() == labels.max():
+        raise ValueError("Training data needs at least one fake and one original review")
+
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(texts))
+    n_validation = int(len(texts) * validation_split)
+    validation_rows, train_rows = order[:n_validation], order[n_validation:]
+
+    vectorizer = HashingVectorizer(n_features=n_features)
+    X = vectorizer.transform(texts.iloc[train_rows])
+    y = labels[train_rows]
+
+    # Weight classes equally however skewed the data is
+    sample_weight = np.where(y == 1, 0.5 / y.mean(), 0.5 / (1 - y.mean())) / len(y)
+
+    weights = np.zeros(n_features)
+    bias = 0.0
+    m_w, v_w = np.zeros(n_features), np.zeros(n_features)
+    m_b = v_b = 0.0
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    model = LinearReviewModel(weights, bias)
+    for epoch in range(1, epochs + 1):
+        model.bias = bias
+        residuals = (model.predict_proba(X) - y) * sample_weight
+        grad_w = X.rmatvec(residuals) + l2 * weights
+        grad_b = residuals.sum()
+
+        m_w = beta1 * m_w + (1 - beta1) * grad_w
+        v_w = beta2 * v_w + (1 - beta2) * grad_w ** 2
+        m_b = beta1 * m_b + (1 - beta1) * grad_b
+        v_b = beta2 * v_b + (1 - beta2) * grad_b ** 2
+        correction1, correction2 = 1 - beta1 ** epoch, 1 - beta2 ** epoch
+        weights -= learning_rate * (m_w / correction1) / (np.sqrt(v_w / correction2) + eps)
+        bias -= learning_rate * (m_b / correction1) / (np.sqrt(v_b / correction2) + eps)
+    model.bias = bias
+
+    def accuracy(rows):
+        if not len(rows):
+            return None
+        predicted = model.predict(vectorizer.transform(texts.iloc[rows])) == "Fake"
+        return float((predicted == labels[rows].astype(bool)).mean())
+
+    report = {
+        "trained_at": pd.Timestamp.now(tz="UTC").isoformat(),
+        "source": os.path.basename(csv_path),
+        "train_samples": int(len(train_rows)),
+        "validation_samples": int(n_validation),
+        "fake_share": float(labels.mean()),
+        "train_accuracy": accuracy(train_rows),
+        "validation_accuracy": accuracy(validation_rows),
+        "epochs": epochs,
+    }
+    model.metadata = report
+    return model, vectorizer, report
 
 def predict_with_ml_model(reviews, model=None, vectorizer=None):
     """
-    Placeholder for ML model prediction
-    Replace this with your actual ML prediction code
+    Predict "Fake" / "Original" for a batch of reviews
+    
+    Uses the given model, else the process-wide model from load_ml_model().
+    The model is fed vectorizer.transform(reviews) when there is a
+    vectorizer, otherwise FeatureMatrix.model_input(). Without any model the
+    heuristic scorer runs on the batch FeatureMatrix.
     """
-    # Example:
-    # if model and vectorizer:
-    #     features = vectorizer.transform(reviews)
-    #     predictions = model.predict(features)
-    #     return predictions
-    # else:
-    #     return [detect_fake_review(review) for review in reviews]
+    if model is None:
+        model, vectorizer = load_ml_model()
+
+    if model is not None and vectorizer is not None:
+        return np.asarray(model.predict(vectorizer.transform(reviews))).tolist()
+
+    features = extract_batch_features(reviews)
+    if model is not None:
+        return np.asarray(model.predict(features.model_input())).tolist()
     
-    return [detect_fake_review(review) for review in reviews]
\ No newline at end of file
+    return labels_from_scores(score_batch_features(features)).tolist()
+
+
+# Load at import so gunicorn --preload forks workers with the model already mapped
+load_ml_model()
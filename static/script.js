@@ -3,6 +3,7 @@ document.addEventListener("DOMContentLoaded", () => {
   const form = document.getElementById("reviewForm");
   const resultsDiv = document.getElementById("results");
   const loadingDiv = document.getElementById("loading");
+  const progressText = document.getElementById("progress");
   const downloadDiv = document.getElementById("download");
   const chartContainer = document.getElementById("chart-container");
   const dropArea = document.getElementById("drop-area");
@@ -10,7 +11,8 @@ document.addEventListener("DOMContentLoaded", () => {
   
   // Configuration
   let reviewsPerPage = 15;
-  let reviewsData = [];
+  let resultId = null;
+  let reviewsFilter = "all";
   let reviewChart = null;
 
   // Drag & Drop Functionality
@@ -69,7 +71,7 @@ document.addEventListener("DOMContentLoaded", () => {
     const fileInput = form.querySelector('input[name="file"]').files[0];
     
     if (!linkInput && !fileInput) {
-      showError("Please provide either a URL or upload a CSV file");
+      showError("Please provide either a URL or upload a review file");
       return;
     }
     
@@ -79,21 +81,31 @@ document.addEventListener("DOMContentLoaded", () => {
 
     try {
       const formData = new FormData(form);
-      const response = await fetch("/process", { 
+      const response = await fetch("/jobs", { 
         method: "POST", 
         body: formData 
       });
       
-      const data = await response.json();
+      const job = await response.json();
       
       if (!response.ok) {
+        throw new Error(job.error || 'An error occurred while processing');
+      }
+      
+      // Follow the job's progress, then fetch the full result
+      const resultUrl = await waitForJob(job);
+      const resultResponse = await fetch(resultUrl);
+      const data = await resultResponse.json();
+      
+      if (!resultResponse.ok) {
         throw new Error(data.error || 'An error occurred while processing');
       }
 
-      // Store results and render first page
-      reviewsData = data.results;
+      // Rows stay on the server - the response carries the first page only
+      resultId = data.result_id;
+      reviewsFilter = "all";
       
-      if (reviewsData.length === 0) {
+      if (!data.processed_reviews) {
         showError("No reviews found to analyze");
         return;
       }
@@ -103,12 +115,18 @@ document.addEventListener("DOMContentLoaded", () => {
         showScrapingInfo(data);
       }
       
-      renderPage(1);
+      renderResults({
+        results: data.results,
+        page: 1,
+        size: data.page_size,
+        total: data.processed_reviews,
+        total_pages: data.total_pages
+      });
       showDownloadButton(data.download_url);
       showChart(data.counts);
       
       // Show success message
-      showSuccessMessage(data.total_reviews || reviewsData.length, data);
+      showSuccessMessage(data.total_reviews || data.processed_reviews, data);
       
     } catch (error) {
       console.error("Error:", error);
@@ -122,9 +140,77 @@ document.addEventListener("DOMContentLoaded", () => {
     }
   });
 
+  // Resolve with the result URL once the job is done, showing live progress meanwhile
+  function waitForJob(job) {
+    return new Promise((resolve, reject) => {
+      const finish = (payload) => {
+        if (payload.status === "done") {
+          resolve(payload.result_url);
+        } else {
+          reject(new Error(payload.error || 'An error occurred while processing'));
+        }
+      };
+      
+      // Browsers without Server-Sent Events poll the job status instead
+      if (!window.EventSource) {
+        const poll = async () => {
+          try {
+            const response = await fetch(job.status_url);
+            const payload = await response.json();
+            if (!response.ok) {
+              throw new Error(payload.error || 'Lost track of the analysis');
+            }
+            showProgress(payload.progress);
+            if (payload.status === "done" || payload.status === "failed") {
+              finish(payload);
+            } else {
+              setTimeout(poll, 1000);
+            }
+          } catch (error) {
+            reject(error);
+          }
+        };
+        poll();
+        return;
+      }
+      
+      const events = new EventSource(job.events_url);
+      events.addEventListener("progress", (e) => {
+        showProgress(JSON.parse(e.data).progress);
+      });
+      ["done", "failed"].forEach((name) => {
+        events.addEventListener(name, (e) => {
+          events.close();
+          finish(JSON.parse(e.data));
+        });
+      });
+      events.onerror = () => {
+        // The stream ends after the final event; anything else is a lost connection
+        if (events.readyState === EventSource.CLOSED) {
+          reject(new Error('Lost connection to the analysis'));
+        }
+      };
+    });
+  }
+
+  // Partial counts from a running analysis
+  function showProgress(progress) {
+    if (!progress) return;
+    const parts = [];
+    if (progress.pages_fetched) parts.push(`${progress.pages_fetched} pages fetched`);
+    if (progress.reviews_found) parts.push(`${progress.reviews_found.toLocaleString()} reviews found`);
+    if (progress.reviews_scored) {
+      parts.push(`${progress.reviews_scored.toLocaleString()} scored ` +
+        `(${(progress.original_count || 0).toLocaleString()} original, ${(progress.fake_count || 0).toLocaleString()} fake)`);
+    }
+    if (parts.length === 0 && progress.stage) parts.push(`${progress.stage}...`);
+    progressText.textContent = parts.join(" · ");
+  }
+
   // Helper Functions
   function showLoading(show) {
     loadingDiv.style.display = show ? "block" : "none";
+    progressText.textContent = "";
   }
 
   function clearResults() {
@@ -266,24 +352,49 @@ document.addEventListener("DOMContentLoaded", () => {
     `;
   }
 
-  // Render paginated results
-  function renderPage(page) {
-    const start = (page - 1) * reviewsPerPage;
-    const end = start + reviewsPerPage;
-    const slice = reviewsData.slice(start, end);
+  // Fetch one page of results from the server and render it
+  async function renderPage(page) {
+    try {
+      const params = new URLSearchParams({ page: page, size: reviewsPerPage, filter: reviewsFilter });
+      const response = await fetch(`/results/${resultId}?${params}`);
+      const data = await response.json();
+      if (!response.ok) {
+        throw new Error(data.error || 'Could not load results');
+      }
+      renderResults(data);
+    } catch (error) {
+      console.error("Error:", error);
+      showError(error.message);
+    }
+  }
+
+  // Render one page of results as returned by /results/<id>
+  function renderResults(data) {
+    const page = data.page;
+    const start = (page - 1) * data.size;
+    const end = start + data.results.length;
+    const filterButton = (value, label) => `
+      <button type="button" class="btn btn-sm ${reviewsFilter === value ? 'btn-primary' : 'btn-outline-primary'}"
+        onclick="window.filterResults('${value}')">${label}</button>
+    `;
 
     let html = `
       <div class="mt-4">
         <h4 class="text-center mb-4">
           <i class="bi bi-list-check"></i> Analysis Results
         </h4>
+        <div class="text-center mb-3">
+          <div class="btn-group" role="group">
+            ${filterButton("all", "All")}${filterButton("original", "Original")}${filterButton("fake", "Fake")}
+          </div>
+        </div>
         <p class="text-center text-muted mb-4">
-          Showing ${start + 1}-${Math.min(end, reviewsData.length)} of ${reviewsData.length} reviews
+          Showing ${data.total ? start + 1 : 0}-${end} of ${data.total} reviews
         </p>
       </div>
     `;
 
-    slice.forEach((item, index) => {
+    data.results.forEach((item, index) => {
       const isOriginal = item.prediction === "Original";
       const alertClass = isOriginal ? "alert-success" : "alert-danger";
       const icon = isOriginal ? "bi-check-circle" : "bi-exclamation-triangle";
@@ -305,7 +416,7 @@ document.addEventListener("DOMContentLoaded", () => {
     });
 
     // Add pagination if needed
-    const totalPages = Math.ceil(reviewsData.length / reviewsPerPage);
+    const totalPages = data.total_pages;
     if (totalPages > 1) {
       html += generatePagination(page, totalPages);
     }
@@ -481,8 +592,14 @@ document.addEventListener("DOMContentLoaded", () => {
   window.renderPage = renderPage;
   
   // Add smooth scrolling to results
-  window.renderPage = function(page) {
-    renderPage(page);
+  window.renderPage = async function(page) {
+    await renderPage(page);
     resultsDiv.scrollIntoView({ behavior: 'smooth', block: 'start' });
   };
+  
+  // Show only one class of reviews, starting again from the first page
+  window.filterResults = function(value) {
+    reviewsFilter = value;
+    renderPage(1);
+  };
 });
\ No newline at end of file
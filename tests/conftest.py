@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import tempfile
+
+# The app modules live at the repository root, not in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the SQLite caches of a test run out of the working tree
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="review-cache-"))
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import threading
+
+import pytest
+
+from browser import BrowserPool
+
+
+class FakeDriver:
+    """Stand-in for a Selenium WebDriver that records what the pool does with it"""
+
+    def __init__(self, number):
+        self.number = number
+        self.visited = []
+        self.cookie_clears = 0
+        self.quit_called = False
+        self.page_source = "<html></html>"
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def execute_script(self, script, *args):
+        return ""
+
+    def find_elements(self, *args):
+        return []
+
+    def delete_all_cookies(self):
+        self.cookie_clears += 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+def make_pool(size=1, max_uses=50):
+    drivers = []
+
+    def factory():
+        driver = FakeDriver(len(drivers) + 1)
+        drivers.append(driver)
+        return driver
+
+    return BrowserPool(factory=factory, size=size, max_uses=max_uses), drivers
+
+
+def test_browser_is_reused_and_reset_between_jobs():
+    pool, drivers = make_pool()
+    with pool.checkout() as first:
+        first.get("https://example.com/reviews")
+    with pool.checkout() as second:
+        pass
+    assert second is first
+    assert len(drivers) == 1
+    assert first.cookie_clears == 2
+    assert first.visited[-1] == "about:blank"
+    assert not first.quit_called
+
+
+def test_browser_is_recycled_after_max_uses():
+    pool, drivers = make_pool(max_uses=3)
+    used = []
+    for _ in range(7):
+        with pool.checkout() as driver:
+            used.append(driver.number)
+    # Three jobs per browser, then a fresh one
+    assert used == [1, 1, 1, 2, 2, 2, 3]
+    assert drivers[0].quit_called and drivers[1].quit_called
+    assert not drivers[2].quit_called
+    assert pool.started == 1
+
+
+def test_browser_is_discarded_when_job_raises():
+    pool, drivers = make_pool()
+    with pytest.raises(RuntimeError):
+        with pool.checkout():
+            raise RuntimeError("page crashed")
+    assert drivers[0].quit_called
+    assert pool.started == 0
+    with pool.checkout() as driver:
+        assert driver is drivers[1]
+
+
+def test_checkout_times_out_when_every_browser_is_busy():
+    pool, drivers = make_pool(size=2)
+    with pool.checkout(), pool.checkout():
+        with pytest.raises(TimeoutError):
+            with pool.checkout(timeout=0.2):
+                pass
+    assert len(drivers) == 2
+
+
+def test_waiting_job_gets_browser_when_one_is_returned():
+    pool, drivers = make_pool()
+    got = []
+    with pool.checkout() as busy:
+        waiter = threading.Thread(target=lambda: got.append(pool.checkout(timeout=5).__enter__()))
+        waiter.start()
+        waiter.join(0.3)
+        assert not got
+    waiter.join(5)
+    assert got == [busy]
+    assert len(drivers) == 1
+
+
+def test_close_quits_idle_browsers():
+    pool, drivers = make_pool(size=2)
+    with pool.checkout(), pool.checkout():
+        pass
+    pool.close()
+    assert all(driver.quit_called for driver in drivers)
+    assert pool.started == 0
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import gzip
+import io
+import json
+
+import pytest
+
+import app
+import ingest
+
+
+def write(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def read_all(path, upload, chunk_size=ingest.UPLOAD_CHUNK_SIZE):
+    return [list(chunk) for chunk in ingest.iter_upload_reviews(path, upload, chunk_size)]
+
+
+def test_cp1252_csv_is_sniffed_and_decoded(tmp_path):
+    path = write(tmp_path, "reviews.csv", "id,review\n1,Café quality – worth it\n2,Plain text\n".encode("cp1252"))
+    upload = ingest.sniff_upload(path)
+    assert upload["column"] == "review"
+    assert upload["encoding"] == "cp1252"
+    assert read_all(path, upload) == [["Café quality – worth it", "Plain text"]]
+
+
+def test_csv_with_bom_finds_first_column(tmp_path):
+    path = write(tmp_path, "reviews.csv", "review,rating\nGood one,5\n".encode("utf-8-sig"))
+    upload = ingest.sniff_upload(path)
+    # Without stripping the BOM the header would read "﻿review"
+    assert upload["column"] == "review"
+    assert upload["encoding"] == "utf-8-sig"
+    assert read_all(path, upload) == [["Good one"]]
+
+
+def test_missing_review_column_raises(tmp_path):
+    path = write(tmp_path, "reviews.csv", b"id,stars\n1,5\n")
+    with pytest.raises(ValueError, match="No review column found"):
+        ingest.sniff_upload(path)
+
+
+def test_missing_review_column_is_a_400(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "UPLOAD_FOLDER", str(tmp_path))
+    response = app.app.test_client().post(
+        "/process", data={"file": (io.BytesIO(b"id,stars\n1,5\n"), "reviews.csv")}
+    )
+    assert response.status_code == 400
+    assert "No review column found" in response.get_json()["error"]
+
+
+def test_reviews_are_streamed_in_chunks(tmp_path):
+    rows = "".join(f'{i},"Review number {i}, with a comma"\n' for i in range(7))
+    path = write(tmp_path, "reviews.csv", ("id,review\n" + rows).encode("utf-8"))
+    chunks = read_all(path, ingest.sniff_upload(path), chunk_size=3)
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert chunks[2] == ["Review number 6, with a comma"]
+
+
+def test_empty_cells_are_dropped(tmp_path):
+    path = write(tmp_path, "reviews.csv", b"id,review\n1,First\n2,\n3,Third\n")
+    assert read_all(path, ingest.sniff_upload(path)) == [["First", "Third"]]
+
+
+@pytest.mark.parametrize("filename, expected", [
+    ("reviews.csv", ("csv", None)),
+    ("Reviews.JSONL.GZ", ("jsonl", "gzip")),
+    ("reviews.csv.zst", ("csv", "zstd")),
+    ("reviews.parquet", ("parquet", None)),
+    ("reviews.xlsx", None),
+])
+def test_upload_format(filename, expected):
+    assert ingest.upload_format(filename) == expected
+
+
+def test_gzipped_jsonl_skips_malformed_lines(tmp_path, capsys):
+    lines = [
+        json.dumps({"review": "First", "stars": 5}),
+        "{not json",
+        "",
+        json.dumps(["a", "list"]),
+        json.dumps({"stars": 3}),
+        json.dumps({"review": "Second"}),
+    ]
+    path = write(tmp_path, "reviews.jsonl.gz", gzip.compress("\n".join(lines).encode("utf-8")))
+    upload = ingest.sniff_upload(path, "jsonl", "gzip")
+    assert upload["column"] == "review"
+    assert read_all(path, upload, chunk_size=1) == [["First"], ["Second"]]
+    # Records without the column are not malformed, blank lines are ignored
+    assert "Skipped 2 JSONL lines" in capsys.readouterr().out
+
+
+def test_zstd_csv(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    data = zstandard.ZstdCompressor().compress(b"review\nCompressed\n")
+    path = write(tmp_path, "reviews.csv.zst", data)
+    assert read_all(path, ingest.sniff_upload(path, "csv", "zstd")) == [["Compressed"]]
+
+
+def test_parquet_reads_only_the_review_column(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    import pyarrow as pa
+
+    path = str(tmp_path / "reviews.parquet")
+    table = pa.table({"id": list(range(5)), "review": ["a", None, "c", "d", "e"], "body": ["x"] * 5})
+    ingest.pq.write_table(table, path)
+
+    projected = []
+
+    class ParquetFile(ingest.pq.ParquetFile):
+        def iter_batches(self, *args, **kwargs):
+            projected.append(kwargs.get("columns"))
+            return super().iter_batches(*args, **kwargs)
+
+    monkeypatch.setattr(ingest.pq, "ParquetFile", ParquetFile)
+    upload = ingest.sniff_upload(path, "parquet")
+    assert upload["column"] == "review"
+    assert read_all(path, upload, chunk_size=2) == [["a"], ["c", "d"], ["e"]]
+    assert projected == [["review"]]
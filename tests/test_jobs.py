@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import time
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def jobs_path(tmp_path, monkeypatch):
+    """A fresh JOBS_PATH, with the app's store and runners switched over to it"""
+    path = str(tmp_path / "jobs.sqlite3")
+    monkeypatch.setattr(app, "JOBS_PATH", path)
+    monkeypatch.setattr(app, "JOB_STORE", app.JobStore(path))
+    monkeypatch.setattr(app, "_job_runners", {})
+    return path
+
+
+def set_updated_at(store, job_id, updated_at):
+    with store._db() as db:
+        db.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (updated_at, job_id))
+
+
+def stored_status(store, job_id):
+    row = store._db().execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return row and row[0]
+
+
+def test_queue_limit_is_shared_by_workers(jobs_path):
+    # Two stores on one file stand in for two gunicorn workers
+    first, second = app.JobStore(jobs_path), app.JobStore(jobs_path)
+    assert first.create("a", limit=2)
+    assert second.create("b", limit=2)
+    assert not first.create("c", limit=2)
+    assert not second.create("c", limit=2)
+    assert first.get("c") is None
+
+    second.update("a", "done", result={"ok": True})
+    assert first.create("c", limit=2)
+    assert second.get("c")["status"] == "queued"
+
+
+def test_full_queue_is_a_503(jobs_path):
+    for k in range(app.JOB_QUEUE_LIMIT):
+        assert app.JOB_STORE.create(f"job-{k}")
+    response = app.app.test_client().post("/jobs", data={"link": "https://www.amazon.in/dp/B000000000"})
+    assert response.status_code == 503
+    assert "Too many analyses" in response.get_json()["error"]
+
+
+def test_stale_job_is_reported_failed_without_a_write(jobs_path):
+    store = app.JOB_STORE
+    store.create("lost")
+    set_updated_at(store, "lost", time.time() - app.JOB_STALE_AFTER - 1)
+
+    job = app.app.test_client().get("/jobs/lost").get_json()
+    assert job["status"] == "failed"
+    assert job["error"] == app.JOB_LOST_ERROR
+    assert stored_status(store, "lost") == "queued"
+
+    store.reap()
+    assert stored_status(store, "lost") == "failed"
+
+
+def test_create_reaps_stale_jobs_before_counting(jobs_path):
+    store = app.JOB_STORE
+    store.create("lost", limit=1)
+    assert not store.create("new", limit=1)
+
+    set_updated_at(store, "lost", time.time() - app.JOB_STALE_AFTER - 1)
+    assert store.create("new", limit=1)
+    assert stored_status(store, "lost") == "failed"
+
+
+def test_heartbeat_keeps_jobs_alive_and_ttl_drops_finished_ones(jobs_path):
+    store = app.JOB_STORE
+    store.create("running")
+    store.create("finished")
+    store.update("finished", "done", result={"ok": True})
+    set_updated_at(store, "running", time.time() - app.JOB_STALE_AFTER - 1)
+    set_updated_at(store, "finished", time.time() - app.JOB_TTL - 1)
+
+    store.touch(["running"])
+    store.reap()
+    assert store.get("running")["status"] == "queued"
+    assert store.get("finished") is None
+    assert app.app.test_client().get("/jobs/finished").status_code == 404
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import pandas as pd
+import pytest
+
+import app
+
+LABELS = ["Fake", "Original", "Original"]
+
+
+@pytest.fixture
+def results(tmp_path, monkeypatch):
+    """A fresh RESULTS_DB_PATH holding one finished run of 10 reviews (4 fake, 6 original)"""
+    path = str(tmp_path / "results.sqlite3")
+    store = app.ResultStore(path)
+    monkeypatch.setattr(app, "RESULTS_DB_PATH", path)
+    monkeypatch.setattr(app, "RESULT_STORE", store)
+
+    rows = pd.DataFrame({
+        "review": [f"Review {k}" for k in range(10)],
+        "prediction": [LABELS[k % 3] for k in range(10)],
+        "score": [k / 10 for k in range(10)],
+    })
+    store.begin("run")
+    # Written in chunks, as save_result_chunks does
+    store.add_rows("run", rows.iloc[:6], 0)
+    store.add_rows("run", rows.iloc[6:].reset_index(drop=True), 6)
+    store.finish("run", 10, {"Original": 6, "Fake": 4})
+    return store
+
+
+def test_pages_of_the_full_run(results):
+    first = results.page("run", 1, 4)
+    assert [row["review"] for row in first["results"]] == ["Review 0", "Review 1", "Review 2", "Review 3"]
+    assert (first["total"], first["total_pages"]) == (10, 3)
+
+    last = results.page("run", 3, 4)
+    assert [row["review"] for row in last["results"]] == ["Review 8", "Review 9"]
+    assert results.page("run", 4, 4)["results"] == []
+
+
+def test_pages_of_one_prediction(results):
+    fake = results.page("run", 1, 3, "Fake")
+    assert [row["review"] for row in fake["results"]] == ["Review 0", "Review 3", "Review 6"]
+    assert (fake["total"], fake["total_pages"]) == (4, 2)
+    assert [row["review"] for row in results.page("run", 2, 3, "Fake")["results"]] == ["Review 9"]
+    assert fake["counts"] == {"Original": 6, "Fake": 4}
+
+
+def test_unfinished_run_is_not_served(results):
+    results.begin("partial")
+    results.add_rows("partial", pd.DataFrame({"review": ["x"], "prediction": ["Fake"], "score": [0.9]}))
+    assert results.page("partial") is None
+
+
+def test_results_route(results):
+    data = app.app.test_client().get("/results/run?page=2&size=2&filter=Original").get_json()
+    assert data["filter"] == "original"
+    assert [row["review"] for row in data["results"]] == ["Review 4", "Review 5"]
+    assert (data["page"], data["size"], data["total"], data["total_pages"]) == (2, 2, 6, 3)
+
+
+def test_results_route_clamps_page_and_size(results):
+    data = app.app.test_client().get("/results/run?page=0&size=100000").get_json()
+    assert (data["page"], data["size"], data["total_pages"]) == (1, app.RESULTS_MAX_PAGE_SIZE, 1)
+
+
+@pytest.mark.parametrize("query, message", [
+    ("page=two", "page and size must be numbers"),
+    ("size=1.5", "page and size must be numbers"),
+    ("filter=suspicious", "filter must be one of"),
+])
+def test_results_route_rejects_bad_parameters(results, query, message):
+    response = app.app.test_client().get(f"/results/run?{query}")
+    assert response.status_code == 400
+    assert message in response.get_json()["error"]
+
+
+def test_results_route_unknown_run(results):
+    response = app.app.test_client().get("/results/missing")
+    assert response.status_code == 404
+    assert "not found" in response.get_json()["error"]
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import app
+import fetcher
+import model
+
+# Fetches iter_pages may already have in flight when a scrape decides to stop
+EXTRA_FETCHES = fetcher.SCRAPE_CONCURRENCY - 1
+
+
+class QuietServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # Requests fetched ahead are cancelled once a scrape stops; their resets are expected
+        pass
+
+
+class ReviewSite:
+    """Canned Amazon / Flipkart / Meesho review pages, newest review first"""
+
+    def __init__(self):
+        self.hits = []
+        self.amazon_pages = 7
+        self.flipkart_pages = 5
+        # Reviews posted since the first crawl, pushed on top of page 1
+        self.new_reviews = 0
+        # Text of Amazon's count element (default: one rating per review)
+        self.amazon_count = None
+        self.review_suffix = ""
+        # Set to e.g. 403 to answer every request like a blocked crawler
+        self.status = 200
+        # Answer Amazon review pages with a 200 bot check instead
+        self.captcha = False
+        # Cookie header of every request, and the session cookies handed out
+        self.cookies = []
+        self.sessions = 0
+
+    def amazon_page(self, page):
+        first = (page - 1) * 10 - self.new_reviews
+        body = "".join(
+            f'<div data-hook="review-body"><span>Great item review text number {k} is here{self.review_suffix}</span></div>'
+            for k in range(first, first + 10)
+        )
+        if page >= self.amazon_pages:
+            next_button = '<li class="a-last a-disabled">Next</li>'
+        else:
+            next_button = '<li class="a-last"><a href="#">Next</a></li>'
+        count = self.amazon_count or f"{self.amazon_pages * 10:,} global ratings"
+        return (
+            f'<html><body><div data-hook="total-review-count">{count}</div>{body}'
+            f'<ul class="a-pagination">{next_button}</ul></body></html>'
+        )
+
+    def flipkart_page(self, page):
+        if page > self.flipkart_pages:
+            return "<html><body>Nothing here</body></html>"
+        return "<html><body>" + "".join(
+            f'<div class="t-ZTKy">Flipkart review number {k} for page {page} is here</div>' for k in range(10)
+        ) + "</body></html>"
+
+    def meesho_page(self):
+        return "<html><body>" + "".join(
+            f'<p class="review-content">Meesho review text number {k} is here</p>' for k in range(8)
+        ) + "</body></html>"
+
+    def render(self, path):
+        url = urlparse(path)
+        query = parse_qs(url.query)
+        if "flipkart" in url.path and "product-reviews" in url.path:
+            return self.flipkart_page(int(query.get("page", ["1"])[0]))
+        if "product-reviews" in url.path and self.captcha:
+            return "<html><body><p>Enter the characters you see below</p></body></html>"
+        if "product-reviews" in url.path:
+            return self.amazon_page(int(query.get("pageNumber", ["1"])[0]))
+        if "meesho" in url.path:
+            return self.meesho_page()
+        return None
+
+
+@pytest.fixture(params=["aiohttp", "requests"])
+def site(request, monkeypatch, tmp_path):
+    """ReviewSite served on localhost, with Amazon requests pointed at it - once per HTTP backend"""
+    if request.param == "aiohttp" and fetcher.aiohttp is None:
+        pytest.skip("aiohttp is not installed")
+    if request.param == "requests":
+        # AsyncHttpClient falls back to requests in worker threads without aiohttp
+        monkeypatch.setattr(fetcher, "aiohttp", None)
+    review_site = ReviewSite()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            review_site.hits.append(self.path)
+            review_site.cookies.append(self.headers.get("Cookie"))
+            html = review_site.render(self.path)
+            if html is None or review_site.status != 200:
+                self.send_response(404 if html is None else review_site.status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = html.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            if not self.headers.get("Cookie"):
+                review_site.sessions += 1
+                self.send_header("Set-Cookie", f"session-id={review_site.sessions}; Path=/")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = QuietServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    review_site.base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    monkeypatch.setattr(app, "AMAZON_BASE_URL", review_site.base)
+    monkeypatch.setattr(app, "CRAWL_STATE", app.CrawlStateStore(str(tmp_path / "crawl_state.sqlite3")))
+    monkeypatch.setattr(app, "SELECTOR_STATS", None)
+    # The response cache stays on (conftest keeps it in a temporary CACHE_DIR);
+    # every server has its own port, so no test sees another's entries
+    monkeypatch.setattr(fetcher.RATE_LIMITER, "rate", 100)
+    monkeypatch.setattr(fetcher.RATE_LIMITER, "burst", 10)
+    yield review_site
+    server.shutdown()
+    server.server_close()
+
+
+def test_amazon_stops_at_disabled_next_button(site, request):
+    backend = request.node.callspec.params["site"]
+    assert app.AsyncHttpClient().backend == backend
+    reviews = app.scrape_reviews_from_url(f"{site.base}/amazon/dp/B000000001", max_reviews=500)
+    assert len(reviews) == 70
+    assert reviews[0] == "Great item review text number 0 is here"
+    assert reviews[-1] == "Great item review text number 69 is here"
+    # Pages are fetched ahead, but never past the advertised review count
+    assert len(site.hits) == 7
+
+
+def test_amazon_respects_max_reviews(site):
+    reviews = app.scrape_reviews_from_url(f"{site.base}/amazon/dp/B000000001", max_reviews=25)
+    assert len(reviews) == 25
+    assert len(site.hits) <= 3 + EXTRA_FETCHES
+
+
+def test_count_comes_from_the_count_element_not_review_text(site, capsys):
+    site.amazon_count = "1,234 global ratings"
+    site.review_suffix = ", I read 2 reviews first"
+    reviews = app.scrape_reviews_from_url(f"{site.base}/amazon/dp/B000000005", max_reviews=500)
+    assert len(reviews) == 70
+    assert "Advertised 2 reviews" not in capsys.readouterr().out
+
+
+def test_budget_grows_while_pages_have_a_next_button(site, capsys):
+    # The count claims two pages, the site has seven
+    site.amazon_count = "20 global ratings"
+    reviews = app.scrape_reviews_from_url(f"{site.base}/amazon/dp/B000000006", max_reviews=500)
+    assert len(reviews) == 70
+    out = capsys.readouterr().out
+    assert "planning 2 pages" in out
+    assert "continuing past the advertised count" in out
+    assert len(site.hits) == 7
+
+
+@pytest.mark.parametrize("text, count", [
+    ("1,234 global ratings", 1234),
+    ("1,23,456 global ratings", 123456),
+    ("1,234 total ratings, 567 with reviews", 567),
+    ("4,321 Ratings & 1,023 Reviews", 1023),
+    ("No ratings yet", 0),
+])
+def test_advertised_review_count(text, count):
+    soup = app.BeautifulSoup(f'<div data-hook="total-review-count">{text}</div>', app.HTML_PARSER)
+    assert app.advertised_review_count(soup, app.AMAZON_REVIEW_COUNT_SELECTORS) == count
+
+
+def test_flipkart_stops_when_pages_repeat(site, capsys):
+    reviews = app.scrape_reviews_from_url(f"{site.base}/flipkart/p/abc123", max_reviews=500)
+    assert len(reviews) == 50
+    assert "repeats page" in capsys.readouterr().out
+    # Two empty pages are needed to see the repeat
+    assert len(site.hits) <= site.flipkart_pages + 2 + EXTRA_FETCHES
+
+
+def test_meesho_stops_when_pages_repeat(site, capsys):
+    reviews = app.scrape_reviews_from_url(f"{site.base}/meesho/item1", max_reviews=500)
+    assert len(reviews) == 8
+    assert "Page 2 repeats page 1" in capsys.readouterr().out
+
+
+def test_incremental_run_stops_at_reviews_seen(site, capsys):
+    url = f"{site.base}/amazon/dp/B000000002"
+    assert len(app.scrape_reviews_from_url(url, incremental=True)) == 70
+
+    site.hits.clear()
+    site.new_reviews = 3
+    capsys.readouterr()
+    reviews = app.scrape_reviews_from_url(url, incremental=True)
+    assert "reached reviews seen" in capsys.readouterr().out
+    # The three new reviews come first, then the ones already known
+    assert reviews[:4] == [
+        "Great item review text number -3 is here", "Great item review text number -2 is here",
+        "Great item review text number -1 is here", "Great item review text number 0 is here"
+    ]
+    assert len(reviews) == 73
+    assert len(site.hits) <= 1 + EXTRA_FETCHES
+
+
+def test_incremental_run_with_nothing_new(site, capsys):
+    url = f"{site.base}/amazon/dp/B000000003"
+    first = app.scrape_reviews_from_url(url, incremental=True)
+    site.hits.clear()
+    capsys.readouterr()
+    assert app.scrape_reviews_from_url(url, incremental=True) == first
+    assert "no new reviews" in capsys.readouterr().out
+    assert len(site.hits) <= 1 + EXTRA_FETCHES
+
+
+def test_incremental_first_run_reads_newest_first(site):
+    app.scrape_reviews_from_url(f"{site.base}/amazon/dp/B000000007", incremental=True)
+    assert site.hits
+    assert all("sortBy=recent" in hit for hit in site.hits)
+
+
+def test_failed_incremental_run_does_not_return_stored_reviews(site, capsys):
+    url = f"{site.base}/amazon/dp/B000000008"
+    stored = app.scrape_reviews_from_url(url, incremental=True)
+    site.status = 403
+    capsys.readouterr()
+    assert app.scrape_reviews_from_url(url, incremental=True) != stored
+    out = capsys.readouterr().out
+    assert "crawl failed before reaching known reviews" in out
+    assert "no new reviews" not in out
+
+
+def test_cookies_stay_within_one_scrape(site):
+    app.scrape_reviews_from_url(f"{site.base}/amazon/dp/B000000009", max_reviews=500)
+    first_scrape = len(site.cookies)
+    issued = {f"session-id={number}" for number in range(1, site.sessions + 1)}
+    # Pages requested after the first responses carry a cookie the site set
+    assert set(site.cookies[fetcher.SCRAPE_CONCURRENCY:first_scrape]) <= issued
+    app.scrape_reviews_from_url(f"{site.base}/amazon/dp/B000000010", max_reviews=500)
+    assert not issued & set(site.cookies[first_scrape:])
+
+
+def test_bot_check_page_is_not_replayed_from_cache(site):
+    url = f"{site.base}/amazon/dp/B000000011"
+    site.captcha = True
+    assert len(app.scrape_reviews_from_url(url, max_reviews=500)) < 70
+    site.captcha = False
+    assert len(app.scrape_reviews_from_url(url, max_reviews=500)) == 70
+
+
+def test_pipeline_matches_scrape_then_score(site):
+    url = f"{site.base}/amazon/dp/B000000004"
+    site.amazon_pages = 30
+    reviews = app.scrape_reviews_from_url(url)
+    expected = model.check_reviews(reviews)
+    streamed_reviews, scored = app.scrape_and_score(url)
+    assert streamed_reviews == reviews
+    assert scored.equals(expected)
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Train the hashed n-gram fake review model from a labelled CSV
+
+Usage:
+    python train_model.py reviews.csv --text-column review --label-column label
+
+The artifact is written to MODEL_PATH (models/review_model by default) and
+picked up by load_ml_model() the next time the app starts.
+"""
+import argparse
+
+from model import MODEL_PATH, train_ml_model, save_ml_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the fake review model from a labelled CSV")
+    parser.add_argument("csv_path", help="CSV file with a review text column and a label column")
+    parser.add_argument("--text-column", default="review")
+    parser.add_argument("--label-column", default="label")
+    parser.add_argument("--output", default=MODEL_PATH, help="Artifact directory to write")
+    parser.add_argument("--hash-bits", type=int, default=18, help="Hash space size as a power of two")
+    parser.add_argument("--epochs", type=int, default=60)
+    args = parser.parse_args()
+
+    print(f"Training on {args.csv_path}...")
+    model, vectorizer, report = train_ml_model(
+        args.csv_path,
+        text_column=args.text_column,
+        label_column=args.label_column,
+        n_features=2 ** args.hash_bits,
+        epochs=args.epochs,
+    )
+
+    print(f"{'='*60}")
+    for key, value in report.items():
+        print(f"{key}: {value}")
+    print(f"{'='*60}")
+
+    path = save_ml_model(model, args.output, vectorizer)
+    print(f"Model saved to: {path}")
+
+
+if __name__ == "__main__":
+    main()